@@ -1,82 +1,416 @@
 # <--- Imports --->
+import asyncio
+import csv
+import hmac
 import io
+import os
+import threading
 import pandas as pd
 import json
+from collections import deque
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+from typing import (
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Tuple
+)
 from fastapi import (
     FastAPI,
+    Header,
+    HTTPException,
     UploadFile,
     File,
+    Query,
+)
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse
 )
-from fastapi.responses import StreamingResponse
 
+# Loaded before the project modules, which read their settings from the environment on import.
+load_dotenv()
+
+from src.core.lazy_service import (
+    aget_service,
+    lazy_import,
+    resolve
+)
+from src.core.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    ROWS_IN_FLIGHT,
+    ROWS_PROCESSED,
+    STAGE_ERRORS,
+    cache_stats_reader,
+    metrics_registry,
+    time_stage
+)
 from src.machine_learning.llm_rag_method.models.object_model import DataObject
-from src.machine_learning.llm_rag_method.llm_rag_spam_classifier import llm_rag_spam_classifier
+from src.machine_learning.llm_rag_method.models.row_batch import (
+    DataRow,
+    RowBatch
+)
+from src.machine_learning.roBERTa_method.roberta_inference import (
+    ROBERTA_MAX_BATCH_SIZE,
+    ModelUnavailableError,
+    roberta_batcher,
+    roberta_inference_service
+)
+
+# <--- Configurations --->
+ROW_CONCURRENCY: int = int(os.getenv("ROW_CONCURRENCY", "8"))
+MAX_ROW_CONCURRENCY: int = int(os.getenv("MAX_ROW_CONCURRENCY", "64"))
+ROW_BATCH_SIZE: int = int(os.getenv("ROW_BATCH_SIZE", "1"))
+MAX_ROW_BATCH_SIZE: int = int(os.getenv("MAX_ROW_BATCH_SIZE", "50"))
+CSV_CHUNK_SIZE: int = int(os.getenv("CSV_CHUNK_SIZE", "1000"))
+MAX_CSV_CHUNK_SIZE: int = int(os.getenv("MAX_CSV_CHUNK_SIZE", "100000"))
+CSV_ENCODING: str = os.getenv("CSV_ENCODING", "utf-8-sig")
+# Services to build in a background thread at startup: any of "llm_rag" and "roberta". Empty builds them on first use.
+STARTUP_WARM_UP: List[str] = [name.strip() for name in os.getenv("STARTUP_WARM_UP", "").lower().split(",") if name.strip()]
+HEALTH_PROBE_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "3"))
+# Required by the /admin endpoints; they are disabled while it is empty.
+ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+# LangChain, the OpenAI client and the vector store client are imported and built on first use, not on import.
+llm_rag_spam_classifier = lazy_import(
+    "llm_rag_spam_classifier",
+    "src.machine_learning.llm_rag_method.llm_rag_spam_classifier",
+    "llm_rag_spam_classifier"
+)
+vector_collection = lazy_import(
+    "vector_collection",
+    "src.machine_learning.llm_rag_method.vector_store.vector_database",
+    "vector_collection"
+)
+
+def warm_up_services(services: List[str]) -> None:
+    if "llm_rag" in services:
+        # Building the classifier also builds the vector collection; prefetching opens the store and fills the guideline cache.
+        llm_rag_spam_classifier.warm_up(then=lambda classifier: classifier.prefetch_guidelines())
+
+    if "roberta" in services:
+        try:
+            roberta_inference_service.load()
+            print("Initialised roberta_inference_service")
+        except ModelUnavailableError as e:
+            print(f"Something went wrong while warming up roberta_inference_service: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if STARTUP_WARM_UP:
+        # The server accepts requests straight away; a request that arrives first simply waits for the same build.
+        threading.Thread(target=warm_up_services, args=(STARTUP_WARM_UP,), name="startup-warm-up", daemon=True).start()
+
+    yield
 
-app = FastAPI()
+    await roberta_batcher.stop()
+    classifier = resolve(llm_rag_spam_classifier)
+    if classifier is not None:
+        classifier.close()
+    collection = resolve(vector_collection)
+    if collection is not None:
+        # Closes the pooled vector store connections, sync and async.
+        await collection.aclose()
+
+app = FastAPI(lifespan=lifespan)
+
+class CsvFormatError(ValueError):
+    pass
+
+@app.get("/live")
+async def live():
+    # Liveness only: the process is up and serving, whatever the state of its dependencies.
+    return {"status": "Alive"}
 
 @app.get("/health_check")
 async def health_check():
-    return {"status": "Healthy"}
+    # Readiness: the vector store must answer a real call in time; its latency is reported either way.
+    # The attribute is looked up inside the worker thread, so a first probe builds the collection off the event loop.
+    try:
+        vector_store: dict = await asyncio.wait_for(asyncio.to_thread(lambda: vector_collection.readiness_probe()), timeout=HEALTH_PROBE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        vector_store = {"status": "unavailable", "latency_ms": HEALTH_PROBE_TIMEOUT_SECONDS * 1000, "error": f"Probe timed out after {HEALTH_PROBE_TIMEOUT_SECONDS}s."}
+    except Exception as e:
+        vector_store = {"status": "unavailable", "latency_ms": None, "error": str(e)}
+
+    is_healthy: bool = vector_store.get("status") == "ready"
+    return JSONResponse(
+        {
+            "status": "Healthy" if is_healthy else "Unhealthy",
+            "vector_store": vector_store,
+            "llm_rag_ready": resolve(llm_rag_spam_classifier) is not None,
+        },
+        status_code=200 if is_healthy else 503
+    )
+
+@app.get("/cache/stats")
+async def cache_stats():
+    # Reading stats never builds a service; an unbuilt one reports None.
+    collection, classifier = resolve(vector_collection), resolve(llm_rag_spam_classifier)
+    return {
+        "guidelines": collection.guideline_cache_stats() if collection is not None else None,
+        "verdicts": classifier.verdict_cache_stats() if classifier is not None else None,
+    }
 
-def is_column_in(dataframe: pd.DataFrame) -> bool:
-    if "Message" not in dataframe.columns:
+def read_cache_stats() -> dict:
+    collection, classifier = resolve(vector_collection), resolve(llm_rag_spam_classifier)
+    stats: dict = {}
+    if collection is not None:
+        stats["guideline"] = collection.guideline_cache_stats()
+    if classifier is not None:
+        verdict_stats: dict = classifier.verdict_cache_stats()
+        stats["verdict_signal"] = verdict_stats["signal"]
+        stats["verdict_row"] = verdict_stats["row"]
+    return stats
+
+# Cache hits are already counted by TTLCache, so they are read when /metrics is scraped instead of on every lookup.
+metrics_registry.callback("spam_cache_hits_total", "Cache hits.", ("cache",), cache_stats_reader(read_cache_stats, "hits"), metric_type="counter")
+metrics_registry.callback("spam_cache_misses_total", "Cache misses.", ("cache",), cache_stats_reader(read_cache_stats, "misses"), metric_type="counter")
+metrics_registry.callback("spam_cache_entries", "Entries currently cached.", ("cache",), cache_stats_reader(read_cache_stats, "entries"))
+
+def reload_guidelines() -> dict:
+    # documents_loader runs in its own process, so after an ingest it asks the server to drop what it derived from
+    # the old guidelines. Services that have not been built yet will load the new ones anyway.
+    collection, classifier = resolve(vector_collection), resolve(llm_rag_spam_classifier)
+    if classifier is not None:
+        classifier.network_index.reload()
+        classifier.geography_table.reload()
+    if collection is not None:
+        # Also clears the verdict cache and learned geography entries through the classifier's listeners.
+        collection.invalidate_guideline_cache()
+    return {"vector_collection_reloaded": collection is not None, "classifier_reloaded": classifier is not None}
+
+@app.post("/admin/guidelines/reload")
+async def admin_reload_guidelines(x_admin_token: str = Header("")):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled. Set ADMIN_TOKEN to enable them.")
+    if not hmac.compare_digest(x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+    return await asyncio.to_thread(reload_guidelines)
+
+@app.get("/metrics")
+async def metrics():
+    if not metrics_registry.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled. Set METRICS_ENABLED=true to expose them.")
+    return PlainTextResponse(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+def is_column_in(columns: Iterable[str]) -> bool:
+    columns = set(columns)
+
+    if "Message" not in columns:
         return False
-    
-    if "Sent_Time" not in dataframe.columns:
+
+    if "Sent_Time" not in columns:
         return False
-    
-    if "Source_IP" not in dataframe.columns:
+
+    if "Source_IP" not in columns:
         return False
 
-    if "Source_Location" not in dataframe.columns:
+    if "Source_Location" not in columns:
         return False
-    
+
     return True
 
-def process_csv(file_object):
+def read_csv_header(file_object) -> List[str]:
+    # Only the header record is consumed (a quoted column name may span lines), so a bad upload is rejected
+    # before the body is parsed and pandas carries on from the first data row.
+    header: List[str] = next(csv.reader(file_object), [])
+
+    if not is_column_in(columns=header):
+        raise CsvFormatError("Invalid CSV Format: Missing required columns.")
+    return header
+
+def read_chunk_rows(chunk: pd.DataFrame) -> List[Tuple[int, DataRow]]:
+    # The chunk index keeps counting across chunks, so it is the row's position in the upload.
+    return RowBatch.from_dataframe(chunk).rows()
+
+def read_csv_row_chunks(file_object, chunk_size: int = CSV_CHUNK_SIZE) -> Iterator[List[Tuple[int, DataRow]]]:
+    header: List[str] = read_csv_header(file_object)
     try:
-        csv_chunks = pd.read_csv(file_object, chunksize=10)
+        csv_chunks = pd.read_csv(file_object, header=None, names=header, dtype=str, chunksize=chunk_size)
+    except pd.errors.EmptyDataError:
+        # A header-only upload has no rows to classify.
+        return
+
+    for chunk in csv_chunks:
+        yield read_chunk_rows(chunk)
+
+def read_csv_rows(file_object, chunk_size: int = CSV_CHUNK_SIZE) -> Iterator[Tuple[int, DataRow]]:
+    for row_chunk in read_csv_row_chunks(file_object, chunk_size):
+        yield from row_chunk
+
+def read_csv_batches(file_object, batch_size: int, chunk_size: int = CSV_CHUNK_SIZE) -> Iterator[List[Tuple[int, DataRow]]]:
+    batch: List[Tuple[int, DataRow]] = []
 
-        first_chunk = True
+    for row_index, row_object in read_csv_rows(file_object, chunk_size):
+        batch.append((row_index, row_object))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
 
+    if batch:
+        yield batch
 
-        for chunk in csv_chunks:
-            if first_chunk:
-                if not is_column_in(dataframe=chunk):
-                    error_detail = json.dumps(
-                        {
-                            "error": f"Invalid CSV Format: Missing required columns."
-                        }
-                    )
+async def aread_csv_batches(file_object, batch_size: int, chunk_size: int = CSV_CHUNK_SIZE) -> AsyncIterator[List[Tuple[int, DataRow]]]:
+    # Reading and parsing a chunk touches the spooled upload on disk, so it runs off the event loop.
+    row_chunks = read_csv_row_chunks(file_object, chunk_size)
+    batch: List[Tuple[int, DataRow]] = []
 
-                    yield f"{error_detail}\n"
-                    return
+    while True:
+        row_chunk = await asyncio.to_thread(next, row_chunks, None)
+        if row_chunk is None:
+            break
 
-                first_chunk = False
+        for row in row_chunk:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
 
-            chunk.dropna(inplace=True)
+    if batch:
+        yield batch
 
-            for _, row in chunk.iterrows():
-                row_dict = row.to_dict()
-                
-                row_object: DataObject = DataObject(
-                    message_content=row_dict["Message"],
-                    sent_time=row_dict["Sent_Time"],
-                    source_ip=row_dict["Source_IP"],
-                    source_location=row_dict["Source_Location"]
-                )
+def process_csv(file_object, batch_size: int = ROW_BATCH_SIZE, chunk_size: int = CSV_CHUNK_SIZE):
+    with time_stage("process_csv"):
+        try:
+            if batch_size > 1:
+                for batch in read_csv_batches(file_object, batch_size, chunk_size):
+                    with ROWS_IN_FLIGHT.track(len(batch), pipeline="llm_rag"):
+                        records: List[str] = llm_rag_spam_classifier.classifier_agent_batch(batch)
+                    ROWS_PROCESSED.inc(len(records), pipeline="llm_rag", outcome="ok")
+                    for record in records:
+                        yield f"{record}\n"
+                return
 
-                yield f"{llm_rag_spam_classifier.classifier_agent(row_object)}\n"
+            for row_index, row_object in read_csv_rows(file_object, chunk_size):
+                with ROWS_IN_FLIGHT.track(pipeline="llm_rag"):
+                    record: str = llm_rag_spam_classifier.classifier_agent(row_object, row_index=row_index)
+                ROWS_PROCESSED.inc(pipeline="llm_rag", outcome="ok")
+                yield f"{record}\n"
+        except CsvFormatError as e:
+            error_detail = json.dumps({"error": str(e)})
+            yield f"{error_detail}\n"
+        except Exception as e:
+            STAGE_ERRORS.inc(stage="process_csv")
+            error_detail = json.dumps({"error": f"Stream Interrupted: {e}"})
+            yield f"{error_detail}\n"
+
+async def classify_batch(batch: List[Tuple[int, DataRow]]) -> List[str]:
+    try:
+        with ROWS_IN_FLIGHT.track(len(batch), pipeline="llm_rag"):
+            classifier = await aget_service(llm_rag_spam_classifier)
+            if len(batch) == 1:
+                row_index, row_object = batch[0]
+                records: List[str] = [await classifier.aclassifier_agent(row_object, row_index=row_index)]
+            else:
+                records: List[str] = await classifier.aclassifier_agent_batch(batch)
+        ROWS_PROCESSED.inc(len(records), pipeline="llm_rag", outcome="ok")
+        return records
     except Exception as e:
-        error_detail = json.dumps({"error": f"Stream Interrupted: {e}"})
-        yield f"{error_detail}\n"
+        ROWS_PROCESSED.inc(len(batch), pipeline="llm_rag", outcome="error")
+        return [json.dumps({"row_index": row_index, "error": f"Row Failed: {e}"}) for row_index, _ in batch]
+
+async def aprocess_csv(
+        file_object,
+        concurrency: int = ROW_CONCURRENCY,
+        ordered: bool = True,
+        batch_size: int = ROW_BATCH_SIZE,
+        chunk_size: int = CSV_CHUNK_SIZE
+) -> AsyncIterator[str]:
+    # Keeps up to `concurrency` batches in flight (single rows when batch_size is 1). Ordered mode
+    # releases results in input order, otherwise each batch is released as soon as it completes.
+    in_flight: deque = deque()
+    pending: set = set()
+
+    with time_stage("process_csv"):
+        try:
+            async for batch in aread_csv_batches(file_object, batch_size, chunk_size):
+                task = asyncio.create_task(classify_batch(batch))
+
+                if ordered:
+                    in_flight.append(task)
+                    while len(in_flight) >= concurrency:
+                        for record in await in_flight.popleft():
+                            yield f"{record}\n"
+                else:
+                    pending.add(task)
+                    while len(pending) >= concurrency:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for finished_task in done:
+                            for record in finished_task.result():
+                                yield f"{record}\n"
+
+            while in_flight:
+                for record in await in_flight.popleft():
+                    yield f"{record}\n"
+
+            for finished_task in asyncio.as_completed(pending):
+                for record in await finished_task:
+                    yield f"{record}\n"
+            pending = set()
+        except CsvFormatError as e:
+            error_detail = json.dumps({"error": str(e)})
+            yield f"{error_detail}\n"
+        except Exception as e:
+            STAGE_ERRORS.inc(stage="process_csv")
+            error_detail = json.dumps({"error": f"Stream Interrupted: {e}"})
+            yield f"{error_detail}\n"
+        finally:
+            # Client disconnects close the generator early; do not leave orphaned LLM calls running.
+            for task in list(in_flight) + list(pending):
+                task.cancel()
 
 @app.post("/upload/stream-csv")
-async def upload_and_stream_csv(file: UploadFile = File(...)):
-    content_bytes = await file.read()
+async def upload_and_stream_csv(
+        file: UploadFile = File(...),
+        concurrency: int = Query(ROW_CONCURRENCY, ge=1, le=MAX_ROW_CONCURRENCY),
+        ordered: bool = Query(True),
+        batch_size: int = Query(ROW_BATCH_SIZE, ge=1, le=MAX_ROW_BATCH_SIZE),
+        chunk_size: int = Query(CSV_CHUNK_SIZE, ge=1, le=MAX_CSV_CHUNK_SIZE)
+):
+    # Decode the spooled upload incrementally instead of holding the raw bytes and a decoded copy in memory.
+    csv_stream = io.TextIOWrapper(file.file, encoding=CSV_ENCODING, newline="")
+    return StreamingResponse(
+        aprocess_csv(csv_stream, concurrency=concurrency, ordered=ordered, batch_size=batch_size, chunk_size=chunk_size),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/roberta/classify")
+async def roberta_classify(data_row: DataObject):
+    try:
+        return await roberta_batcher.submit(data_row)
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@app.get("/roberta/stats")
+async def roberta_stats():
+    return roberta_batcher.stats()
+
+async def aprocess_csv_with_roberta(file_object, chunk_size: int = CSV_CHUNK_SIZE) -> AsyncIterator[str]:
+    # Rows of a chunk are queued together, so the batcher fills whole batches; concurrent requests share them.
+    try:
+        async for batch in aread_csv_batches(file_object, ROBERTA_MAX_BATCH_SIZE, chunk_size):
+            predictions = await roberta_batcher.submit_many([row_object for _, row_object in batch])
+
+            for (row_index, row_object), prediction in zip(batch, predictions):
+                yield f"{json.dumps({'row_index': row_index, 'message': row_object.message_content, **prediction})}\n"
+    except CsvFormatError as e:
+        error_detail = json.dumps({"error": str(e)})
+        yield f"{error_detail}\n"
+    except Exception as e:
+        error_detail = json.dumps({"error": f"Stream Interrupted: {e}"})
+        yield f"{error_detail}\n"
 
-    csv_buffer = io.StringIO(content_bytes.decode("utf-8"))
+@app.post("/roberta/upload/stream-csv")
+async def roberta_upload_and_stream_csv(
+        file: UploadFile = File(...),
+        chunk_size: int = Query(CSV_CHUNK_SIZE, ge=1, le=MAX_CSV_CHUNK_SIZE)
+):
+    csv_stream = io.TextIOWrapper(file.file, encoding=CSV_ENCODING, newline="")
     return StreamingResponse(
-        process_csv(csv_buffer), #type: ignore
+        aprocess_csv_with_roberta(csv_stream, chunk_size=chunk_size),
         media_type="application/x-ndjson"
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,80 @@
+# <--- Imports --->
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import mean, median
+from typing import List
+
+# The module-level classifier builds a ChatOpenAI client on import; no request is ever sent with this key.
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.machine_learning.llm_rag_method.llm_rag_spam_classifier import LlmRagSpamClassifier
+from src.machine_learning.llm_rag_method.models.object_model import DataObject
+from src.machine_learning.llm_rag_method.verdict_cache import VerdictCache
+
+# <--- Configurations --->
+NUMBER_OF_ROWS: int = 500
+WARMUP_ROWS: int = 20
+
+class ToolCapableFakeChatModel(FakeListChatModel):
+    # The agents only need bind_tools to exist; the stub never emits tool calls.
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+class StaticGuidelineSource:
+    def fetch_object_from_header(self, header: str) -> str:
+        return f"## {header}\nStatic guideline text used for benchmarking."
+
+def build_stub_classifier() -> LlmRagSpamClassifier:
+    stub_llm = ToolCapableFakeChatModel(responses=["FALSE: Stubbed examiner reply."])
+    # The same row is classified repeatedly, so the verdict cache is off to measure the full per-row path.
+    return LlmRagSpamClassifier(
+        llm=stub_llm,
+        guideline_source=StaticGuidelineSource(),
+        verdict_cache=VerdictCache(enabled=False)
+    )
+
+def time_per_row(function, rows: int) -> List[float]:
+    timings: List[float] = []
+    for _ in range(rows):
+        start_time: float = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start_time) * 1_000_000)
+    return timings
+
+def report(label: str, timings: List[float]) -> None:
+    ordered = sorted(timings)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(f"{label:<40}{mean(timings):>12.1f}{median(timings):>12.1f}{p99:>12.1f}")
+
+def run_benchmark(rows: int = NUMBER_OF_ROWS) -> None:
+    classifier = build_stub_classifier()
+    row_object: DataObject = DataObject(
+        message_content="Free entry in 2 a wkly comp to win FA Cup final tkts 21st May 2005.",
+        sent_time="00:53:38",
+        source_ip="37.120.103.92",
+        source_location="('United States', 'Virginia')"
+    )
+
+    def classify_row() -> None:
+        classifier.classifier_agent(row_object)
+
+    # What every row used to pay before prompts, chains, agents and the pool were built once per classifier.
+    def rebuild_per_row_objects() -> None:
+        classifier.__build_chains__()
+        with ThreadPoolExecutor() as executor:
+            executor.submit(lambda: None).result()
+
+    time_per_row(classify_row, WARMUP_ROWS)
+
+    print(f"\n--- Per-row overhead with a stubbed LLM ({rows} rows, microseconds) ---\n")
+    print(f"{'stage':<40}{'mean':>12}{'median':>12}{'p99':>12}")
+    report("classifier_agent (compiled once)", time_per_row(classify_row, rows))
+    report("per-row rebuild cost (previous)", time_per_row(rebuild_per_row_objects, rows))
+
+    classifier.close()
+
+if __name__ == "__main__":
+    run_benchmark()
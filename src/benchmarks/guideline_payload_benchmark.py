@@ -0,0 +1,73 @@
+# <--- Imports --->
+import json
+import time
+from typing import (
+    Callable,
+    List
+)
+
+from src.machine_learning.llm_rag_method.vector_store.vector_database import vector_collection
+
+# <--- Configurations --->
+GUIDELINE_HEADERS: List[str] = [
+    "message_guideline",
+    "network_guideline",
+    "geography_guideline",
+]
+TOKENISER_MODEL: str = "gpt-4o-mini"
+
+def get_token_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(TOKENISER_MODEL)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text))
+    except ImportError:
+        print("tiktoken is not installed, approximating tokens as characters / 4.")
+        return lambda text: len(text) // 4
+
+def payload_size(payload) -> int:
+    return len(json.dumps(payload, default=str).encode("utf-8"))
+
+def legacy_lookup(header: str) -> tuple:
+    documents = vector_collection.__fetch_all_objects__()
+    context = [document for document in documents if header in document["Properties"]["header"]]
+    return payload_size(documents), str(context)
+
+def filtered_lookup(header: str) -> tuple:
+    guidelines = vector_collection.__fetch_objects_by_header__(header)
+    return payload_size(guidelines), vector_collection.__render_prompt_context__(guidelines)
+
+def run_benchmark(repeats: int = 5) -> None:
+    count_tokens = get_token_counter()
+
+    print(f"\n--- Guideline Payload Benchmark ({repeats} repeats per header) ---\n")
+    print(f"{'header':<22}{'method':<10}{'payload_bytes':>15}{'prompt_tokens':>15}{'avg_ms':>10}")
+
+    totals = {"legacy": [0, 0], "filtered": [0, 0]}
+
+    for header in GUIDELINE_HEADERS:
+        for method, lookup in (("legacy", legacy_lookup), ("filtered", filtered_lookup)):
+            start_time: float = time.perf_counter()
+            for _ in range(repeats):
+                payload_bytes, prompt_context = lookup(header)
+            average_ms: float = (time.perf_counter() - start_time) / repeats * 1000
+
+            prompt_tokens: int = count_tokens(prompt_context)
+            totals[method][0] += payload_bytes
+            totals[method][1] += prompt_tokens
+
+            print(f"{header:<22}{method:<10}{payload_bytes:>15}{prompt_tokens:>15}{average_ms:>10.1f}")
+
+    legacy_bytes, legacy_tokens = totals["legacy"]
+    filtered_bytes, filtered_tokens = totals["filtered"]
+
+    print("\n--- Totals per row (three guideline lookups) ---\n")
+    print(f"Payload bytes: {legacy_bytes} -> {filtered_bytes} ({filtered_bytes / max(legacy_bytes, 1):.1%})")
+    print(f"Prompt tokens: {legacy_tokens} -> {filtered_tokens} ({filtered_tokens / max(legacy_tokens, 1):.1%})")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,185 @@
+# <--- Imports --->
+import argparse
+import asyncio
+import io
+import time
+import tracemalloc
+import pandas as pd
+from statistics import mean, median
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional
+)
+
+from src.benchmarks.offline_stand_ins import (
+    InMemoryVectorCollection,
+    LatencyFakeChatModel
+)
+
+import main
+from src.machine_learning.llm_rag_method.llm_rag_spam_classifier import LlmRagSpamClassifier
+from src.machine_learning.llm_rag_method.models.row_batch import RowBatch
+from src.machine_learning.llm_rag_method.rule_engine.geography_lookup_table import GeographyLookupTable, geography_lookup_table
+from src.machine_learning.llm_rag_method.rule_engine.network_prefix_index import NetworkPrefixIndex, network_prefix_index
+from src.machine_learning.llm_rag_method.verdict_cache import VerdictCache
+from src.tools.generate_load_dataset import LoadDatasetGenerator
+
+# <--- Configurations --->
+NUMBER_OF_ROWS: int = 2000
+EXAMINER_ROWS: int = 200
+LATENCIES_MS: List[float] = [0.0, 20.0]
+OUTPUT_TOKENS: int = 32
+BATCH_SIZE: int = 16
+CONCURRENCY: int = 8
+SEED: int = 42
+
+class OfflineBenchmarkSettings:
+    def __init__(
+            self,
+            latency_ms: float,
+            output_tokens: int = OUTPUT_TOKENS,
+            local_rules: bool = True,
+            verdict_cache: bool = False
+    ):
+        self.latency_ms: float = latency_ms
+        self.output_tokens: int = output_tokens
+        self.local_rules: bool = local_rules
+        self.verdict_cache: bool = verdict_cache
+
+def build_offline_classifier(settings: OfflineBenchmarkSettings) -> LlmRagSpamClassifier:
+    # Every run gets its own model, guideline store, cache and lookup tables, so runs never share learned state.
+    llm = LatencyFakeChatModel(latency_seconds=settings.latency_ms / 1000, output_tokens=settings.output_tokens)
+    return LlmRagSpamClassifier(
+        llm=llm,
+        guideline_source=InMemoryVectorCollection(),
+        verdict_cache=VerdictCache(enabled=settings.verdict_cache),
+        network_index=NetworkPrefixIndex(network_prefix_index.entries if settings.local_rules else []),
+        geography_table=GeographyLookupTable(list(geography_lookup_table.table.values()) if settings.local_rules else [])
+    )
+
+def build_csv_text(rows: int, seed: int = SEED) -> str:
+    csv_buffer = io.StringIO()
+    LoadDatasetGenerator(seed=seed).generate_chunk(rows).to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue()
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+def run_examiners(settings: OfflineBenchmarkSettings, csv_text: str, rows: int) -> Dict[str, List[float]]:
+    classifier = build_offline_classifier(settings)
+    data_rows = [row for _, row in RowBatch.from_dataframe(pd.read_csv(io.StringIO(csv_text), dtype=str, nrows=rows)).rows()]
+
+    examiners: Dict[str, Callable] = {
+        "message_content": lambda row: classifier.__read_message_content__(row.message_content),
+        "network_data": lambda row: classifier.__examine_network_data__(row.source_ip),
+        "temporal_data": lambda row: classifier.__examine_temporal_data__(row.sent_time, row.source_location, row),
+        "geographical_data": lambda row: classifier.__examine_geographical_data__(row.source_location, row),
+    }
+
+    timings: Dict[str, List[float]] = {name: [] for name in examiners}
+    for row in data_rows:
+        for name, examiner in examiners.items():
+            start_time: float = time.perf_counter()
+            examiner(row)
+            timings[name].append((time.perf_counter() - start_time) * 1000)
+
+    classifier.close()
+    return timings
+
+def run_pipeline(mode: str, settings: OfflineBenchmarkSettings, csv_text: str, trace_memory: bool = False) -> dict:
+    classifier = build_offline_classifier(settings)
+    # process_csv and aprocess_csv read the module-level classifier, so it is swapped for the run.
+    original_classifier = main.llm_rag_spam_classifier
+    main.llm_rag_spam_classifier = classifier
+
+    if trace_memory:
+        tracemalloc.start()
+    start_time: float = time.perf_counter()
+    first_row_time: Optional[float] = None
+    lines: List[str] = []
+
+    try:
+        if mode.startswith("sync"):
+            batch_size: int = BATCH_SIZE if mode.endswith("batched") else 1
+            for line in main.process_csv(io.StringIO(csv_text), batch_size=batch_size):
+                first_row_time = first_row_time if first_row_time is not None else time.perf_counter()
+                lines.append(line)
+        else:
+            batch_size: int = BATCH_SIZE if mode.endswith("batched") else 1
+
+            async def consume() -> None:
+                nonlocal first_row_time
+                async for line in main.aprocess_csv(io.StringIO(csv_text), concurrency=CONCURRENCY, batch_size=batch_size):
+                    first_row_time = first_row_time if first_row_time is not None else time.perf_counter()
+                    lines.append(line)
+
+            asyncio.run(consume())
+    finally:
+        total_seconds: float = time.perf_counter() - start_time
+        peak_bytes: int = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        if trace_memory:
+            tracemalloc.stop()
+        main.llm_rag_spam_classifier = original_classifier
+        classifier.close()
+
+    return {
+        "rows": len(lines),
+        "errors": sum(1 for line in lines if '"error"' in line),
+        "seconds": total_seconds,
+        "time_to_first_row": (first_row_time - start_time) if first_row_time is not None else None,
+        "peak_bytes": peak_bytes,
+        "usage": classifier.LLM.usage.as_dict(),
+    }
+
+def report_examiners(timings: Dict[str, List[float]], latency_ms: float) -> None:
+    print(f"{'examiner':<20}{'mean_ms':>10}{'p50_ms':>10}{'p99_ms':>10}{'over_llm_ms':>13}")
+    for name, values in timings.items():
+        # Overhead over the model: what an examiner costs beyond one fake LLM round trip (negative when answered locally).
+        print(f"{name:<20}{mean(values):>10.3f}{median(values):>10.3f}{percentile(values, 0.99):>10.3f}{median(values) - latency_ms:>13.3f}")
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM RAG pipeline offline with a fake chat model and an in-memory guideline store.")
+    parser.add_argument("--rows", type=int, default=NUMBER_OF_ROWS)
+    parser.add_argument("--examiner-rows", type=int, default=EXAMINER_ROWS)
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=LATENCIES_MS, help="Fake LLM latency per call; 0 isolates orchestration overhead.")
+    parser.add_argument("--output-tokens", type=int, default=OUTPUT_TOKENS)
+    parser.add_argument("--modes", nargs="+", choices=["sync", "sync-batched", "async", "async-batched"], default=["sync", "sync-batched", "async", "async-batched"])
+    parser.add_argument("--no-local-rules", action="store_true", help="Send every network and geography value to the LLM.")
+    parser.add_argument("--verdict-cache", action="store_true", help="Keep the verdict cache on (off by default for comparable runs).")
+    parser.add_argument("--seed", type=int, default=SEED)
+    return parser.parse_args()
+
+def main_benchmark() -> None:
+    arguments = parse_arguments()
+    csv_text: str = build_csv_text(arguments.rows, arguments.seed)
+
+    for latency_ms in arguments.latency_ms:
+        settings = OfflineBenchmarkSettings(latency_ms, arguments.output_tokens, not arguments.no_local_rules, arguments.verdict_cache)
+
+        print(f"\n--- Per-examiner latency, fake LLM at {latency_ms:g} ms ({arguments.examiner_rows} rows) ---\n")
+        report_examiners(run_examiners(settings, csv_text, arguments.examiner_rows), latency_ms)
+
+        print(f"\n--- End to end, fake LLM at {latency_ms:g} ms ({arguments.rows} rows, batch {BATCH_SIZE}, concurrency {CONCURRENCY}) ---\n")
+        print(f"{'mode':<16}{'rows/sec':>10}{'ttfr_ms':>10}{'us/row':>10}{'llm_calls':>11}{'in_tokens':>11}{'out_tokens':>11}{'peak_MiB':>10}")
+        for mode in arguments.modes:
+            timed = run_pipeline(mode, settings, csv_text)
+            # tracemalloc slows allocation-heavy code down, so memory is measured in a separate pass.
+            traced = run_pipeline(mode, settings, csv_text, trace_memory=True)
+
+            ttfr_ms: float = timed["time_to_first_row"] * 1000 if timed["time_to_first_row"] is not None else float("nan")
+            print(
+                f"{mode:<16}{timed['rows'] / timed['seconds']:>10.1f}{ttfr_ms:>10.1f}"
+                f"{timed['seconds'] / max(timed['rows'], 1) * 1_000_000:>10.0f}"
+                f"{timed['usage']['calls']:>11}{timed['usage']['input_tokens']:>11}{timed['usage']['output_tokens']:>11}"
+                f"{traced['peak_bytes'] / (1024 * 1024):>10.2f}"
+            )
+            if timed["errors"]:
+                print(f"{'':<16}{timed['errors']} error lines")
+
+    print("\nWith the fake LLM at 0 ms, us/row is the orchestration overhead of each mode.")
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,149 @@
+# <--- Imports --->
+import asyncio
+import json
+import os
+import threading
+import time
+import zlib
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional
+)
+
+# The module-level classifier builds a ChatOpenAI client on import; no request is ever sent with this key.
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from src.machine_learning.llm_rag_method.vector_store.vector_database import VectorCollection
+
+# <--- Configurations --->
+GUIDELINE_DOCUMENTS_DIRECTORY: str = os.path.abspath("./guidelines/trained_data")
+BATCH_INPUTS_MARKER: str = "Inputs:"
+SINGLE_INPUT_MARKER: str = "Human:"
+
+class FakeModelUsage:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: int = 0
+        self.input_tokens: int = 0
+        self.output_tokens: int = 0
+        self.busy_seconds: float = 0.0
+
+    def record(self, input_tokens: int, output_tokens: int, busy_seconds: float) -> None:
+        with self.lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.busy_seconds += busy_seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "busy_seconds": round(self.busy_seconds, 3),
+        }
+
+class LatencyFakeChatModel(BaseChatModel):
+    # Deterministic examiner replies after a fixed delay. Single prompts get "TRUE/FALSE: ..." and batched
+    # prompts get a JSON object keyed by row_id, so both classifier paths parse the replies like real ones.
+    latency_seconds: float = 0.0
+    output_tokens: int = 16
+    spam_share: float = 0.5
+
+    _usage: FakeModelUsage = PrivateAttr(default_factory=FakeModelUsage)
+
+    @property
+    def _llm_type(self) -> str:
+        return "latency-fake-chat-model"
+
+    @property
+    def usage(self) -> FakeModelUsage:
+        return self._usage
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def __verdict__(self, value: str) -> str:
+        is_spam: bool = zlib.crc32(value.encode("utf-8")) % 1000 < self.spam_share * 1000
+        padding: str = " detail" * max(self.output_tokens - 4, 0)
+        return f"{'TRUE' if is_spam else 'FALSE'}: Stubbed examiner reply.{padding}"
+
+    def __reply_for__(self, prompt: str) -> str:
+        if BATCH_INPUTS_MARKER in prompt:
+            try:
+                batch_inputs = json.loads(prompt.rsplit(BATCH_INPUTS_MARKER, 1)[1].strip())
+                return json.dumps({str(item["row_id"]): self.__verdict__(str(item["input"])) for item in batch_inputs})
+            except (json.JSONDecodeError, KeyError, TypeError):
+                pass
+        return self.__verdict__(prompt.rsplit(SINGLE_INPUT_MARKER, 1)[-1].strip())
+
+    def __result__(self, messages: List[BaseMessage], busy_seconds: float) -> ChatResult:
+        prompt: str = "\n".join(str(message.content) for message in messages)
+        reply: str = self.__reply_for__(prompt)
+
+        # Roughly four characters per token, which is close enough for relative comparisons.
+        input_tokens: int = len(prompt) // 4
+        output_tokens: int = len(reply) // 4
+        self.usage.record(input_tokens, output_tokens, busy_seconds)
+
+        message = AIMessage(
+            content=reply,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        start_time: float = time.perf_counter()
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self.__result__(messages, time.perf_counter() - start_time)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        start_time: float = time.perf_counter()
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return self.__result__(messages, time.perf_counter() - start_time)
+
+def load_guideline_documents(directory: str = GUIDELINE_DOCUMENTS_DIRECTORY) -> List[dict]:
+    from docx import Document
+
+    documents: List[dict] = []
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(".docx"):
+            document = Document(os.path.join(directory, file_name))
+            documents.append(
+                {
+                    "header": file_name[:-len(".docx")],
+                    "info": "\n".join(paragraph.text for paragraph in document.paragraphs)
+                }
+            )
+    return documents
+
+class InMemoryVectorCollection(VectorCollection):
+    # Same caching and rendering as VectorCollection; only the Weaviate query is replaced by a list lookup.
+    def __init__(self, documents: Optional[List[dict]] = None, lookup_latency_seconds: float = 0.0):
+        super().__init__()
+        self.documents: List[dict] = documents if documents is not None else load_guideline_documents()
+        self.lookup_latency_seconds: float = lookup_latency_seconds
+        self.lookups: int = 0
+
+    def __fetch_all_objects__(self) -> list:
+        return [{"UUID": str(number), "Properties": document, "Vector": None} for number, document in enumerate(self.documents)]
+
+    def __fetch_objects_by_header__(self, header: str) -> List[dict]:
+        self.lookups += 1
+        if self.lookup_latency_seconds:
+            time.sleep(self.lookup_latency_seconds)
+        return [{"header": document["header"], "info": document["info"]} for document in self.documents if document["header"] == header]
+
+    async def __afetch_objects_by_header__(self, header: str) -> List[dict]:
+        self.lookups += 1
+        if self.lookup_latency_seconds:
+            await asyncio.sleep(self.lookup_latency_seconds)
+        return [{"header": document["header"], "info": document["info"]} for document in self.documents if document["header"] == header]
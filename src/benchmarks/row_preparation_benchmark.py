@@ -0,0 +1,75 @@
+# <--- Imports --->
+import time
+import pandas as pd
+from typing import (
+    Callable,
+    List
+)
+
+from src.machine_learning.llm_rag_method.models.object_model import DataObject
+from src.machine_learning.llm_rag_method.models.row_batch import RowBatch
+
+# <--- Configurations --->
+NUMBER_OF_ROWS: int = 200_000
+CHUNK_SIZE: int = 1000
+REPEATS: int = 3
+
+def build_chunks(rows: int = NUMBER_OF_ROWS, chunk_size: int = CHUNK_SIZE) -> List[pd.DataFrame]:
+    dataframe = pd.DataFrame(
+        {
+            "Category": ["spam", "ham"] * (rows // 2),
+            "Message": [f"Free entry in 2 a wkly comp to win FA Cup final tkts, ref {number}" for number in range(rows)],
+            "Sent_Time": [f"{number % 24:02d}:{number % 60:02d}:38" for number in range(rows)],
+            "Source_IP": [f"37.120.{number % 256}.{number % 251}" for number in range(rows)],
+            "Source_Location": ["('United States', 'Virginia')", "('Malaysia', 'Selangor')"] * (rows // 2),
+        },
+        dtype=str
+    )
+    return [dataframe.iloc[start:start + chunk_size].copy() for start in range(0, rows, chunk_size)]
+
+# What process_csv did for every row before the columnar path.
+def prepare_with_iterrows(chunk: pd.DataFrame) -> list:
+    chunk.dropna(inplace=True)
+    prepared_rows = []
+    for row_index, row in chunk.iterrows():
+        row_dict = row.to_dict()
+        prepared_rows.append(
+            (
+                int(row_index), #type: ignore
+                DataObject(
+                    message_content=row_dict["Message"],
+                    sent_time=row_dict["Sent_Time"],
+                    source_ip=row_dict["Source_IP"],
+                    source_location=row_dict["Source_Location"]
+                )
+            )
+        )
+    return prepared_rows
+
+def prepare_columnar(chunk: pd.DataFrame) -> list:
+    return RowBatch.from_dataframe(chunk).rows()
+
+def rows_per_second(prepare: Callable[[pd.DataFrame], list], chunks: List[pd.DataFrame]) -> float:
+    best_seconds: float = float("inf")
+    for _ in range(REPEATS):
+        fresh_chunks = [chunk.copy() for chunk in chunks]
+        start_time: float = time.perf_counter()
+        prepared_rows: int = sum(len(prepare(chunk)) for chunk in fresh_chunks)
+        best_seconds = min(best_seconds, time.perf_counter() - start_time)
+    return prepared_rows / best_seconds
+
+def run_benchmark(rows: int = NUMBER_OF_ROWS, chunk_size: int = CHUNK_SIZE) -> None:
+    chunks = build_chunks(rows, chunk_size)
+
+    print(f"\n--- Row preparation only ({rows} rows, chunks of {chunk_size}, best of {REPEATS}) ---\n")
+    print(f"{'path':<40}{'rows/sec':>14}")
+
+    legacy_rate: float = rows_per_second(prepare_with_iterrows, chunks)
+    columnar_rate: float = rows_per_second(prepare_columnar, chunks)
+
+    print(f"{'iterrows + DataObject (previous)':<40}{legacy_rate:>14,.0f}")
+    print(f"{'RowBatch (columnar)':<40}{columnar_rate:>14,.0f}")
+    print(f"\nSpeed-up: {columnar_rate / legacy_rate:.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
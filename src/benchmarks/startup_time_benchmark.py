@@ -0,0 +1,119 @@
+# <--- Imports --->
+import argparse
+import os
+import subprocess
+import sys
+import time
+from statistics import median
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+# <--- Configurations --->
+IMPORT_TARGET: str = "main"
+REPEATS: int = 5
+TOP_MODULES: int = 15
+# Heavy packages that importing the app must not pull in; they are loaded when a service is first used.
+DEFERRED_MODULES: List[str] = ["langchain", "langchain_openai", "openai", "weaviate", "sklearn", "torch", "transformers"]
+FIRST_USE_SNIPPET: str = "import main; main.llm_rag_spam_classifier.get(); print(main.llm_rag_spam_classifier.init_seconds)"
+
+def benchmark_environment() -> Dict[str, str]:
+    environment: Dict[str, str] = dict(os.environ)
+    # The classifier builds a ChatOpenAI client; no request is sent with this key.
+    environment.setdefault("OPENAI_API_KEY", "startup-benchmark")
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), environment.get("PYTHONPATH", "")]))
+    return environment
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    # Lines look like "import time:  self [us] | cumulative | name"; nesting is shown by the indentation of the name.
+    modules: List[Tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules.append((name.rstrip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return modules
+
+def measure_import(target: str = IMPORT_TARGET) -> dict:
+    start_time: float = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        env=benchmark_environment()
+    )
+    wall_seconds: float = time.perf_counter() - start_time
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{completed.stderr[-2000:]}")
+
+    modules = parse_importtime(completed.stderr)
+    top_level: Optional[Tuple[str, int, int]] = next((module for module in modules if module[0].strip() == target), None)
+    return {
+        "wall_seconds": wall_seconds,
+        "import_seconds": top_level[2] / 1_000_000 if top_level is not None else float("nan"),
+        "modules": modules,
+        "imported": {name.strip() for name, _, _ in modules},
+    }
+
+def measure_first_use() -> Optional[float]:
+    completed = subprocess.run([sys.executable, "-c", FIRST_USE_SNIPPET], capture_output=True, text=True, env=benchmark_environment())
+    if completed.returncode != 0:
+        print(f"First use failed:\n{completed.stderr[-2000:]}")
+        return None
+    return float(completed.stdout.strip().splitlines()[-1])
+
+def deferred_modules_imported(imported: set, deferred: List[str] = DEFERRED_MODULES) -> List[str]:
+    return [module for module in deferred if module in imported]
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure the cold import time of the app with -X importtime.")
+    parser.add_argument("--target", default=IMPORT_TARGET, help="Module to import in a fresh interpreter.")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--top", type=int, default=TOP_MODULES, help="Slowest modules to list, by cumulative import time.")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when the median import time is above this.")
+    parser.add_argument("--first-use", action="store_true", help="Also time building the LLM RAG classifier on first use.")
+    return parser.parse_args()
+
+def main_benchmark() -> int:
+    arguments = parse_arguments()
+    runs = [measure_import(arguments.target) for _ in range(arguments.repeats)]
+
+    import_ms: List[float] = [run["import_seconds"] * 1000 for run in runs]
+    wall_ms: List[float] = [run["wall_seconds"] * 1000 for run in runs]
+    print(f"\n--- Cold import of '{arguments.target}' ({arguments.repeats} fresh interpreters) ---\n")
+    print(f"{'':<22}{'median_ms':>12}{'min_ms':>10}{'max_ms':>10}")
+    print(f"{'import (importtime)':<22}{median(import_ms):>12.1f}{min(import_ms):>10.1f}{max(import_ms):>10.1f}")
+    print(f"{'process wall time':<22}{median(wall_ms):>12.1f}{min(wall_ms):>10.1f}{max(wall_ms):>10.1f}")
+
+    # Every run imports the same modules, so the slowest list comes from the last (warmest disk cache) run.
+    print(f"\n--- Slowest {arguments.top} modules by cumulative import time ---\n")
+    for name, self_us, cumulative_us in sorted(runs[-1]["modules"], key=lambda module: module[2], reverse=True)[:arguments.top]:
+        print(f"{cumulative_us / 1000:>10.1f} ms  {self_us / 1000:>8.1f} ms self  {name.strip()}")
+
+    failed: bool = False
+    eager_modules: List[str] = deferred_modules_imported(runs[-1]["imported"])
+    if eager_modules:
+        failed = True
+        print(f"\nFAIL: importing {arguments.target} also imports {', '.join(eager_modules)}; these should load on first use.")
+    else:
+        print(f"\nOK: none of {', '.join(DEFERRED_MODULES)} is imported at startup.")
+
+    if arguments.budget_ms is not None and median(import_ms) > arguments.budget_ms:
+        failed = True
+        print(f"FAIL: median import time {median(import_ms):.1f} ms is over the {arguments.budget_ms:.1f} ms budget.")
+
+    if arguments.first_use:
+        first_use_seconds = measure_first_use()
+        if first_use_seconds is not None:
+            print(f"\nBuilding the LLM RAG classifier on first use: {first_use_seconds * 1000:.1f} ms (paid by the first request or by STARTUP_WARM_UP).")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
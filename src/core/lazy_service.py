@@ -0,0 +1,87 @@
+# <--- Imports --->
+import asyncio
+import importlib
+import sys
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Optional
+)
+
+# <--- Configurations --->
+class LazyService:
+    # Stands in for a module-level singleton and builds it on first use, so importing the app stays cheap and an
+    # unavailable dependency surfaces as a failed request instead of a failed import. Attribute access is forwarded.
+    def __init__(self, name: str, factory: Callable[[], Any], existing: Optional[Callable[[], Any]] = None):
+        self.__dict__["name"] = name
+        self.__dict__["factory"] = factory
+        # Finds an instance that was already built some other way, e.g. imported by another service.
+        self.__dict__["existing"] = existing
+        self.__dict__["instance"] = None
+        self.__dict__["init_seconds"] = None
+        self.__dict__["init_lock"] = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.peek() is not None
+
+    def get(self) -> Any:
+        if self.instance is None:
+            # Request threads and the warm-up thread may race to build the service.
+            with self.init_lock:
+                if self.instance is None:
+                    start_time: float = time.perf_counter()
+                    self.__dict__["instance"] = self.factory()
+                    self.__dict__["init_seconds"] = time.perf_counter() - start_time
+                    print(f"Initialised {self.name} in {self.init_seconds:.2f}s")
+        return self.instance
+
+    async def aget(self) -> Any:
+        # For async handlers: the first build (imports and all) runs in a worker thread instead of blocking the event loop.
+        instance = self.peek()
+        if instance is None:
+            instance = await asyncio.to_thread(self.get)
+        return instance
+
+    def peek(self) -> Optional[Any]:
+        # The instance if it has been built, without building it.
+        if self.instance is None and self.existing is not None:
+            self.__dict__["instance"] = self.existing()
+        return self.instance
+
+    def warm_up(self, then: Optional[Callable[[Any], None]] = None) -> bool:
+        try:
+            instance = self.get()
+            if then is not None:
+                then(instance)
+            return True
+        except Exception as e:
+            print(f"Something went wrong while warming up {self.name}: {e}")
+            return False
+
+    def stats(self) -> dict:
+        return {"ready": self.is_ready, "init_seconds": self.init_seconds}
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.get(), attribute)
+
+    def __setattr__(self, attribute: str, value: Any) -> None:
+        setattr(self.get(), attribute, value)
+
+def lazy_import(name: str, module_path: str, attribute: str) -> LazyService:
+    # The module, and everything it imports, is only loaded when the service is first used.
+    return LazyService(
+        name,
+        lambda: getattr(importlib.import_module(module_path), attribute),
+        existing=lambda: getattr(sys.modules.get(module_path), attribute, None)
+    )
+
+def resolve(service: Any) -> Optional[Any]:
+    # Built instance behind a LazyService (None while it is still unbuilt); plain objects pass through.
+    return service.peek() if isinstance(service, LazyService) else service
+
+async def aget_service(service: Any) -> Any:
+    # Built instance behind a LazyService, built off the event loop if needed; plain objects (e.g. a stand-in) pass through.
+    return await service.aget() if isinstance(service, LazyService) else service
@@ -0,0 +1,256 @@
+# <--- Imports --->
+import asyncio
+import bisect
+import functools
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
+
+# <--- Configurations --->
+# With metrics off every recorder returns straight away and decorated functions are left unwrapped.
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...], extra: str = "") -> str:
+    pairs: List[str] = [f'{name}="{escape_label_value(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric(ABC):
+    metric_type: str = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = (), enabled: bool = METRICS_ENABLED):
+        self.name: str = name
+        self.description: str = description
+        self.label_names: Tuple[str, ...] = tuple(label_names)
+        self.enabled: bool = enabled
+        self.lock = threading.Lock()
+
+    def __label_values__(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines: List[str] = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(Metric):
+    metric_type: str = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = self.__label_values__(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self.values.get(self.__label_values__(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            return [f"{self.name}{format_labels(self.label_names, key)} {format_value(value)}" for key, value in self.values.items()]
+
+class Gauge(Counter):
+    metric_type: str = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, amount: float = 1.0, **labels: str) -> Iterator[None]:
+        # Raises the gauge for the duration of the block, e.g. rows currently being classified.
+        self.inc(amount, **labels)
+        try:
+            yield
+        finally:
+            self.dec(amount, **labels)
+
+class Histogram(Metric):
+    metric_type: str = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # Per label set: a count per bucket (plus +Inf), the sum and the number of observations.
+        self.values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = self.__label_values__(labels)
+        position: int = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+                self.values[key] = entry
+            entry[0][position] += 1
+            entry[1][0] += value
+            entry[1][1] += 1
+
+    def count(self, **labels: str) -> int:
+        entry = self.values.get(self.__label_values__(labels))
+        return int(entry[1][1]) if entry is not None else 0
+
+    def samples(self) -> List[str]:
+        lines: List[str] = []
+        with self.lock:
+            for key, (bucket_counts, (total, count)) in self.values.items():
+                cumulative: int = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                    cumulative += bucket_count
+                    bucket_label: str = f'le="{format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{format_labels(self.label_names, key, bucket_label)} {cumulative}")
+                lines.append(f"{self.name}_sum{format_labels(self.label_names, key)} {format_value(total)}")
+                lines.append(f"{self.name}_count{format_labels(self.label_names, key)} {format_value(count)}")
+        return lines
+
+class CallbackMetric(Metric):
+    # Read at scrape time from state that is already counted elsewhere (cache stats), so it costs nothing per request.
+    def __init__(self, *args, metric_type: str = "gauge", read: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metric_type = metric_type
+        self.read = read
+
+    def samples(self) -> List[str]:
+        try:
+            values = self.read() if self.read is not None else {}
+        except Exception as e:
+            print(f"Something went wrong: {e}")
+            return []
+        return [f"{self.name}{format_labels(self.label_names, key)} {format_value(value)}" for key, value in values.items()]
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled: bool = enabled
+        self.metrics: Dict[str, Metric] = {}
+        self.lock = threading.Lock()
+
+    def __register__(self, metric: Metric) -> Metric:
+        with self.lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, description: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self.__register__(Counter(name, description, label_names, enabled=self.enabled)) #type: ignore
+
+    def gauge(self, name: str, description: str, label_names: Tuple[str, ...] = ()) -> Gauge:
+        return self.__register__(Gauge(name, description, label_names, enabled=self.enabled)) #type: ignore
+
+    def histogram(self, name: str, description: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.__register__(Histogram(name, description, label_names, buckets=buckets, enabled=self.enabled)) #type: ignore
+
+    def callback(
+            self,
+            name: str,
+            description: str,
+            label_names: Tuple[str, ...],
+            read: Callable[[], Dict[Tuple[str, ...], float]],
+            metric_type: str = "gauge"
+    ) -> CallbackMetric:
+        # Re-registering replaces the reader, so a rebuilt classifier or collection reports its own stats.
+        metric = CallbackMetric(name, description, label_names, metric_type=metric_type, read=read, enabled=self.enabled)
+        with self.lock:
+            self.metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self.lock:
+            metrics: List[Metric] = list(self.metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+metrics_registry = MetricsRegistry()
+
+# <--- Pipeline metrics --->
+STAGE_SECONDS: Histogram = metrics_registry.histogram(
+    "spam_pipeline_stage_seconds", "Time spent in each pipeline stage.", ("stage",)
+)
+STAGE_ERRORS: Counter = metrics_registry.counter(
+    "spam_pipeline_stage_errors_total", "Pipeline stages that raised.", ("stage",)
+)
+ROWS_IN_FLIGHT: Gauge = metrics_registry.gauge(
+    "spam_pipeline_rows_in_flight", "Rows currently being classified.", ("pipeline",)
+)
+ROWS_PROCESSED: Counter = metrics_registry.counter(
+    "spam_pipeline_rows_total", "Rows classified, by outcome.", ("pipeline", "outcome")
+)
+LLM_CALL_SECONDS: Histogram = metrics_registry.histogram(
+    "spam_llm_call_seconds", "Latency of single LLM calls.", ("model",)
+)
+LLM_CALLS: Counter = metrics_registry.counter(
+    "spam_llm_calls_total", "LLM calls, by outcome.", ("model", "outcome")
+)
+LLM_TOKENS: Counter = metrics_registry.counter(
+    "spam_llm_tokens_total", "LLM tokens, by kind (prompt or completion).", ("model", "kind")
+)
+RETRIES: Counter = metrics_registry.counter(
+    "spam_retries_total", "Retried work: OpenAI HTTP retries and batch rows re-examined one at a time.", ("source",)
+)
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    start_time: float = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start_time, stage=stage)
+
+def time_stage(stage: str):
+    # Usable inside generators, where a decorator would only time the generator's creation.
+    return stage_timer(stage) if metrics_registry.enabled else nullcontext()
+
+def timed(stage: str) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        if not metrics_registry.enabled:
+            return function
+
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def cache_stats_reader(read_stats: Callable[[], Dict[str, dict]], field: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    # Turns {"cache name": TTLCache.stats()} into {("cache name",): stats[field]} for a callback metric.
+    def read() -> Dict[Tuple[str, ...], float]:
+        return {(cache_name,): float(stats.get(field) or 0) for cache_name, stats in read_stats().items()}
+    return read
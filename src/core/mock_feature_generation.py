@@ -1,32 +1,110 @@
 import os
+import numpy as np
 import pandas as pd
-import random
 
 from datetime import (
-    date,
     datetime, 
-    timedelta, 
-    time
+    timedelta
 )
-from typing import List
+from functools import lru_cache
+from typing import (
+    List,
+    Optional
+)
+
+# <--- Configurations --->
+MOCK_DATA_SEED: Optional[int] = int(os.getenv("MOCK_DATA_SEED", "")) if os.getenv("MOCK_DATA_SEED") else None
+
+SAFE_GEOGRAPHIES: List[tuple] = [
+    ("Malaysia", "Kuala Lumpur"),
+    ("Malaysia", "Selangor"),
+    ("Singapore", "Central"),
+    ("Indonesia", "DKI Jakarta"),
+    ("Thailand", "Bangkok"),
+]
+
+UNEXPECTED_GEOGRAPHIES: List[tuple] = [
+    ("United States", "Virginia"),        # common DC region
+    ("Netherlands", "North Holland"),     # hosting-heavy region
+    ("Germany", "Hesse"),                 # Frankfurt DC hub
+    ("Hong Kong", "Hong Kong"),           # cross-border DC/hosting
+    ("Romania", "Bucharest"),
+]
+
+REGULAR_IP_RANGES: List[str] = [
+    "192.168.x.y",    # internal private LAN range
+    "10.0.x.y",         # private subnet
+    "172.16.x.y",        # private class B
+    "203.0.113.y",  # telco NAT/test-net
+    "124.13.x.y",     # Malaysia ISP allocation
+]
+
+IRREGULAR_IP_RANGES: List[str] = [
+    "185.220.100.y",    # Tor exit node range
+    "45.67.x.y",        # suspicious hosting provider block
+    "198.51.100.y",     # reserved test-net (used here as "foreign DC" mock)
+    "5.188.x.y",        # Eastern European DC range
+    "37.120.x.y",       # VPN/hosting common net
+]
+
+TEMPORAL_START: datetime = datetime(2025, 7, 1, 9, 0, 0)
+TEMPORAL_END: datetime = datetime(2025, 9, 30, 18, 0, 0)
+
+# Every value a column can take is formatted once; drawing a column is then a single fancy-index into these tables.
+@lru_cache(maxsize=1)
+def ip_address_table() -> np.ndarray:
+    # Shape (10, 256, 256): regular ranges, then irregular ranges, indexed by [range, x, y].
+    octets: List[str] = [str(octet) for octet in range(256)]
+    return np.array(
+        [
+            [[ip_range.replace("x", x).replace("y", y) for y in octets] for x in octets]
+            for ip_range in REGULAR_IP_RANGES + IRREGULAR_IP_RANGES
+        ],
+        dtype=object
+    )
+
+@lru_cache(maxsize=1)
+def time_of_day_table() -> np.ndarray:
+    return np.array(
+        [f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}" for second in range(24 * 60 * 60)],
+        dtype=object
+    )
+
+@lru_cache(maxsize=1)
+def date_table() -> np.ndarray:
+    days_span: int = (TEMPORAL_END.date() - TEMPORAL_START.date()).days
+    return np.array(
+        [(TEMPORAL_START + timedelta(days=offset_days)).date().isoformat() for offset_days in range(days_span + 1)],
+        dtype=object
+    )
 
 class FeatureInsertion:
-    def __init__(self) -> None:
+    def __init__(self, seed: Optional[int] = MOCK_DATA_SEED) -> None:
         self.mock_directory: str = os.path.abspath("./data/mock/")
         self.geographical_data_column: str = "Source_Location"
         self.network_data_column: str = "Source_IP"
         self.date_column: str = "Sent_Date"
         self.time_column: str = "Sent_Time"
+        self.generator: np.random.Generator = np.random.default_rng(seed)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        # The same seed and the same sequence of calls always produce the same dataset.
+        self.generator = np.random.default_rng(seed)
+
+    def __is_spam__(self, dataframe: pd.DataFrame) -> np.ndarray:
+        # Only the distinct categories are lower-cased, not every row.
+        category_codes, categories = pd.factorize(dataframe["Category"])
+        spam_codes: List[int] = [code for code, category in enumerate(categories) if str(category).lower() == "spam"]
+        return np.isin(category_codes, spam_codes)
 
-    def __retrieve_null_rows__(
-            self, 
-            dataframe: pd.DataFrame, 
-            column_name: str
-    ) -> pd.DataFrame:
-        null_rows_indices = dataframe[column_name].isnull()
-        null_rows: pd.DataFrame = dataframe[null_rows_indices]
+    def __prefers_expected__(self, is_spam: np.ndarray) -> np.ndarray:
+        # Spam always gets the unexpected value; ham gets the expected one 10 times out of 11.
+        return ~is_spam & (self.generator.integers(0, 11, size=len(is_spam)) > 0)
 
-        return null_rows
+    def __null_mask__(self, dataframe: pd.DataFrame, column_name: str) -> np.ndarray:
+        if column_name not in dataframe:
+            dataframe[column_name] = None
+        return dataframe[column_name].isnull().to_numpy()
 
     def export_to_path(self, dataframe: pd.DataFrame) -> None:
         dataset_path: str = os.path.abspath(f"{self.mock_directory}/mock_dataset.csv")
@@ -43,14 +121,14 @@ class FeatureInsertion:
             print(f"Something went wrong: {e}")
 
     def increasing_spam_frequency(self, dataframe: pd.DataFrame) -> pd.DataFrame:
-        frequency_of_spam: int = random.randint(1, 10)
-        random_count: int = random.randint(1, 10)
+        frequency_of_spam: int = int(self.generator.integers(1, 11))
+        random_count: int = int(self.generator.integers(1, 11))
 
         def retrieve_spam_rows() -> List[int]:
             spam_rows = dataframe.loc[dataframe["Category"] == "spam"].index
             return list(spam_rows)
 
-        random_spam_indices: List[int] = random.sample(retrieve_spam_rows(), random_count)
+        random_spam_indices: List[int] = list(self.generator.choice(retrieve_spam_rows(), size=random_count, replace=False))
 
         duplicated_rows: pd.DataFrame = pd.concat([dataframe.loc[random_spam_indices]] * frequency_of_spam, ignore_index=True)
         final_dataframe: pd.DataFrame = pd.concat([dataframe, duplicated_rows], ignore_index=True)
@@ -58,136 +136,60 @@ class FeatureInsertion:
         return final_dataframe
     
     def insert_geographical_data(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        null_rows = self.__null_mask__(dataframe=dataframe, column_name=self.geographical_data_column)
+        if not null_rows.any():
+            return dataframe
 
-        safe_geographies = [
-            ("Malaysia", "Kuala Lumpur"),
-            ("Malaysia", "Selangor"),
-            ("Singapore", "Central"),
-            ("Indonesia", "DKI Jakarta"),
-            ("Thailand", "Bangkok"),
-        ]
-
-        unexpected_geographies = [
-            ("United States", "Virginia"),        # common DC region
-            ("Netherlands", "North Holland"),     # hosting-heavy region
-            ("Germany", "Hesse"),                 # Frankfurt DC hub
-            ("Hong Kong", "Hong Kong"),           # cross-border DC/hosting
-            ("Romania", "Bucharest"),
-        ]
-        
-        def generate_random_geographical_data(category: str) -> str:
-            random_index: int = random.randint(0, 4)
-
-            safe_geography: tuple = safe_geographies[random_index]
-            unexpected_geography: tuple = unexpected_geographies[random_index]
+        is_spam = self.__is_spam__(dataframe)[null_rows]
+        random_index = self.generator.integers(0, 5, size=len(is_spam))
 
-            if category.lower() == "spam":
-                generated_data: tuple = unexpected_geography
-            else:
-                generated_data: tuple = safe_geography if random.randint(0, 10) > 0 else unexpected_geography
+        safe_geographies = np.array([str(geography) for geography in SAFE_GEOGRAPHIES], dtype=object)
+        unexpected_geographies = np.array([str(geography) for geography in UNEXPECTED_GEOGRAPHIES], dtype=object)
 
-            return str(generated_data)
-
-        if self.geographical_data_column not in dataframe:
-            dataframe[self.geographical_data_column] = None
-        
-        if (dataframe[self.geographical_data_column].isnull().sum() > 0):
-            null_rows: pd.DataFrame = self.__retrieve_null_rows__(dataframe=dataframe, column_name=self.geographical_data_column)
-
-            for index, row in null_rows.iterrows():
-                generated_geographical_data: str = generate_random_geographical_data(category=row.Category)
-                dataframe.loc[index, self.geographical_data_column] = generated_geographical_data #type: ignore
+        dataframe.loc[null_rows, self.geographical_data_column] = np.where(
+            self.__prefers_expected__(is_spam),
+            safe_geographies[random_index],
+            unexpected_geographies[random_index]
+        )
 
         return dataframe
 
     def insert_network_data(self, dataframe: pd.DataFrame) -> pd.DataFrame:
-        regular_ip_ranges: List[str] = [
-            "192.168.x.y",    # internal private LAN range
-            "10.0.x.y",         # private subnet
-            "172.16.x.y",        # private class B
-            "203.0.113.y",  # telco NAT/test-net
-            "124.13.x.y",     # Malaysia ISP allocation
-        ]
-
-        irregular_ip_ranges: List[str] = [
-            "185.220.100.y",    # Tor exit node range
-            "45.67.x.y",        # suspicious hosting provider block
-            "198.51.100.y",     # reserved test-net (used here as "foreign DC" mock)
-            "5.188.x.y",        # Eastern European DC range
-            "37.120.x.y",       # VPN/hosting common net
-        ]
-
-        def generate_random_network_ip(category: str) -> str:
-            random_index: int = random.randint(0, 4)
-            third_octet: int = random.randint(0, 255)
-            fourth_octet: int = random.randint(0, 255)
-            
-            translation_dict: dict = {
-                "x" : str(third_octet),
-                "y" : str(fourth_octet)
-            }
-
-            translation_table = str.maketrans(translation_dict)
-
-            regular_ip: str = regular_ip_ranges[random_index]
-            irregular_ip: str = irregular_ip_ranges[random_index]
-
-            if (category.lower() == "spam"):
-                generated_ip: str = irregular_ip
-            else:
-                generated_ip: str = regular_ip if random.randint(0, 10) > 0 else irregular_ip
-
-            return generated_ip.translate(translation_table)
-        
-        if self.network_data_column not in dataframe:
-            dataframe[self.network_data_column] = None
+        null_rows = self.__null_mask__(dataframe=dataframe, column_name=self.network_data_column)
+        if not null_rows.any():
+            return dataframe
 
-        if (dataframe[self.network_data_column].isnull().sum() > 0):
-            null_rows: pd.DataFrame = self.__retrieve_null_rows__(dataframe=dataframe, column_name=self.network_data_column)
+        is_spam = self.__is_spam__(dataframe)[null_rows]
+        random_index = self.generator.integers(0, 5, size=len(is_spam))
+        third_octet = self.generator.integers(0, 256, size=len(is_spam))
+        fourth_octet = self.generator.integers(0, 256, size=len(is_spam))
 
-            for index, row in null_rows.iterrows():
-                generated_network_data: str = generate_random_network_ip(category=row.Category)
-                dataframe.loc[index, self.network_data_column] = generated_network_data #type: ignore
+        # Irregular ranges follow the regular ones in the lookup table.
+        ip_range = np.where(self.__prefers_expected__(is_spam), random_index, random_index + len(REGULAR_IP_RANGES))
+        dataframe.loc[null_rows, self.network_data_column] = ip_address_table()[ip_range, third_octet, fourth_octet]
 
         return dataframe
     
     def insert_temporal_data(self, dataframe: pd.DataFrame) -> pd.DataFrame:
-        start_datetime: datetime = datetime(2025, 7, 1, 9, 0, 0)
-        end_datetime: datetime = datetime(2025, 9, 30, 18, 0, 0)
-
-        def generate_random_date() -> date:
-            days_span = (end_datetime.date() - start_datetime.date()).days
-            offset_days = random.randint(0, days_span)
-            return (start_datetime + timedelta(days=offset_days)).date()
-
-        def generate_random_time(category: str) -> time:
-            if category.lower() == "spam":
-                hour: int = random.randint(0, 5)
-            else:
-                hour: int = random.randint(9, 18)
-            minute: int = random.randint(0, 59)
-            second: int = random.randint(0, 59)
-            return time(hour, minute, second)
-        
-        if self.date_column not in dataframe:
-            dataframe[self.date_column] = None
-
-        if self.time_column not in dataframe:
-            dataframe[self.time_column] = None
-
-        if (dataframe[self.date_column].isnull().sum() > 0):
-            null_rows: pd.DataFrame = self.__retrieve_null_rows__(dataframe=dataframe, column_name=self.date_column)
-
-            for index, _ in null_rows.iterrows():
-                generated_date: date = generate_random_date()
-                dataframe.loc[index, self.date_column] = generated_date #type: ignore
-
-        if (dataframe[self.time_column].isnull().sum() > 0):
-            null_rows: pd.DataFrame = self.__retrieve_null_rows__(dataframe=dataframe, column_name=self.time_column)
+        null_dates = self.__null_mask__(dataframe=dataframe, column_name=self.date_column)
+        null_times = self.__null_mask__(dataframe=dataframe, column_name=self.time_column)
+
+        if null_dates.any():
+            dates = date_table()
+            dataframe.loc[null_dates, self.date_column] = dates[self.generator.integers(0, len(dates), size=int(null_dates.sum()))]
+
+        if null_times.any():
+            is_spam = self.__is_spam__(dataframe)[null_times]
+            # Spam is sent between 00:00 and 05:59, ham between 09:00 and 18:59.
+            hour = np.where(
+                is_spam,
+                self.generator.integers(0, 6, size=len(is_spam)),
+                self.generator.integers(9, 19, size=len(is_spam))
+            )
+            minute = self.generator.integers(0, 60, size=len(is_spam))
+            second = self.generator.integers(0, 60, size=len(is_spam))
+            dataframe.loc[null_times, self.time_column] = time_of_day_table()[hour * 3600 + minute * 60 + second]
 
-            for index, row in null_rows.iterrows():
-                generated_time = generate_random_time(category=row.Category)
-                dataframe.loc[index, self.time_column] = generated_time #type: ignore
         return dataframe
     
 feature_insertion = FeatureInsertion()
\ No newline at end of file
@@ -0,0 +1,136 @@
+# <--- Imports --->
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Optional,
+    Tuple
+)
+
+# <--- Configurations --->
+def approximate_size(value: Any) -> int:
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    try:
+        return sys.getsizeof(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+class TTLCache:
+    def __init__(
+            self,
+            max_entries: int = 128,
+            ttl_seconds: Optional[float] = 300.0,
+            max_bytes: Optional[int] = None,
+            sizeof: Callable[[Any], int] = approximate_size,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
+        self.max_entries: int = max_entries
+        self.ttl_seconds: Optional[float] = ttl_seconds
+        self.max_bytes: Optional[int] = max_bytes
+        self.sizeof = sizeof
+        self.clock = clock
+
+        self.__entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.total_bytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __is_expired__(self, stored_at: float, now: float) -> bool:
+        if self.ttl_seconds is None:
+            return False
+        return (now - stored_at) >= self.ttl_seconds
+
+    def __remove__(self, key: Hashable) -> None:
+        _, _, size = self.__entries.pop(key)
+        self.total_bytes -= size
+
+    def __is_over_capacity__(self) -> bool:
+        if len(self.__entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            stored_at, value, _ = entry
+            if self.__is_expired__(stored_at, self.clock()):
+                self.__remove__(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size: int = self.sizeof(value) if self.max_bytes is not None else 0
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove__(key)
+
+            self.__entries[key] = (self.clock(), value, size)
+            self.total_bytes += size
+
+            while self.__entries and self.__is_over_capacity__():
+                oldest_key = next(iter(self.__entries))
+                self.__remove__(oldest_key)
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        # The factory runs outside the lock so a slow fetch does not block readers of other keys.
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+
+        value = factory()
+        self.set(key, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self.__lock:
+            if key is None:
+                self.__entries.clear()
+                self.total_bytes = 0
+            elif key in self.__entries:
+                self.__remove__(key)
+
+    def stats(self) -> dict:
+        with self.__lock:
+            lookups: int = self.hits + self.misses
+            return {
+                "entries": len(self.__entries),
+                "max_entries": self.max_entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
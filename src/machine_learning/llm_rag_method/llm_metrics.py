@@ -0,0 +1,99 @@
+# <--- Imports --->
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from typing import (
+    Any,
+    Dict,
+    Tuple
+)
+from uuid import UUID
+
+from src.core.metrics import (
+    LLM_CALLS,
+    LLM_CALL_SECONDS,
+    LLM_TOKENS,
+    RETRIES
+)
+
+# <--- Configurations --->
+OPENAI_RETRY_HEADER: str = "x-stainless-retry-count"
+
+def model_name_from(serialized: Dict[str, Any], invocation_params: Dict[str, Any]) -> str:
+    kwargs: Dict[str, Any] = (serialized or {}).get("kwargs", {}) or {}
+    return str(
+        invocation_params.get("model_name")
+        or invocation_params.get("model")
+        or kwargs.get("model_name")
+        or kwargs.get("model")
+        or invocation_params.get("_type", "unknown")
+    )
+
+def token_usage_from(response: LLMResult) -> Tuple[int, int]:
+    # Chat models put usage on each message; older integrations only report it in llm_output.
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += int(usage.get("input_tokens", 0))
+                completion_tokens += int(usage.get("output_tokens", 0))
+
+    if not prompt_tokens and not completion_tokens:
+        token_usage: Dict[str, Any] = (response.llm_output or {}).get("token_usage", {}) or {}
+        prompt_tokens = int(token_usage.get("prompt_tokens", 0))
+        completion_tokens = int(token_usage.get("completion_tokens", 0))
+    return prompt_tokens, completion_tokens
+
+class LlmMetricsCallbackHandler(BaseCallbackHandler):
+    # Attached to the chat model itself, so examiner chains, batch chains and both agents are all counted.
+    # The handlers only touch in-memory counters, so async runs call them inline rather than in a thread.
+    run_inline: bool = True
+
+    def __init__(self):
+        self.started_runs: Dict[UUID, Tuple[float, str]] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, invocation_params: Any = None, **kwargs: Any) -> None:
+        self.started_runs[run_id] = (time.perf_counter(), model_name_from(serialized, invocation_params or {}))
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, invocation_params: Any = None, **kwargs: Any) -> None:
+        self.started_runs[run_id] = (time.perf_counter(), model_name_from(serialized, invocation_params or {}))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        start_time, model_name = self.started_runs.pop(run_id, (None, "unknown"))
+        if start_time is not None:
+            LLM_CALL_SECONDS.observe(time.perf_counter() - start_time, model=model_name)
+        LLM_CALLS.inc(model=model_name, outcome="ok")
+
+        prompt_tokens, completion_tokens = token_usage_from(response)
+        LLM_TOKENS.inc(prompt_tokens, model=model_name, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens, model=model_name, kind="completion")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        start_time, model_name = self.started_runs.pop(run_id, (None, "unknown"))
+        if start_time is not None:
+            LLM_CALL_SECONDS.observe(time.perf_counter() - start_time, model=model_name)
+        LLM_CALLS.inc(model=model_name, outcome="error")
+
+    def on_retry(self, retry_state: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        RETRIES.inc(source="langchain")
+
+llm_metrics_callback = LlmMetricsCallbackHandler()
+
+def count_openai_retry(request) -> None:
+    # The OpenAI SDK retries inside one LLM call; each attempt after the first carries its retry number.
+    if request.headers.get(OPENAI_RETRY_HEADER, "0") != "0":
+        RETRIES.inc(source="openai_http")
+
+async def acount_openai_retry(request) -> None:
+    count_openai_retry(request)
+
+def build_openai_http_clients() -> Dict[str, Any]:
+    # The SDK's default httpx clients (same timeouts and pool limits) with a hook that sees every retry.
+    from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+    return {
+        "http_client": DefaultHttpxClient(event_hooks={"request": [count_openai_retry]}),
+        "http_async_client": DefaultAsyncHttpxClient(event_hooks={"request": [acount_openai_retry]}),
+    }
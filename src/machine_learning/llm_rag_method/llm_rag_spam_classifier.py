@@ -1,218 +1,759 @@
 # <--- Imports --->
+import asyncio
+import json
+import os
 from concurrent.futures import ThreadPoolExecutor
 from langchain.agents import create_tool_calling_agent, AgentExecutor
 from langchain.tools import tool
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
 
 # Assuming these exist in your project structure
+from src.core.metrics import (
+    RETRIES,
+    metrics_registry,
+    timed
+)
 from src.machine_learning.llm_rag_method.vector_store.vector_database import vector_collection
 from src.machine_learning.llm_rag_method.models.object_model import DataObject
+from src.machine_learning.llm_rag_method.models.row_batch import (
+    DataRow,
+    presplit_location,
+    presplit_sent_clock
+)
+from src.machine_learning.llm_rag_method.llm_metrics import (
+    build_openai_http_clients,
+    llm_metrics_callback
+)
+from src.machine_learning.llm_rag_method.rule_engine.geography_lookup_table import (
+    GeographyLookupTable,
+    geography_lookup_table
+)
+from src.machine_learning.llm_rag_method.rule_engine.network_prefix_index import (
+    NetworkPrefixIndex,
+    network_prefix_index
+)
+from src.machine_learning.llm_rag_method.rule_engine.score_aggregator import (
+    ScoreAggregator,
+    score_aggregator
+)
+from src.machine_learning.llm_rag_method.rule_engine.temporal_rule_engine import (
+    TemporalRuleEngine,
+    temporal_rule_engine
+)
+from src.machine_learning.llm_rag_method.verdict_cache import VerdictCache
 
 load_dotenv()
 
 # <--- Configurations --->
+USE_TEMPORAL_AGENT: bool = os.getenv("USE_TEMPORAL_AGENT", "false").lower() == "true"
+EXAMINER_MAX_WORKERS: int = int(os.getenv("EXAMINER_MAX_WORKERS", "4"))
+
+MESSAGE_GUIDELINE: str = "message_guideline"
+NETWORK_GUIDELINE: str = "network_guideline"
+GEOGRAPHY_GUIDELINE: str = "geography_guideline"
+
+# Validated API rows and the CSV stream's DataRow carry the same fields, including the pre-split ones.
+ClassifiableRow = Union[DataObject, DataRow]
+
+# <--- Prompts --->
+MESSAGE_EXAMINER_RULES: str = """
+    # TASK
+    Your sole task is to decide whether the given input is SPAM or HAM based on the Guidelines Provided.
+
+    # RULES:
+        1. Reply in this format: "TRUE/FALSE: Explanation"
+            - TRUE if SPAM
+            - FALSE if HAM
+            - Divulge into your explanation based on the guidelines.
+"""
+
+NETWORK_EXAMINER_RULES: str = """
+    # TASK
+    Your sole task is to decide whether the given input is SPAM or HAM basde on the guidelines provided.
+
+    # RULES:
+        1. Reply in this format: "TRUE/FALSE: Explanation"
+            - TRUE if given network is within SUSPICIOUS IP ADDRESS RANGES (SUSPICIOUS/SPAM LIKELY)
+            - FALSE if given network is SAFE/within SAFE IP ADDRESS RANGES (HAM)
+            - Divulge into your explanation based on the explanation.
+"""
+
+GEOGRAPHY_EXAMINER_RULES: str = """
+    # TASK
+    Your sole task is to decide whether the given input is SPAM or HAM based on the Guidelines Provided.
+
+    # RULES:
+        1. Reply in this format: "TRUE/FALSE: Explanation"
+            - TRUE if Geography is SUSPICIOUS/SPAM LIKELY
+            - FALSE if Geography is SAFE/HAM
+            - Divulge into your explanation based on the guidelines.
+"""
+
+SINGLE_INPUT_SECTION: str = """
+    Guidelines: {guidelines}
+    Human: {input}
+"""
+
+# Batched prompts carry the guidelines once for K rows. The reply must be a JSON object keyed by row id.
+BATCH_INPUT_SECTION: str = """
+    # BATCH FORMAT:
+        1. Inputs are a JSON array of objects, each with a "row_id" and an "input".
+        2. Judge every input on its own using the rules above.
+        3. Reply with only a JSON object that maps every row_id (as a string) to its "TRUE/FALSE: Explanation" verdict.
+
+    Guidelines: {guidelines}
+    Inputs: {inputs}
+"""
+
+MESSAGE_AGENT_PROMPT = ChatPromptTemplate.from_template(MESSAGE_EXAMINER_RULES + SINGLE_INPUT_SECTION)
+MESSAGE_BATCH_PROMPT = ChatPromptTemplate.from_template(MESSAGE_EXAMINER_RULES + BATCH_INPUT_SECTION)
+
+NETWORK_DATA_EXAMINER_PROMPT = ChatPromptTemplate.from_template(NETWORK_EXAMINER_RULES + SINGLE_INPUT_SECTION)
+NETWORK_DATA_BATCH_PROMPT = ChatPromptTemplate.from_template(NETWORK_EXAMINER_RULES + BATCH_INPUT_SECTION)
+
+TEMPORAL_AGENT_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """
+            # TASK
+            Your sole task is to decide whether the given temporal input is SPAM or HAM based on the output of the tool provided.
+
+            # RULES
+                1. Always use the the tool "is_suspicious_hour" to base your answer upon.
+                2. Reply in this format: "TRUE/FALSE: Explanation"
+                    - TRUE if hour is SPAM based on Tool Output
+                    - FALSE if hour is HAM based on Tool Output
+            """,
+        ),
+        ("user", "{input}"),
+        ("placeholder", "{agent_scratchpad}"),
+    ]
+)
+
+GEOGRAPHY_EXAMINER_PROMPT = ChatPromptTemplate.from_template(GEOGRAPHY_EXAMINER_RULES + SINGLE_INPUT_SECTION)
+GEOGRAPHY_BATCH_PROMPT = ChatPromptTemplate.from_template(GEOGRAPHY_EXAMINER_RULES + BATCH_INPUT_SECTION)
+
+AGGREGATOR_AGENT_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """
+            # TASK
+            Your sole task is to determine how likely a message is suspicious of being spam based on the number of true statements for four columns.
+
+            # RULES:
+                1. Always use the provided tool "percentage_of_spam"
+                2. Only return the percentage of spam.
+            """,
+        ),
+        ("user", "{input}"),
+        ("placeholder", "{agent_scratchpad}"),
+    ]
+)
+
+# <--- Tools --->
+@tool("percentage_of_spam", description="Takes the number of True Statements, and returns the final percentage of how likely the message is deemed to be SPAM.")
+def percentage_of_spam(number_of_true_statements: str):
+    try:
+        number_of_true_statements_int: int = int(number_of_true_statements)
+    except ValueError:
+        return "Error: Input must be a number."
+    return f"{(number_of_true_statements_int/4)*100:.0f}%"
+
+# <--- Classifier --->
 class LlmRagSpamClassifier:
-    def __init__(self):
-        self.LLM = ChatOpenAI(
+    def __init__(
+            self,
+            llm=None,
+            guideline_source=None,
+            use_temporal_agent: bool = USE_TEMPORAL_AGENT,
+            temporal_rules: TemporalRuleEngine = temporal_rule_engine,
+            aggregator: ScoreAggregator = score_aggregator,
+            max_workers: int = EXAMINER_MAX_WORKERS,
+            verdict_cache: Optional[VerdictCache] = None,
+            network_index: NetworkPrefixIndex = network_prefix_index,
+            geography_table: GeographyLookupTable = geography_lookup_table
+    ):
+        self.LLM = llm if llm is not None else ChatOpenAI(
             model="gpt-4o-mini",
-            temperature=0.1
+            temperature=0.1,
+            **(build_openai_http_clients() if metrics_registry.enabled else {})
+        )
+        self.__attach_llm_metrics__()
+        self.guideline_source = guideline_source if guideline_source is not None else vector_collection
+
+        # The rule engine answers the temporal signal locally; the tool-calling agent is only used on request.
+        self.use_temporal_agent: bool = use_temporal_agent
+        self.temporal_rules: TemporalRuleEngine = temporal_rules
+        self.score_aggregator: ScoreAggregator = aggregator
+
+        # IPs inside a compiled guideline range are answered locally; only unmatched IPs reach the LLM.
+        self.network_index: NetworkPrefixIndex = network_index
+        # Listed locations are answered from the compiled table; LLM answers for new locations are added to it.
+        self.geography_table: GeographyLookupTable = geography_table
+
+        # Duplicate rows and repeated field values reuse earlier verdicts until the guidelines change.
+        self.verdict_cache: VerdictCache = verdict_cache if verdict_cache is not None else VerdictCache()
+        if hasattr(self.guideline_source, "add_invalidation_listener"):
+            self.guideline_source.add_invalidation_listener(self.verdict_cache.invalidate)
+            self.guideline_source.add_invalidation_listener(self.geography_table.forget_learned)
+
+        # One bounded pool is shared by the examiners of every row instead of a new pool per row.
+        self.examiner_executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="llm-rag-examiner"
         )
 
-    def __read_message_content__(self, message_content: str):
-        message_agent_prompt = ChatPromptTemplate.from_template(
-            """
-            # TASK 
-            Your sole task is to decide whether the given input is SPAM or HAM based on the Guidelines Provided.
+        self.__build_chains__()
 
-            # RULES: 
-                1. Reply in this format: "TRUE/FALSE: Explanation"
-                    - TRUE if SPAM
-                    - FALSE if HAM
-                    - Divulge into your explanation based on the guidelines.
+    def __attach_llm_metrics__(self) -> None:
+        # Token counts and call latency come from a callback on the model, so every chain and agent built on it reports them.
+        if not metrics_registry.enabled or not hasattr(self.LLM, "callbacks"):
+            return
+        callbacks = list(self.LLM.callbacks or [])
+        if llm_metrics_callback not in callbacks:
+            self.LLM.callbacks = callbacks + [llm_metrics_callback]
 
-            Guidelines: {guidelines}
-            Human: {input}
-            """
-        )
-        message_guideline: str = "message_guideline"
+    def __build_chains__(self) -> None:
+        self.message_agent_chain = MESSAGE_AGENT_PROMPT | self.LLM
+        self.network_agent_chain = NETWORK_DATA_EXAMINER_PROMPT | self.LLM
+        self.geography_agent_chain = GEOGRAPHY_EXAMINER_PROMPT | self.LLM
+
+        self.message_batch_chain = MESSAGE_BATCH_PROMPT | self.LLM
+        self.network_batch_chain = NETWORK_DATA_BATCH_PROMPT | self.LLM
+        self.geography_batch_chain = GEOGRAPHY_BATCH_PROMPT | self.LLM
+
+        temporal_rules: TemporalRuleEngine = self.temporal_rules
+
+        @tool("is_suspicious_hour", description="Takes the hour input and returns a boolean. If TRUE, the hour at which message was sent is suspicious. If False, the hour at which message was sent is not likely to be spam.")
+        def is_suspicious_hour(hour: str) -> bool:
+            return temporal_rules.is_suspicious_hour(int(hour))
+
+        temporal_tools = [is_suspicious_hour]
+        temporal_agent = create_tool_calling_agent(self.LLM, temporal_tools, TEMPORAL_AGENT_PROMPT)
+        self.temporal_agent_executor = AgentExecutor(agent=temporal_agent, tools=temporal_tools, verbose=False)
+
+        aggregator_tools = [percentage_of_spam]
+        aggregator_agent = create_tool_calling_agent(self.LLM, aggregator_tools, AGGREGATOR_AGENT_PROMPT)
+        self.aggregator_agent_executor = AgentExecutor(agent=aggregator_agent, tools=aggregator_tools, verbose=False)
 
-        message_agent_chain = message_agent_prompt | self.LLM
+    def __remember_verdict__(self, signal_name: str, value: str, verdict) -> None:
+        # Only well-formed verdicts are cached; anything else goes back through the LLM next time.
+        if self.score_aggregator.parse_verdict(verdict) is not None:
+            self.verdict_cache.set_signal(signal_name, value, str(verdict))
 
-        agent_reply = message_agent_chain.invoke(
+    def __invoke_examiner__(self, signal_name: str, chain, header: str, value: str):
+        cached_verdict = self.verdict_cache.get_signal(signal_name, value)
+        if cached_verdict is not None:
+            return cached_verdict
+
+        agent_reply = chain.invoke(
             {
-                "guidelines": vector_collection.fetch_object_from_header(message_guideline),
-                "input": message_content
+                "guidelines": self.guideline_source.fetch_object_from_header(header),
+                "input": value
             }
         )
 
+        self.__remember_verdict__(signal_name, value, agent_reply.content)
         return agent_reply.content
 
+    @timed("read_message_content")
+    def __read_message_content__(self, message_content: str):
+        return self.__invoke_examiner__("message_content", self.message_agent_chain, MESSAGE_GUIDELINE, message_content)
 
+    @timed("examine_network_data")
     def __examine_network_data__(self, network_data: str):
-        network_guideline: str = "network_guideline"
-        
-        network_data_examiner_prompt = ChatPromptTemplate.from_template(
-            """
-            # TASK
-            Your sole task is to decide whether the given input is SPAM or HAM basde on the guidelines provided.
-
-            # RULES:
-                1. Reply in this format: "TRUE/FALSE: Explanation"
-                    - TRUE if given network is within SUSPICIOUS IP ADDRESS RANGES (SUSPICIOUS/SPAM LIKELY)
-                    - FALSE if given network is SAFE/within SAFE IP ADDRESS RANGES (HAM)
-                    - Divulge into your explanation based on the explanation.
-            
-            Guidelines: {guidelines}
-            Human: {input}
-            """
+        local_verdict = self.network_index.verdict_for(network_data)
+        if local_verdict is not None:
+            return local_verdict
+        return self.__invoke_examiner__("network_data", self.network_agent_chain, NETWORK_GUIDELINE, network_data)
+
+    @timed("examine_temporal_data")
+    def __examine_temporal_data__(self, sent_time: str, source_location: Optional[str] = None, data_row: Optional[ClassifiableRow] = None):
+        if self.use_temporal_agent:
+            return self.__examine_temporal_data_with_agent__(sent_time)
+
+        return self.temporal_rules.evaluate(
+            sent_time=sent_time,
+            source_location=source_location,
+            sent_clock=presplit_sent_clock(data_row),
+            location=presplit_location(data_row)
         )
 
-        network_agent_chain = network_data_examiner_prompt | self.LLM
+    def __examine_temporal_data_with_agent__(self, sent_time: str):
+        hour_sent: str = sent_time.split(":")[0]
+
+        cached_verdict = self.verdict_cache.get_signal("temporal_data", hour_sent)
+        if cached_verdict is not None:
+            return cached_verdict
 
-        agent_reply = network_agent_chain.invoke(
+        agent_reply = self.temporal_agent_executor.invoke({"input": hour_sent})
+
+        # AgentExecutor returns a dict with 'output' key
+        self.__remember_verdict__("temporal_data", hour_sent, agent_reply["output"])
+        return agent_reply["output"]
+
+    def __remember_geography__(self, geographical_data: str, verdict) -> None:
+        parsed_verdict = self.score_aggregator.parse_verdict(verdict)
+        if parsed_verdict is not None:
+            self.geography_table.remember(geographical_data, parsed_verdict[0], str(verdict))
+
+    @timed("examine_geographical_data")
+    def __examine_geographical_data__(self, geographical_data: str, data_row: Optional[ClassifiableRow] = None):
+        local_verdict = self.geography_table.verdict_for(geographical_data, presplit_location(data_row))
+        if local_verdict is not None:
+            return local_verdict
+
+        agent_reply = self.__invoke_examiner__("geographical_data", self.geography_agent_chain, GEOGRAPHY_GUIDELINE, geographical_data)
+        self.__remember_geography__(geographical_data, agent_reply)
+        return agent_reply
+
+    async def __afetch_guidelines__(self, header: str) -> str:
+        # Sources with an async lookup use the async connection pool; others run the sync lookup off the event loop.
+        if hasattr(self.guideline_source, "afetch_object_from_header"):
+            return await self.guideline_source.afetch_object_from_header(header)
+        return await asyncio.to_thread(self.guideline_source.fetch_object_from_header, header)
+
+    async def __ainvoke_examiner__(self, signal_name: str, chain, header: str, value: str):
+        cached_verdict = self.verdict_cache.get_signal(signal_name, value)
+        if cached_verdict is not None:
+            return cached_verdict
+
+        agent_reply = await chain.ainvoke(
             {
-                "guidelines": vector_collection.fetch_object_from_header(network_guideline),
-                "input": network_data
+                "guidelines": await self.__afetch_guidelines__(header),
+                "input": value
             }
         )
 
+        self.__remember_verdict__(signal_name, value, agent_reply.content)
         return agent_reply.content
-    
-    def __examine_temporal_data__(self, sent_time: str):
-        @tool("is_suspicious_hour", description="Takes the hour input and returns a boolean. If TRUE, the hour at which message was sent is suspicious. If False, the hour at which message was sent is not likely to be spam.")
-        def is_suspicious_hour(hour: str) -> bool:
-            hour_int: int = int(hour)
-            if (hour_int < 6):
-                return True
-            else:
-                return False
-        
-        hour_sent: str = sent_time.split(":")[0]
-        tools = [is_suspicious_hour]
-
-        # UPDATED: Prompt must include agent_scratchpad for tools
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """
-                    # TASK
-                    Your sole task is to decide whether the given temporal input is SPAM or HAM based on the output of the tool provided.
-
-                    # RULES
-                        1. Always use the the tool "is_suspicious_hour" to base your answer upon.
-                        2. Reply in this format: "TRUE/FALSE: Explanation"
-                            - TRUE if hour is SPAM based on Tool Output
-                            - FALSE if hour is HAM based on Tool Output
-                    """,
-                ),
-                ("user", "{input}"),
-                ("placeholder", "{agent_scratchpad}"),
-            ]
+
+    @timed("read_message_content")
+    async def __aread_message_content__(self, message_content: str):
+        return await self.__ainvoke_examiner__("message_content", self.message_agent_chain, MESSAGE_GUIDELINE, message_content)
+
+    @timed("examine_network_data")
+    async def __aexamine_network_data__(self, network_data: str):
+        local_verdict = self.network_index.verdict_for(network_data)
+        if local_verdict is not None:
+            return local_verdict
+        return await self.__ainvoke_examiner__("network_data", self.network_agent_chain, NETWORK_GUIDELINE, network_data)
+
+    @timed("examine_temporal_data")
+    async def __aexamine_temporal_data__(self, sent_time: str, source_location: Optional[str] = None, data_row: Optional[ClassifiableRow] = None):
+        if self.use_temporal_agent:
+            hour_sent: str = sent_time.split(":")[0]
+
+            cached_verdict = self.verdict_cache.get_signal("temporal_data", hour_sent)
+            if cached_verdict is not None:
+                return cached_verdict
+
+            agent_reply = await self.temporal_agent_executor.ainvoke({"input": hour_sent})
+            self.__remember_verdict__("temporal_data", hour_sent, agent_reply["output"])
+            return agent_reply["output"]
+
+        return self.temporal_rules.evaluate(
+            sent_time=sent_time,
+            source_location=source_location,
+            sent_clock=presplit_sent_clock(data_row),
+            location=presplit_location(data_row)
         )
 
-        # UPDATED: Create agent and executor
-        agent = create_tool_calling_agent(self.LLM, tools, prompt)
-        agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=False)
+    @timed("examine_geographical_data")
+    async def __aexamine_geographical_data__(self, geographical_data: str, data_row: Optional[ClassifiableRow] = None):
+        local_verdict = self.geography_table.verdict_for(geographical_data, presplit_location(data_row))
+        if local_verdict is not None:
+            return local_verdict
+
+        agent_reply = await self.__ainvoke_examiner__("geographical_data", self.geography_agent_chain, GEOGRAPHY_GUIDELINE, geographical_data)
+        self.__remember_geography__(geographical_data, agent_reply)
+        return agent_reply
+
+    def __build_batch_inputs__(self, items: List[Tuple[int, str]]) -> Tuple[str, Dict[str, int]]:
+        # Repeated values within a batch (same IP, same location) are only sent once, under the first row id.
+        first_row_for_value: Dict[str, int] = {}
+        for row_id, value in items:
+            first_row_for_value.setdefault(value, row_id)
+
+        batch_inputs = [{"row_id": str(row_id), "input": value} for value, row_id in first_row_for_value.items()]
+        return json.dumps(batch_inputs, ensure_ascii=False), first_row_for_value
+
+    def __parse_batch_reply__(self, reply_content) -> Dict[str, str]:
+        text: str = str(reply_content).strip()
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return {}
+
+        try:
+            parsed = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+
+        if not isinstance(parsed, dict):
+            return {}
+        return {str(row_id): str(verdict) for row_id, verdict in parsed.items()}
+
+    def __split_cached_values__(self, signal_name: str, items: List[Tuple[int, str]]) -> Tuple[Dict[str, str], List[Tuple[int, str]]]:
+        cached_verdicts: Dict[str, str] = {}
+        uncached_items: List[Tuple[int, str]] = []
+        seen_values: set = set()
+
+        for row_id, value in items:
+            if value in seen_values:
+                continue
+            seen_values.add(value)
+
+            cached_verdict = self.verdict_cache.get_signal(signal_name, value)
+            if cached_verdict is not None:
+                cached_verdicts[value] = cached_verdict
+            else:
+                uncached_items.append((row_id, value))
+
+        return cached_verdicts, uncached_items
+
+    def __examine_batch__(
+            self,
+            signal_name: str,
+            chain,
+            header: str,
+            items: List[Tuple[int, str]],
+            single_examiner: Callable[[str], str]
+    ) -> Dict[int, str]:
+        if not items:
+            return {}
+
+        verdict_for_value, uncached_items = self.__split_cached_values__(signal_name, items)
+
+        if uncached_items:
+            batch_inputs, row_for_value = self.__build_batch_inputs__(uncached_items)
+            agent_reply = chain.invoke(
+                {
+                    "guidelines": self.guideline_source.fetch_object_from_header(header),
+                    "inputs": batch_inputs
+                }
+            )
+            verdicts: Dict[str, str] = self.__parse_batch_reply__(agent_reply.content)
+
+            for value, row_id in row_for_value.items():
+                verdict = verdicts.get(str(row_id))
+                if verdict is None:
+                    # Rows the model skipped or mangled are re-examined one at a time.
+                    RETRIES.inc(source="batch_fallback")
+                    verdict_for_value[value] = single_examiner(value)
+                else:
+                    self.__remember_verdict__(signal_name, value, verdict)
+                    verdict_for_value[value] = verdict
+
+        return {row_id: verdict_for_value[value] for row_id, value in items}
+
+    async def __aexamine_batch__(
+            self,
+            signal_name: str,
+            chain,
+            header: str,
+            items: List[Tuple[int, str]],
+            single_examiner: Callable
+    ) -> Dict[int, str]:
+        if not items:
+            return {}
+
+        verdict_for_value, uncached_items = self.__split_cached_values__(signal_name, items)
+
+        if uncached_items:
+            batch_inputs, row_for_value = self.__build_batch_inputs__(uncached_items)
+            agent_reply = await chain.ainvoke(
+                {
+                    "guidelines": await self.__afetch_guidelines__(header),
+                    "inputs": batch_inputs
+                }
+            )
+            verdicts: Dict[str, str] = self.__parse_batch_reply__(agent_reply.content)
+
+            missing_values: List[str] = [value for value, row_id in row_for_value.items() if str(row_id) not in verdicts]
+            RETRIES.inc(len(missing_values), source="batch_fallback")
+            fallback_verdicts = await asyncio.gather(*(single_examiner(value) for value in missing_values))
+            verdict_for_value.update(zip(missing_values, fallback_verdicts))
+
+            for value, row_id in row_for_value.items():
+                if str(row_id) in verdicts:
+                    self.__remember_verdict__(signal_name, value, verdicts[str(row_id)])
+                    verdict_for_value[value] = verdicts[str(row_id)]
+
+        return {row_id: verdict_for_value[value] for row_id, value in items}
+
+    @timed("read_message_content_batch")
+    def __read_message_content_batch__(self, items: List[Tuple[int, str]]) -> Dict[int, str]:
+        return self.__examine_batch__("message_content", self.message_batch_chain, MESSAGE_GUIDELINE, items, self.__read_message_content__)
+
+    def __resolve_locally__(
+            self,
+            items: List[Tuple[int, str]],
+            verdicts_for_many: Callable[[List[str]], List[Optional[str]]]
+    ) -> Tuple[Dict[int, str], List[Tuple[int, str]]]:
+        local_verdicts: Dict[int, str] = {}
+        unresolved_items: List[Tuple[int, str]] = []
+
+        for (row_id, value), verdict in zip(items, verdicts_for_many([value for _, value in items])):
+            if verdict is not None:
+                local_verdicts[row_id] = verdict
+            else:
+                unresolved_items.append((row_id, value))
 
-        agent_reply = agent_executor.invoke({"input": hour_sent})
+        return local_verdicts, unresolved_items
 
-        # AgentExecutor returns a dict with 'output' key
-        return agent_reply["output"]
+    @timed("examine_network_data_batch")
+    def __examine_network_data_batch__(self, items: List[Tuple[int, str]]) -> Dict[int, str]:
+        local_verdicts, unresolved_items = self.__resolve_locally__(items, self.network_index.verdicts_for_many)
+        local_verdicts.update(
+            self.__examine_batch__("network_data", self.network_batch_chain, NETWORK_GUIDELINE, unresolved_items, self.__examine_network_data__)
+        )
+        return local_verdicts
 
-    def __examine_geographical_data__(self, geographical_data: str):
-        geography_guideline: str = "geography_guideline"
+    @timed("examine_geographical_data_batch")
+    def __examine_geographical_data_batch__(self, items: List[Tuple[int, str]]) -> Dict[int, str]:
+        local_verdicts, unresolved_items = self.__resolve_locally__(items, self.geography_table.verdicts_for_many)
+        agent_verdicts = self.__examine_batch__("geographical_data", self.geography_batch_chain, GEOGRAPHY_GUIDELINE, unresolved_items, self.__examine_geographical_data__)
 
-        geography_examiner_prompt = ChatPromptTemplate.from_template(
-            """
-            # TASK
-            Your sole task is to decide whether the given input is SPAM or HAM based on the Guidelines Provided.
+        for row_id, value in unresolved_items:
+            self.__remember_geography__(value, agent_verdicts[row_id])
 
-            # RULES: 
-                1. Reply in this format: "TRUE/FALSE: Explanation"
-                    - TRUE if Geography is SUSPICIOUS/SPAM LIKELY
-                    - FALSE if Geography is SAFE/HAM
-                    - Divulge into your explanation based on the guidelines.
+        local_verdicts.update(agent_verdicts)
+        return local_verdicts
 
-            Guidelines: {guidelines}
-            Human: {input}
-            """
+    @timed("read_message_content_batch")
+    async def __aread_message_content_batch__(self, items: List[Tuple[int, str]]) -> Dict[int, str]:
+        return await self.__aexamine_batch__("message_content", self.message_batch_chain, MESSAGE_GUIDELINE, items, self.__aread_message_content__)
+
+    @timed("examine_network_data_batch")
+    async def __aexamine_network_data_batch__(self, items: List[Tuple[int, str]]) -> Dict[int, str]:
+        local_verdicts, unresolved_items = self.__resolve_locally__(items, self.network_index.verdicts_for_many)
+        local_verdicts.update(
+            await self.__aexamine_batch__("network_data", self.network_batch_chain, NETWORK_GUIDELINE, unresolved_items, self.__aexamine_network_data__)
         )
+        return local_verdicts
 
-        geography_agent_chain = geography_examiner_prompt | self.LLM
+    @timed("examine_geographical_data_batch")
+    async def __aexamine_geographical_data_batch__(self, items: List[Tuple[int, str]]) -> Dict[int, str]:
+        local_verdicts, unresolved_items = self.__resolve_locally__(items, self.geography_table.verdicts_for_many)
+        agent_verdicts = await self.__aexamine_batch__("geographical_data", self.geography_batch_chain, GEOGRAPHY_GUIDELINE, unresolved_items, self.__aexamine_geographical_data__)
 
-        agent_reply = geography_agent_chain.invoke(
+        for row_id, value in unresolved_items:
+            self.__remember_geography__(value, agent_verdicts[row_id])
+
+        local_verdicts.update(agent_verdicts)
+        return local_verdicts
+
+    def __build_aggregator_input__(self, data_row: ClassifiableRow, signal_replies: Dict[str, str]) -> str:
+        return f"""
+        message: {data_row.message_content}
+
+        is_message_content_spam: {signal_replies["message_content"]}
+        is_network_data_spam: {signal_replies["network_data"]}
+        is_temporal_data_spam: {signal_replies["temporal_data"]}
+        is_geographical_data_spam: {signal_replies["geographical_data"]}
+        """
+
+    def __apply_agent_score__(self, record: dict, agent_output) -> dict:
+        score = self.score_aggregator.parse_percentage(agent_output)
+        record.update(
             {
-                "guidelines": vector_collection.fetch_object_from_header(geography_guideline),
-                "input": geographical_data
+                "score": score,
+                "percentage": f"{score:.0f}%" if score is not None else str(agent_output),
+                "aggregator": "llm"
             }
         )
+        return record
 
-        return agent_reply.content
-    
-    def classifier_agent(
-                self,
-                data_row: DataObject,
-    ):
-        # 1. Define the Tool
-        @tool("percentage_of_spam", description="Takes the number of True Statements, and returns the final percentage of how likely the message is deemed to be SPAM.")
-        def percentage_of_spam(number_of_true_statements: str):
-            try:
-                number_of_true_statements_int: int = int(number_of_true_statements)
-            except ValueError:
-                return "Error: Input must be a number."
-            return f"{(number_of_true_statements_int/4)*100:.0f}%"
-
-        tools = [percentage_of_spam]
-
-        # 2. Define the Prompt
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """
-                    # TASK
-                    Your sole task is to determine how likely a message is suspicious of being spam based on the number of true statements for four columns. 
-
-                    # RULES:
-                        1. Always use the provided tool "percentage_of_spam"
-                        2. Only return the percentage of spam.
-                    """,
-                ),
-                ("user", "{input}"),
-                ("placeholder", "{agent_scratchpad}"),
-            ]
-        )
+    @timed("aggregator_agent")
+    def __aggregate_with_agent__(self, data_row: ClassifiableRow, signal_replies: Dict[str, str], record: dict) -> dict:
+        content: str = self.__build_aggregator_input__(data_row, signal_replies)
+        agent_reply = self.aggregator_agent_executor.invoke({"input": content})
+        return self.__apply_agent_score__(record, agent_reply["output"])
 
-        agent = create_tool_calling_agent(self.LLM, tools, prompt)
-        agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=False)
+    @timed("aggregator_agent")
+    async def __aaggregate_with_agent__(self, data_row: ClassifiableRow, signal_replies: Dict[str, str], record: dict) -> dict:
+        content: str = self.__build_aggregator_input__(data_row, signal_replies)
+        agent_reply = await self.aggregator_agent_executor.ainvoke({"input": content})
+        return self.__apply_agent_score__(record, agent_reply["output"])
 
-        with ThreadPoolExecutor() as executor:
-            future_msg = executor.submit(self.__read_message_content__, data_row.message_content)
-            future_net = executor.submit(self.__examine_network_data__, data_row.source_ip)
-            future_time = executor.submit(self.__examine_temporal_data__, data_row.sent_time)
-            future_geo = executor.submit(self.__examine_geographical_data__, data_row.source_location)
+    def __serialise_record__(self, data_row: ClassifiableRow, record: dict, row_index: Optional[int]) -> str:
+        if row_index is not None:
+            return json.dumps({"row_index": row_index, "message": data_row.message_content, **record})
+        return json.dumps({"message": data_row.message_content, **record})
 
-            msg_result = future_msg.result()
-            net_result = future_net.result()
-            time_result = future_time.result()
-            geo_result = future_geo.result()
+    def __finalise_record__(self, data_row: ClassifiableRow, signal_replies: Dict[str, str]) -> dict:
+        record: dict = self.score_aggregator.aggregate(signal_replies)
 
-        content: str = f"""
-        message: {data_row.message_content}
-        
-        is_message_content_spam: {msg_result}
-        is_network_data_spam: {net_result}
-        is_temporal_data_spam: {time_result}
-        is_geographical_data_spam: {geo_result}
-        """
+        # The aggregator agent is only a fallback for replies that do not follow the "TRUE/FALSE: Explanation" format.
+        if record["unparsed_signals"]:
+            return self.__aggregate_with_agent__(data_row, signal_replies, record)
 
-        # 5. Invoke the final aggregator agent
-        agent_reply = agent_executor.invoke({"input": content})
+        self.verdict_cache.set_row(data_row, record)
+        return record
 
-        return agent_reply["output"]
+    async def __afinalise_record__(self, data_row: ClassifiableRow, signal_replies: Dict[str, str]) -> dict:
+        record: dict = self.score_aggregator.aggregate(signal_replies)
+
+        if record["unparsed_signals"]:
+            return await self.__aaggregate_with_agent__(data_row, signal_replies, record)
+
+        self.verdict_cache.set_row(data_row, record)
+        return record
+
+    def __split_cached_rows__(self, rows: List[Tuple[int, ClassifiableRow]]) -> Tuple[Dict[int, dict], List[Tuple[int, ClassifiableRow]]]:
+        cached_records: Dict[int, dict] = {}
+        uncached_rows: List[Tuple[int, ClassifiableRow]] = []
+
+        for row_index, row in rows:
+            cached_record = self.verdict_cache.get_row(row)
+            if cached_record is not None:
+                cached_records[row_index] = cached_record
+            else:
+                uncached_rows.append((row_index, row))
+
+        return cached_records, uncached_rows
+
+    @timed("classifier_agent")
+    def classifier_agent(
+                self,
+                data_row: ClassifiableRow,
+                row_index: Optional[int] = None,
+    ) -> str:
+        cached_record = self.verdict_cache.get_row(data_row)
+        if cached_record is not None:
+            return self.__serialise_record__(data_row, cached_record, row_index)
+
+        future_msg = self.examiner_executor.submit(self.__read_message_content__, data_row.message_content)
+        future_net = self.examiner_executor.submit(self.__examine_network_data__, data_row.source_ip)
+        future_geo = self.examiner_executor.submit(self.__examine_geographical_data__, data_row.source_location, data_row)
+
+        if self.use_temporal_agent:
+            time_result = self.examiner_executor.submit(self.__examine_temporal_data__, data_row.sent_time).result()
+        else:
+            time_result = self.__examine_temporal_data__(data_row.sent_time, data_row.source_location, data_row)
+
+        signal_replies: Dict[str, str] = {
+            "message_content": future_msg.result(),
+            "network_data": future_net.result(),
+            "temporal_data": time_result,
+            "geographical_data": future_geo.result(),
+        }
+
+        record: dict = self.__finalise_record__(data_row, signal_replies)
+        return self.__serialise_record__(data_row, record, row_index)
+
+    @timed("classifier_agent")
+    async def aclassifier_agent(
+                self,
+                data_row: ClassifiableRow,
+                row_index: Optional[int] = None,
+    ) -> str:
+        cached_record = self.verdict_cache.get_row(data_row)
+        if cached_record is not None:
+            return self.__serialise_record__(data_row, cached_record, row_index)
+
+        msg_result, net_result, time_result, geo_result = await asyncio.gather(
+            self.__aread_message_content__(data_row.message_content),
+            self.__aexamine_network_data__(data_row.source_ip),
+            self.__aexamine_temporal_data__(data_row.sent_time, data_row.source_location, data_row),
+            self.__aexamine_geographical_data__(data_row.source_location, data_row),
+        )
+
+        signal_replies: Dict[str, str] = {
+            "message_content": msg_result,
+            "network_data": net_result,
+            "temporal_data": time_result,
+            "geographical_data": geo_result,
+        }
+
+        record: dict = await self.__afinalise_record__(data_row, signal_replies)
+        return self.__serialise_record__(data_row, record, row_index)
+
+    @timed("classifier_agent_batch")
+    def classifier_agent_batch(self, rows: List[Tuple[int, ClassifiableRow]]) -> List[str]:
+        records, uncached_rows = self.__split_cached_rows__(rows)
+
+        if uncached_rows:
+            future_msg = self.examiner_executor.submit(
+                self.__read_message_content_batch__, [(row_index, row.message_content) for row_index, row in uncached_rows]
+            )
+            future_net = self.examiner_executor.submit(
+                self.__examine_network_data_batch__, [(row_index, row.source_ip) for row_index, row in uncached_rows]
+            )
+            future_geo = self.examiner_executor.submit(
+                self.__examine_geographical_data_batch__, [(row_index, row.source_location) for row_index, row in uncached_rows]
+            )
+
+            if self.use_temporal_agent:
+                time_futures = {
+                    row_index: self.examiner_executor.submit(self.__examine_temporal_data__, row.sent_time) for row_index, row in uncached_rows
+                }
+                time_results: Dict[int, str] = {row_index: future.result() for row_index, future in time_futures.items()}
+            else:
+                time_results: Dict[int, str] = {
+                    row_index: self.__examine_temporal_data__(row.sent_time, row.source_location, row) for row_index, row in uncached_rows
+                }
+            msg_results, net_results, geo_results = future_msg.result(), future_net.result(), future_geo.result()
+
+            for row_index, row in uncached_rows:
+                signal_replies: Dict[str, str] = {
+                    "message_content": msg_results[row_index],
+                    "network_data": net_results[row_index],
+                    "temporal_data": time_results[row_index],
+                    "geographical_data": geo_results[row_index],
+                }
+                records[row_index] = self.__finalise_record__(row, signal_replies)
+
+        return [self.__serialise_record__(row, records[row_index], row_index) for row_index, row in rows]
+
+    @timed("classifier_agent_batch")
+    async def aclassifier_agent_batch(self, rows: List[Tuple[int, ClassifiableRow]]) -> List[str]:
+        records, uncached_rows = self.__split_cached_rows__(rows)
+
+        if uncached_rows:
+            msg_results, net_results, geo_results, time_replies = await asyncio.gather(
+                self.__aread_message_content_batch__([(row_index, row.message_content) for row_index, row in uncached_rows]),
+                self.__aexamine_network_data_batch__([(row_index, row.source_ip) for row_index, row in uncached_rows]),
+                self.__aexamine_geographical_data_batch__([(row_index, row.source_location) for row_index, row in uncached_rows]),
+                asyncio.gather(*(self.__aexamine_temporal_data__(row.sent_time, row.source_location, row) for _, row in uncached_rows)),
+            )
+            time_results: Dict[int, str] = {row_index: reply for (row_index, _), reply in zip(uncached_rows, time_replies)}
+
+            async def build_record(row_index: int, row: ClassifiableRow) -> None:
+                signal_replies: Dict[str, str] = {
+                    "message_content": msg_results[row_index],
+                    "network_data": net_results[row_index],
+                    "temporal_data": time_results[row_index],
+                    "geographical_data": geo_results[row_index],
+                }
+                records[row_index] = await self.__afinalise_record__(row, signal_replies)
+
+            await asyncio.gather(*(build_record(row_index, row) for row_index, row in uncached_rows))
+
+        return [self.__serialise_record__(row, records[row_index], row_index) for row_index, row in rows]
+
+    def verdict_cache_stats(self) -> dict:
+        return self.verdict_cache.stats()
+
+    def prefetch_guidelines(self) -> None:
+        # Opens the vector store and fills the guideline cache before the first row needs it.
+        for header in (MESSAGE_GUIDELINE, NETWORK_GUIDELINE, GEOGRAPHY_GUIDELINE):
+            self.guideline_source.fetch_object_from_header(header)
+
+    def close(self) -> None:
+        self.examiner_executor.shutdown(wait=True)
 
 llm_rag_spam_classifier = LlmRagSpamClassifier()
 
@@ -224,4 +765,4 @@ if __name__ == "__main__":
         source_location="('United States', 'Virginia')"
     )
 
-    print(llm_rag_spam_classifier.classifier_agent(row_object))
\ No newline at end of file
+    print(llm_rag_spam_classifier.classifier_agent(row_object))
@@ -0,0 +1,168 @@
+# <--- Imports --->
+import numpy as np
+import pandas as pd
+from typing import (
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
+
+# <--- Configurations --->
+REQUIRED_COLUMNS: List[str] = ["Message", "Sent_Time", "Source_IP", "Source_Location"]
+
+class DataRow:
+    # Same fields as DataObject, without per-row pydantic validation; RowBatch has already validated the chunk.
+    __slots__ = (
+        "message_content",
+        "sent_time",
+        "source_ip",
+        "source_location",
+        "sent_hour",
+        "sent_minute",
+        "country",
+        "state"
+    )
+
+    def __init__(
+            self,
+            message_content: str,
+            sent_time: str,
+            source_ip: str,
+            source_location: str,
+            sent_hour: Optional[int] = None,
+            sent_minute: Optional[int] = None,
+            country: Optional[str] = None,
+            state: Optional[str] = None
+    ):
+        self.message_content: str = message_content
+        self.sent_time: str = sent_time
+        self.source_ip: str = source_ip
+        self.source_location: str = source_location
+        # Split once per chunk by RowBatch; None (or -1 for an unparseable time) means the rule engines parse the raw string.
+        self.sent_hour: Optional[int] = sent_hour
+        self.sent_minute: Optional[int] = sent_minute
+        self.country: Optional[str] = country
+        self.state: Optional[str] = state
+
+    def __repr__(self) -> str:
+        return f"DataRow(message_content={self.message_content!r}, sent_time={self.sent_time!r}, source_ip={self.source_ip!r}, source_location={self.source_location!r})"
+
+def presplit_sent_clock(row) -> Optional[Tuple[int, int]]:
+    # (hour, minute) when the row was split column-wise; DataObject rows and unparseable times return None.
+    sent_hour, sent_minute = getattr(row, "sent_hour", None), getattr(row, "sent_minute", None)
+    if sent_hour is None or sent_minute is None or sent_hour < 0 or sent_minute < 0:
+        return None
+    return sent_hour, sent_minute
+
+def presplit_location(row) -> Optional[Tuple[str, str]]:
+    country, state = getattr(row, "country", None), getattr(row, "state", None)
+    if country is None or state is None:
+        return None
+    return country, state
+
+class RowBatch:
+    __slots__ = (
+        "row_indexes",
+        "message_content",
+        "sent_time",
+        "source_ip",
+        "source_location",
+        "sent_hour",
+        "sent_minute",
+        "country",
+        "state"
+    )
+
+    def __init__(
+            self,
+            row_indexes: np.ndarray,
+            message_content: np.ndarray,
+            sent_time: np.ndarray,
+            source_ip: np.ndarray,
+            source_location: np.ndarray,
+            sent_hour: np.ndarray,
+            sent_minute: np.ndarray,
+            country: np.ndarray,
+            state: np.ndarray
+    ):
+        self.row_indexes = row_indexes
+        self.message_content = message_content
+        self.sent_time = sent_time
+        self.source_ip = source_ip
+        self.source_location = source_location
+        self.sent_hour = sent_hour
+        self.sent_minute = sent_minute
+        self.country = country
+        self.state = state
+
+    @classmethod
+    def from_dataframe(cls, chunk: pd.DataFrame) -> "RowBatch":
+        # Null filtering, coercion and field splitting run once per column instead of once per row.
+        columns = chunk[REQUIRED_COLUMNS].dropna()
+        columns = columns.astype(str).apply(lambda column: column.str.strip())
+        if columns.empty:
+            return cls.empty()
+
+        # Same parse as the temporal rule engine: "HH:MM[:SS]", a missing minute counts as 0, anything else is -1.
+        time_parts = columns["Sent_Time"].str.split(":", n=2)
+        hour_text, minute_text = time_parts.str[0], time_parts.str[1]
+        sent_hour = pd.to_numeric(hour_text.where(hour_text.str.fullmatch(r"\s*\d+\s*", na=False)), errors="coerce")
+        sent_minute = pd.to_numeric(minute_text.where(minute_text.str.fullmatch(r"\s*\d+\s*", na=False)), errors="coerce")
+        sent_minute = sent_minute.where(minute_text.notna(), 0)
+        sent_hour = sent_hour.fillna(-1).astype(np.int64)
+        sent_minute = sent_minute.fillna(-1).astype(np.int64)
+
+        # Source_Location is the string form of a ('Country', 'State') tuple.
+        location_parts = columns["Source_Location"].str.strip("()").str.partition(",")
+        country = location_parts[0].str.strip().str.strip("'\"")
+        state = location_parts[2].str.strip().str.strip("'\"")
+
+        return cls(
+            row_indexes=columns.index.to_numpy(dtype=np.int64),
+            message_content=columns["Message"].to_numpy(dtype=object),
+            sent_time=columns["Sent_Time"].to_numpy(dtype=object),
+            source_ip=columns["Source_IP"].to_numpy(dtype=object),
+            source_location=columns["Source_Location"].to_numpy(dtype=object),
+            sent_hour=sent_hour.to_numpy(),
+            sent_minute=sent_minute.to_numpy(),
+            country=country.to_numpy(dtype=object),
+            state=state.to_numpy(dtype=object)
+        )
+
+    @classmethod
+    def empty(cls) -> "RowBatch":
+        empty_objects = np.empty(0, dtype=object)
+        return cls(
+            row_indexes=np.empty(0, dtype=np.int64),
+            message_content=empty_objects,
+            sent_time=empty_objects,
+            source_ip=empty_objects,
+            source_location=empty_objects,
+            sent_hour=np.empty(0, dtype=np.int64),
+            sent_minute=np.empty(0, dtype=np.int64),
+            country=empty_objects,
+            state=empty_objects
+        )
+
+    def __len__(self) -> int:
+        return len(self.row_indexes)
+
+    def __iter__(self) -> Iterator[Tuple[int, DataRow]]:
+        return iter(self.rows())
+
+    def rows(self) -> List[Tuple[int, DataRow]]:
+        return [
+            (row_index, DataRow(message_content, sent_time, source_ip, source_location, sent_hour, sent_minute, country, state))
+            for row_index, message_content, sent_time, source_ip, source_location, sent_hour, sent_minute, country, state in zip(
+                self.row_indexes.tolist(),
+                self.message_content.tolist(),
+                self.sent_time.tolist(),
+                self.source_ip.tolist(),
+                self.source_location.tolist(),
+                self.sent_hour.tolist(),
+                self.sent_minute.tolist(),
+                self.country.tolist(),
+                self.state.tolist()
+            )
+        ]
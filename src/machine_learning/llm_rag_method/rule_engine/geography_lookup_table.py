@@ -0,0 +1,157 @@
+# <--- Imports --->
+import json
+import os
+import re
+import threading
+import unicodedata
+import numpy as np
+import pandas as pd
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple
+)
+
+from src.core.ttl_cache import TTLCache
+from src.machine_learning.llm_rag_method.rule_engine.network_prefix_index import (
+    SAFE,
+    SUSPICIOUS
+)
+from src.machine_learning.llm_rag_method.rule_engine.temporal_rule_engine import parse_source_location
+
+# <--- Configurations --->
+GEOGRAPHY_TABLE_PATH: str = os.path.abspath(os.getenv("GEOGRAPHY_TABLE_PATH", "./guidelines/compiled/geography_lookup_table.json"))
+# LLM answers for unlisted locations; Source_Location is client supplied, so they are kept in a bounded LRU.
+GEOGRAPHY_LEARNED_MAX_ENTRIES: int = int(os.getenv("GEOGRAPHY_LEARNED_MAX_ENTRIES", "10000"))
+GEOGRAPHY_LEARNED_TTL_SECONDS: float = float(os.getenv("GEOGRAPHY_LEARNED_TTL_SECONDS", "86400"))
+GUIDELINE: str = "guideline"
+LEARNED: str = "llm"
+
+# Guideline lines look like "Malaysia (Kuala Lumpur, Selangor, Penang)".
+GEOGRAPHY_LINE_PATTERN = re.compile(r"^\s*([^()]+?)\s*\(([^()]+)\)\s*$")
+
+def normalise_location_part(value: str) -> str:
+    normalised_value: str = unicodedata.normalize("NFKC", str(value)).strip().strip("'\"")
+    return " ".join(normalised_value.split()).casefold()
+
+def parse_geography_line(line: str) -> Optional[Tuple[str, List[str]]]:
+    match = GEOGRAPHY_LINE_PATTERN.match(line)
+    if match is None:
+        return None
+
+    country: str = match.group(1).strip()
+    states: List[str] = [state.strip() for state in match.group(2).split(",") if state.strip()]
+    return country, states
+
+class GeographyLookupTable:
+    def __init__(self, entries: Optional[List[dict]] = None, learned_max_entries: int = GEOGRAPHY_LEARNED_MAX_ENTRIES):
+        self.lock = threading.Lock()
+        # Compiled guideline entries only; learned entries live in their own cache so forgetting them is O(learned).
+        self.table: Dict[Tuple[str, str], dict] = {}
+        self.learned = TTLCache(max_entries=learned_max_entries, ttl_seconds=GEOGRAPHY_LEARNED_TTL_SECONDS)
+        self.load_entries(entries if entries else [])
+
+    def __find__(self, key: Tuple[str, str]) -> Optional[dict]:
+        entry: Optional[dict] = self.table.get(key)
+        return entry if entry is not None else self.learned.get(key)
+
+    def __key__(self, country: str, state: str) -> Tuple[str, str]:
+        return normalise_location_part(country), normalise_location_part(state)
+
+    def __location_key__(self, source_location: str) -> Tuple[str, str]:
+        return self.__key__(*parse_source_location(source_location))
+
+    def load_entries(self, entries: List[dict]) -> None:
+        table: Dict[Tuple[str, str], dict] = {}
+        for entry in entries:
+            table[self.__key__(entry["country"], entry["state"])] = {
+                "country": entry["country"],
+                "state": entry["state"],
+                "verdict": entry["verdict"],
+                "source": entry.get("source", GUIDELINE),
+                "reply": entry.get("reply", ""),
+            }
+
+        # Rebinding the dict keeps lookups lock free while the table is replaced.
+        with self.lock:
+            self.table = table
+
+    def lookup(self, source_location: str, location: Optional[Tuple[str, str]] = None) -> Optional[dict]:
+        # location is the (country, state) pair when the caller has already split it.
+        return self.__find__(self.__key__(*location) if location is not None else self.__location_key__(source_location))
+
+    def lookup_many(self, source_locations: Iterable[str]) -> List[Optional[dict]]:
+        locations = pd.Series(list(source_locations), dtype="object").astype(str)
+        if locations.empty:
+            return []
+
+        # A column only holds a handful of distinct locations, so each one is normalised and looked up once.
+        codes, unique_locations = pd.factorize(locations)
+        unique_entries = np.empty(len(unique_locations), dtype=object)
+        unique_entries[:] = [self.__find__(self.__location_key__(location)) for location in unique_locations]
+        return unique_entries[codes].tolist()
+
+    def remember(self, source_location: str, is_spam: bool, reply: str) -> None:
+        country, state = parse_source_location(source_location)
+        if not country:
+            return
+
+        self.learned.set(
+            self.__key__(country, state),
+            {
+                "country": country,
+                "state": state,
+                "verdict": SUSPICIOUS if is_spam else SAFE,
+                "source": LEARNED,
+                "reply": reply,
+            }
+        )
+
+    def forget_learned(self) -> None:
+        self.learned.invalidate()
+
+    def format_verdict(self, source_location: str, entry: Optional[dict]) -> Optional[str]:
+        if entry is None:
+            return None
+
+        if entry["source"] == LEARNED:
+            return entry["reply"]
+
+        if entry["verdict"] == SUSPICIOUS:
+            return f"TRUE: {entry['state']}, {entry['country']} is listed under the suspicious geographies of the geography guideline."
+        return f"FALSE: {entry['state']}, {entry['country']} is listed under the safe geographies of the geography guideline."
+
+    def verdict_for(self, source_location: str, location: Optional[Tuple[str, str]] = None) -> Optional[str]:
+        return self.format_verdict(source_location, self.lookup(source_location, location))
+
+    def verdicts_for_many(self, source_locations: List[str]) -> List[Optional[str]]:
+        return [
+            self.format_verdict(source_location, entry)
+            for source_location, entry in zip(source_locations, self.lookup_many(source_locations))
+        ]
+
+    def save(self, path: str = GEOGRAPHY_TABLE_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as table_file:
+            json.dump({"entries": list(self.table.values())}, table_file, indent=2, ensure_ascii=False)
+        print(f"Geography lookup table with {len(self.table)} locations saved to {path}")
+
+    def reload(self, path: str = GEOGRAPHY_TABLE_PATH) -> None:
+        if not os.path.exists(path):
+            print(f"No compiled geography table at {path}; geography verdicts will use the LLM.")
+            self.load_entries([])
+            return
+
+        with open(path, "r", encoding="utf-8") as table_file:
+            self.load_entries(json.load(table_file)["entries"])
+
+    def learned_stats(self) -> dict:
+        return self.learned.stats()
+
+    def __len__(self) -> int:
+        return len(self.table) + len(self.learned)
+
+geography_lookup_table = GeographyLookupTable()
+geography_lookup_table.reload()
@@ -0,0 +1,213 @@
+# <--- Imports --->
+import ipaddress
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import (
+    Iterable,
+    List,
+    Optional
+)
+
+# <--- Configurations --->
+# Dotted-quad IPv4 exactly as ipaddress.ip_address accepts it: ASCII digits, no leading zeros, every octet 0-255.
+IPV4_OCTET_PATTERN: str = r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+IPV4_PATTERN: str = rf"{IPV4_OCTET_PATTERN}(?:\.{IPV4_OCTET_PATTERN}){{3}}"
+NETWORK_INDEX_PATH: str = os.path.abspath(os.getenv("NETWORK_INDEX_PATH", "./guidelines/compiled/network_prefix_index.json"))
+SAFE: str = "safe"
+SUSPICIOUS: str = "suspicious"
+
+class PrefixTrieNode:
+    __slots__ = ("children", "entry_id")
+
+    def __init__(self):
+        self.children: List[Optional["PrefixTrieNode"]] = [None, None]
+        self.entry_id: int = -1
+
+class NetworkPrefixIndex:
+    def __init__(self, entries: Optional[List[dict]] = None):
+        self.lock = threading.Lock()
+        self.load_entries(entries if entries else [])
+
+    def load_entries(self, entries: List[dict]) -> None:
+        roots = {4: PrefixTrieNode(), 6: PrefixTrieNode()}
+        compiled_entries: List[dict] = []
+
+        for entry in entries:
+            network = ipaddress.ip_network(entry["network"], strict=False)
+            compiled_entries.append(
+                {
+                    "network": str(network),
+                    "verdict": entry["verdict"],
+                    "region": entry.get("region", ""),
+                    "notes": entry.get("notes", ""),
+                }
+            )
+            self.__insert__(roots[network.version], network, len(compiled_entries) - 1)
+
+        ipv4_starts, ipv4_entry_ids = self.__build_ipv4_intervals__(roots[4], compiled_entries)
+
+        # Swap the whole structure at once so concurrent lookups never see a half-built index.
+        with self.lock:
+            self.state = (roots, compiled_entries, ipv4_starts, ipv4_entry_ids)
+
+    @property
+    def entries(self) -> List[dict]:
+        return self.state[1]
+
+    def __insert__(self, root: PrefixTrieNode, network, entry_id: int) -> None:
+        node = root
+        address: int = int(network.network_address)
+
+        for bit_position in range(network.max_prefixlen - 1, network.max_prefixlen - 1 - network.prefixlen, -1):
+            bit: int = (address >> bit_position) & 1
+            if node.children[bit] is None:
+                node.children[bit] = PrefixTrieNode()
+            node = node.children[bit] #type: ignore
+
+        node.entry_id = entry_id
+
+    def __longest_match__(self, root: PrefixTrieNode, address: int, max_prefixlen: int) -> int:
+        node: Optional[PrefixTrieNode] = root
+        matched_entry_id: int = root.entry_id
+
+        for bit_position in range(max_prefixlen - 1, -1, -1):
+            node = node.children[(address >> bit_position) & 1] #type: ignore
+            if node is None:
+                break
+            if node.entry_id != -1:
+                matched_entry_id = node.entry_id
+
+        return matched_entry_id
+
+    def __build_ipv4_intervals__(self, root: PrefixTrieNode, entries: List[dict]):
+        # Flattens nested prefixes into sorted, non-overlapping intervals so a whole column resolves with one searchsorted.
+        boundaries = {0}
+        for entry in entries:
+            network = ipaddress.ip_network(entry["network"])
+            if network.version == 4:
+                boundaries.add(int(network.network_address))
+                boundaries.add(int(network.broadcast_address) + 1)
+
+        starts = np.array(sorted(boundary for boundary in boundaries if boundary < 2 ** 32), dtype=np.int64)
+        entry_ids = np.array([self.__longest_match__(root, int(start), 32) for start in starts], dtype=np.int64)
+        return starts, entry_ids
+
+    def lookup(self, ip_address: str) -> Optional[dict]:
+        try:
+            address = ipaddress.ip_address(str(ip_address).strip())
+        except ValueError:
+            return None
+
+        roots, entries, _, _ = self.state
+        entry_id: int = self.__longest_match__(roots[address.version], int(address), address.max_prefixlen)
+        return entries[entry_id] if entry_id != -1 else None
+
+    def lookup_many(self, ip_addresses: Iterable[str]) -> List[Optional[dict]]:
+        addresses = pd.Series(list(ip_addresses), dtype="object").astype(str).str.strip()
+        if addresses.empty:
+            return []
+
+        _, entries, ipv4_starts, ipv4_entry_ids = self.state
+        entry_ids = np.full(len(addresses), -1, dtype=np.int64)
+        # Only addresses the scalar parser would accept take the vectorised path, so both paths give the same verdict.
+        is_ipv4 = addresses.str.fullmatch(IPV4_PATTERN).fillna(False).to_numpy(dtype=bool, copy=True)
+
+        if is_ipv4.any():
+            # Joining the validated addresses and splitting once is far cheaper than splitting each one.
+            octets = np.array(".".join(addresses[is_ipv4]).split("."), dtype=np.int64).reshape(-1, 4)
+            packed = (octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8) | octets[:, 3]
+            positions = np.searchsorted(ipv4_starts, packed, side="right") - 1
+            entry_ids[np.flatnonzero(is_ipv4)] = ipv4_entry_ids[positions]
+
+        results: List[Optional[dict]] = [entries[entry_id] if entry_id != -1 else None for entry_id in entry_ids]
+
+        # IPv6 and anything that is not dotted-quad IPv4 goes through the trie one address at a time.
+        for position in np.flatnonzero(~is_ipv4):
+            results[position] = self.lookup(addresses.iloc[position])
+
+        return results
+
+    def format_verdict(self, ip_address: str, entry: Optional[dict]) -> Optional[str]:
+        if entry is None:
+            return None
+
+        details: str = ", ".join(detail for detail in (entry["region"], entry["notes"]) if detail)
+        details = f" ({details})" if details else ""
+
+        if entry["verdict"] == SUSPICIOUS:
+            return f"TRUE: {ip_address} is within the suspicious IP range {entry['network']}{details} listed in the network guideline."
+        return f"FALSE: {ip_address} is within the safe IP range {entry['network']}{details} listed in the network guideline."
+
+    def verdict_for(self, ip_address: str) -> Optional[str]:
+        return self.format_verdict(ip_address, self.lookup(ip_address))
+
+    def verdicts_for_many(self, ip_addresses: List[str]) -> List[Optional[str]]:
+        return [
+            self.format_verdict(ip_address, entry)
+            for ip_address, entry in zip(ip_addresses, self.lookup_many(ip_addresses))
+        ]
+
+    def save(self, path: str = NETWORK_INDEX_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as index_file:
+            json.dump({"entries": self.entries}, index_file, indent=2)
+        print(f"Network prefix index with {len(self.entries)} ranges saved to {path}")
+
+    def reload(self, path: str = NETWORK_INDEX_PATH) -> None:
+        if not os.path.exists(path):
+            print(f"No compiled network index at {path}; network verdicts will use the LLM.")
+            self.load_entries([])
+            return
+
+        with open(path, "r", encoding="utf-8") as index_file:
+            self.load_entries(json.load(index_file)["entries"])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+def parse_address_range(address_range: str) -> List[str]:
+    # Accepts "a.b.c.d – e.f.g.h" (any dash) or CIDR notation and returns the covering CIDR blocks.
+    normalised_range: str = address_range.strip().replace("–", "-").replace("—", "-")
+
+    if "/" in normalised_range:
+        return [str(ipaddress.ip_network(normalised_range, strict=False))]
+
+    if "-" in normalised_range:
+        first_address, last_address = (part.strip() for part in normalised_range.split("-", 1))
+        return [
+            str(network)
+            for network in ipaddress.summarize_address_range(
+                ipaddress.ip_address(first_address),
+                ipaddress.ip_address(last_address)
+            )
+        ]
+
+    return [str(ipaddress.ip_network(normalised_range))]
+
+network_prefix_index = NetworkPrefixIndex()
+network_prefix_index.reload()
+
+# Exclusive to Testing
+if __name__ == "__main__":
+    # The single-row and batched paths must agree on every input, including ones only one parser would accept.
+    test_index = NetworkPrefixIndex(network_prefix_index.entries + [
+        {"network": "10.0.0.0/8", "verdict": SAFE, "region": "", "notes": ""},
+        {"network": "2001:db8::/32", "verdict": SUSPICIOUS, "region": "", "notes": ""},
+    ])
+    test_addresses: List[str] = [
+        "10.0.0.1", "010.0.0.1", "10.00.0.1", "10.0.0.01", "0.0.0.0", "255.255.255.255", "256.0.0.1", "1.2.3",
+        "1.2.3.4.5", " 10.1.2.3 ", "١٠.0.0.1", "10.0.0.1\n", "+10.0.0.1", "10.0.0.1/8", "2001:db8::1", "", "nan",
+    ] + [entry["network"].split("/")[0] for entry in network_prefix_index.entries]
+
+    mismatches = [
+        (address, single, batched)
+        for address, single, batched in zip(test_addresses, map(test_index.lookup, test_addresses), test_index.lookup_many(test_addresses))
+        if single != batched
+    ]
+    for address, single, batched in mismatches:
+        print(f"MISMATCH {address!r}: lookup={single} lookup_many={batched}")
+    print(f"{len(test_addresses) - len(mismatches)}/{len(test_addresses)} addresses agree between lookup and lookup_many.")
+    raise SystemExit(1 if mismatches else 0)
@@ -0,0 +1,97 @@
+# <--- Imports --->
+import json
+import os
+import re
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+# <--- Configurations --->
+SIGNAL_NAMES: List[str] = [
+    "message_content",
+    "network_data",
+    "temporal_data",
+    "geographical_data",
+]
+DEFAULT_SIGNAL_WEIGHTS: Dict[str, float] = {signal_name: 1.0 for signal_name in SIGNAL_NAMES}
+SIGNAL_WEIGHTS_ENV: Optional[str] = os.getenv("SIGNAL_WEIGHTS")
+
+# Accepts replies such as "TRUE: ...", "**FALSE**: ..." or a bare "'TRUE'" line; the verdict word must be followed by
+# a colon or the end of a line, so an echoed "TRUE/FALSE: ..." is left to the aggregator agent.
+VERDICT_PATTERN = re.compile(r"^[\s*_`\"'#>]*(TRUE|FALSE)[*_`\"']*[ \t]*(?::|\r?\n|$)\s*(.*)$", re.IGNORECASE | re.DOTALL)
+PERCENTAGE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+class ScoreAggregator:
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        self.weights: Dict[str, float] = dict(DEFAULT_SIGNAL_WEIGHTS)
+
+        if weights is None and SIGNAL_WEIGHTS_ENV:
+            try:
+                weights = json.loads(SIGNAL_WEIGHTS_ENV)
+            except json.JSONDecodeError as e:
+                print(f"SIGNAL_WEIGHTS is not valid JSON, using equal weights: {e}")
+
+        if weights:
+            unknown_signals = set(weights) - set(SIGNAL_NAMES)
+            if unknown_signals:
+                raise ValueError(f"Unknown signals in weights: {sorted(unknown_signals)}")
+            self.weights.update({signal_name: float(weight) for signal_name, weight in weights.items()})
+
+        if sum(self.weights.values()) <= 0:
+            raise ValueError("Signal weights must sum to a positive number.")
+
+    def parse_verdict(self, reply) -> Optional[Tuple[bool, str]]:
+        match = VERDICT_PATTERN.match(str(reply).strip())
+        if not match:
+            return None
+        return match.group(1).upper() == "TRUE", match.group(2).strip()
+
+    def parse_percentage(self, reply) -> Optional[float]:
+        match = PERCENTAGE_PATTERN.search(str(reply))
+        return float(match.group(1)) if match else None
+
+    def aggregate(self, signal_replies: Dict[str, str]) -> dict:
+        signals: Dict[str, dict] = {}
+        unparsed_signals: List[str] = []
+        weighted_true: float = 0.0
+
+        for signal_name in SIGNAL_NAMES:
+            reply = signal_replies.get(signal_name, "")
+            weight: float = self.weights[signal_name]
+            parsed = self.parse_verdict(reply)
+
+            if parsed is None:
+                unparsed_signals.append(signal_name)
+                signals[signal_name] = {
+                    "verdict": None,
+                    "explanation": str(reply).strip(),
+                    "weight": weight
+                }
+                continue
+
+            verdict, explanation = parsed
+            if verdict:
+                weighted_true += weight
+
+            signals[signal_name] = {
+                "verdict": verdict,
+                "explanation": explanation,
+                "weight": weight
+            }
+
+        score: Optional[float] = None
+        if not unparsed_signals:
+            score = round(weighted_true / sum(self.weights.values()) * 100, 2)
+
+        return {
+            "signals": signals,
+            "score": score,
+            "percentage": f"{score:.0f}%" if score is not None else None,
+            "unparsed_signals": unparsed_signals,
+            "aggregator": "local"
+        }
+
+score_aggregator = ScoreAggregator()
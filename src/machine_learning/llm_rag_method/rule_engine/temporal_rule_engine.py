@@ -0,0 +1,101 @@
+# <--- Imports --->
+import json
+import os
+from pydantic import BaseModel
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+# <--- Configurations --->
+TEMPORAL_RULES_PATH: Optional[str] = os.getenv("TEMPORAL_RULES_PATH")
+
+class TemporalRuleConfig(BaseModel):
+    # Windows are [start_hour, end_hour) in local time; a window with start > end wraps past midnight.
+    suspicious_hour_windows: List[Tuple[int, int]] = [(0, 6)]
+    # Hours added to Sent_Time to obtain local time, keyed by "Country" or "Country, State".
+    timezone_offsets: Dict[str, float] = {}
+    default_offset: float = 0.0
+
+def parse_source_location(source_location: Optional[str]) -> Tuple[str, str]:
+    # Source_Location is stored as the string form of a ('Country', 'State') tuple.
+    if not source_location:
+        return "", ""
+
+    country, _, state = str(source_location).strip().strip("()").partition(",")
+    return country.strip().strip("'\""), state.strip().strip("'\"")
+
+class TemporalRuleEngine:
+    def __init__(self, config: Optional[TemporalRuleConfig] = None):
+        self.config: TemporalRuleConfig = config if config else self.__load_config__()
+        self.timezone_offsets: Dict[str, float] = {
+            location.strip().lower(): offset for location, offset in self.config.timezone_offsets.items()
+        }
+
+    def __load_config__(self) -> TemporalRuleConfig:
+        if not TEMPORAL_RULES_PATH:
+            return TemporalRuleConfig()
+
+        try:
+            with open(TEMPORAL_RULES_PATH, "r", encoding="utf-8") as rules_file:
+                return TemporalRuleConfig(**json.load(rules_file))
+        except Exception as e:
+            print(f"Could not load temporal rules from {TEMPORAL_RULES_PATH}, using defaults: {e}")
+            return TemporalRuleConfig()
+
+    def __get_offset__(self, country: str, state: str) -> Tuple[float, str]:
+        for location in (f"{country}, {state}", country):
+            offset = self.timezone_offsets.get(location.lower())
+            if offset is not None:
+                return offset, location
+        return self.config.default_offset, "default"
+
+    def __matching_window__(self, hour: int) -> Optional[Tuple[int, int]]:
+        for start_hour, end_hour in self.config.suspicious_hour_windows:
+            if start_hour <= end_hour:
+                if start_hour <= hour < end_hour:
+                    return (start_hour, end_hour)
+            elif hour >= start_hour or hour < end_hour:
+                return (start_hour, end_hour)
+        return None
+
+    def __format_windows__(self) -> str:
+        return ", ".join(f"{start:02d}:00-{end:02d}:00" for start, end in self.config.suspicious_hour_windows)
+
+    def is_suspicious_hour(self, hour: int) -> bool:
+        return self.__matching_window__(hour % 24) is not None
+
+    def evaluate(
+            self,
+            sent_time: str,
+            source_location: Optional[str] = None,
+            sent_clock: Optional[Tuple[int, int]] = None,
+            location: Optional[Tuple[str, str]] = None
+    ) -> str:
+        # sent_clock (hour, minute) and location (country, state) are the values RowBatch already split for the chunk.
+        if sent_clock is not None:
+            sent_hour, sent_minute = sent_clock
+        else:
+            try:
+                time_parts: List[str] = str(sent_time).strip().split(":")
+                sent_hour: int = int(time_parts[0])
+                sent_minute: int = int(time_parts[1]) if len(time_parts) > 1 else 0
+            except ValueError:
+                return f"FALSE: Sent time '{sent_time}' could not be parsed, so no temporal signal was found."
+
+        country, state = location if location is not None else parse_source_location(source_location)
+        offset, offset_source = self.__get_offset__(country, state)
+        local_minutes: int = int((sent_hour * 60 + sent_minute + offset * 60) % (24 * 60))
+        local_hour, local_minute = divmod(local_minutes, 60)
+
+        local_time: str = f"{local_hour:02d}:{local_minute:02d}"
+        offset_note: str = f" (UTC offset {offset:+g}h from {offset_source})" if offset else ""
+
+        window = self.__matching_window__(local_hour)
+        if window:
+            return f"TRUE: Message was sent at {local_time} local time{offset_note}, within the suspicious window {window[0]:02d}:00-{window[1]:02d}:00."
+        return f"FALSE: Message was sent at {local_time} local time{offset_note}, outside the suspicious windows {self.__format_windows__()}."
+
+temporal_rule_engine = TemporalRuleEngine()
@@ -0,0 +1,272 @@
+# <--- Imports --->
+import json
+import os
+import threading
+import numpy as np
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+from src.machine_learning.llm_rag_method.vector_store.vector_backend import (
+    GUIDELINE_FETCH_LIMIT,
+    VectorStoreBackend
+)
+
+# <--- Configurations --->
+EMBEDDED_VECTOR_STORE_DIRECTORY: str = os.path.abspath(os.getenv("EMBEDDED_VECTOR_STORE_DIRECTORY", "./guidelines/compiled/embedded_vector_store"))
+# "hashing" embeds offline with a fixed vocabulary-free projection; "openai" uses the same ada-002 model as the Weaviate collection.
+EMBEDDED_VECTOR_EMBEDDINGS: str = os.getenv("EMBEDDED_VECTOR_EMBEDDINGS", "hashing").lower()
+# "brute" scans the whole matrix; "hnsw" uses hnswlib when it is installed and falls back to "brute" otherwise.
+EMBEDDED_VECTOR_INDEX: str = os.getenv("EMBEDDED_VECTOR_INDEX", "brute").lower()
+HASHING_DIMENSIONS: int = 1024
+CHUNK_CHARACTERS: int = 1200
+
+STORE_FILENAME: str = "store.json"
+EMBEDDINGS_FILENAME: str = "embeddings.npy"
+HNSW_FILENAME: str = "hnsw_index.bin"
+
+class HashingEmbedder:
+    name: str = "hashing"
+
+    def __init__(self, dimensions: int = HASHING_DIMENSIONS):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dimensions: int = dimensions
+        self.vectorizer = HashingVectorizer(n_features=dimensions, ngram_range=(1, 2), alternate_sign=False, norm=None)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.vectorizer.transform(texts).toarray().astype(np.float32)
+
+class OpenAIEmbedder:
+    name: str = "openai"
+
+    def __init__(self):
+        from langchain_openai import OpenAIEmbeddings
+
+        self.embeddings = OpenAIEmbeddings(model="text-embedding-ada-002")
+        self.dimensions: int = 1536
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+
+EMBEDDERS: Dict[str, Callable] = {
+    HashingEmbedder.name: HashingEmbedder,
+    OpenAIEmbedder.name: OpenAIEmbedder,
+}
+
+def normalise_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+def split_into_chunks(text: str, chunk_characters: int = CHUNK_CHARACTERS) -> List[str]:
+    # Chunks follow line boundaries so a table row or a guideline sentence is never cut in half.
+    chunks: List[str] = []
+    current_lines: List[str] = []
+    current_length: int = 0
+
+    for line in (line.strip() for line in text.splitlines()):
+        if not line:
+            continue
+        if current_lines and current_length + len(line) > chunk_characters:
+            chunks.append("\n".join(current_lines))
+            current_lines, current_length = [], 0
+        current_lines.append(line)
+        current_length += len(line) + 1
+
+    if current_lines:
+        chunks.append("\n".join(current_lines))
+    return chunks
+
+class EmbeddedVectorBackend(VectorStoreBackend):
+    # Guideline documents and chunk embeddings live in one directory: store.json plus an L2-normalised
+    # float32 matrix that is memory-mapped on load, so cosine search is a single matrix-vector product.
+    name: str = "embedded"
+
+    def __init__(
+            self,
+            directory: str = EMBEDDED_VECTOR_STORE_DIRECTORY,
+            embedder_name: str = EMBEDDED_VECTOR_EMBEDDINGS,
+            index_type: str = EMBEDDED_VECTOR_INDEX
+    ):
+        self.directory: str = directory
+        self.embedder_name: str = embedder_name
+        self.index_type: str = index_type
+        self.embedder = None
+
+        self.lock = threading.Lock()
+        # (documents, chunks, embeddings, hnsw_index) is replaced as a whole, so readers never see half an update.
+        self.state: Optional[Tuple[List[dict], List[dict], np.ndarray, object]] = None
+        # store.json as of the loaded state; documents_loader writes the store from its own process.
+        self.loaded_signature: Optional[Tuple[int, int, int]] = None
+
+    def __get_embedder__(self):
+        if self.embedder is None:
+            if self.embedder_name not in EMBEDDERS:
+                raise ValueError(f"Unknown embedder '{self.embedder_name}'. Use one of: {', '.join(EMBEDDERS)}")
+            self.embedder = EMBEDDERS[self.embedder_name]()
+        return self.embedder
+
+    def __empty_state__(self) -> Tuple[List[dict], List[dict], np.ndarray, object]:
+        return [], [], np.empty((0, 0), dtype=np.float32), None
+
+    def __store_signature__(self) -> Optional[Tuple[int, int, int]]:
+        # Every save renames a new store.json into place, so a changed inode, mtime or size means another writer.
+        try:
+            stat = os.stat(os.path.join(self.directory, STORE_FILENAME))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def __load_hnsw_index__(self, embeddings: np.ndarray, rebuild: bool = False):
+        if self.index_type != "hnsw" or len(embeddings) == 0:
+            return None
+        try:
+            import hnswlib
+        except ImportError:
+            print("hnswlib is not installed, the embedded vector store uses brute-force search.")
+            return None
+
+        index_path: str = os.path.join(self.directory, HNSW_FILENAME)
+        if os.path.exists(index_path) and not rebuild:
+            try:
+                index = hnswlib.Index(space="cosine", dim=embeddings.shape[1])
+                index.load_index(index_path, max_elements=len(embeddings))
+                if index.get_current_count() == len(embeddings):
+                    return index
+            except RuntimeError as e:
+                print(f"Something went wrong: {e}")
+            # The saved index belongs to another version of the store (another process inserted since), so it is rebuilt.
+
+        index = hnswlib.Index(space="cosine", dim=embeddings.shape[1])
+        index.init_index(max_elements=len(embeddings), ef_construction=200, M=16)
+        index.add_items(np.asarray(embeddings), np.arange(len(embeddings)))
+        index.save_index(index_path)
+        return index
+
+    def __load__(self) -> Tuple[List[dict], List[dict], np.ndarray, object]:
+        # One stat per call: a store rewritten by another process is picked up on the next fetch, not at restart.
+        if self.state is not None and self.__store_signature__() == self.loaded_signature:
+            return self.state
+
+        with self.lock:
+            signature = self.__store_signature__()
+            if self.state is not None and signature == self.loaded_signature:
+                return self.state
+
+            if signature is None:
+                self.state, self.loaded_signature = self.__empty_state__(), None
+                return self.state
+
+            with open(os.path.join(self.directory, STORE_FILENAME), "r", encoding="utf-8") as store_file:
+                store: dict = json.load(store_file)
+
+            # The store remembers its embedder; queries must be embedded the same way as the chunks.
+            self.embedder_name = store.get("embedder", self.embedder_name)
+            # The matrix is renamed into place before store.json, so it may already hold a newer writer's extra rows.
+            embeddings = np.load(os.path.join(self.directory, EMBEDDINGS_FILENAME), mmap_mode="r")[:len(store["chunks"])]
+            self.state = (store["documents"], store["chunks"], embeddings, self.__load_hnsw_index__(embeddings))
+            self.loaded_signature = signature
+            return self.state
+
+    def __save__(self, documents: List[dict], chunks: List[dict], embeddings: np.ndarray) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        # The matrix is renamed into place before store.json, which is written last and acts as the commit.
+        embeddings_path: str = os.path.join(self.directory, EMBEDDINGS_FILENAME)
+        scratch_embeddings_path: str = f"{embeddings_path}.tmp-{os.getpid()}.npy"
+        np.save(scratch_embeddings_path, embeddings)
+        os.replace(scratch_embeddings_path, embeddings_path)
+
+        store_path: str = os.path.join(self.directory, STORE_FILENAME)
+        scratch_store_path: str = f"{store_path}.tmp-{os.getpid()}"
+        with open(scratch_store_path, "w", encoding="utf-8") as store_file:
+            json.dump(
+                {
+                    "embedder": self.embedder_name,
+                    "dimensions": int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+                    "documents": documents,
+                    "chunks": chunks
+                },
+                store_file,
+                indent=2,
+                ensure_ascii=False
+            )
+        os.replace(scratch_store_path, store_path)
+
+    def ensure_collection(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+    def document_exists(self, document_id: str) -> bool:
+        documents, _, _, _ = self.__load__()
+        return any(document["id"] == document_id for document in documents)
+
+    def insert_document(self, properties: dict, document_id: str) -> None:
+        documents, chunks, embeddings, _ = self.__load__()
+        if any(document["id"] == document_id for document in documents):
+            return
+
+        chunk_texts: List[str] = split_into_chunks(str(properties.get("info", ""))) or [str(properties.get("header", ""))]
+        new_embeddings: np.ndarray = normalise_rows(self.__get_embedder__().embed(chunk_texts))
+
+        documents = documents + [{"id": document_id, "header": properties.get("header", ""), "info": properties.get("info", "")}]
+        chunks = chunks + [{"document": len(documents) - 1, "text": text} for text in chunk_texts]
+        embeddings = new_embeddings if len(embeddings) == 0 else np.vstack([np.asarray(embeddings), new_embeddings])
+
+        self.__save__(documents, chunks, embeddings)
+        with self.lock:
+            loaded_embeddings = np.load(os.path.join(self.directory, EMBEDDINGS_FILENAME), mmap_mode="r")
+            self.state = (documents, chunks, loaded_embeddings, self.__load_hnsw_index__(loaded_embeddings, rebuild=True))
+            self.loaded_signature = self.__store_signature__()
+
+    def fetch_all(self, limit: int = GUIDELINE_FETCH_LIMIT) -> List[dict]:
+        documents, _, _, _ = self.__load__()
+        return [
+            {
+                "UUID" : document["id"],
+                "Properties" : {"header": document["header"], "info": document["info"]},
+                "Vector" : None
+            }
+            for document in documents[:limit]
+        ]
+
+    def fetch_by_header(self, header: str, limit: int = GUIDELINE_FETCH_LIMIT) -> List[dict]:
+        documents, _, _, _ = self.__load__()
+        return [
+            {"header": document["header"], "info": document["info"]}
+            for document in documents
+            if document["header"] == header
+        ][:limit]
+
+    def search(self, query: str, limit: int = 4) -> List[dict]:
+        documents, chunks, embeddings, hnsw_index = self.__load__()
+        if len(chunks) == 0:
+            return []
+
+        query_vector: np.ndarray = normalise_rows(self.__get_embedder__().embed([query]))[0]
+        limit = min(limit, len(chunks))
+
+        if hnsw_index is not None:
+            labels, distances = hnsw_index.knn_query(query_vector, k=limit) #type: ignore
+            ranked = list(zip(labels[0].tolist(), (1.0 - distances[0]).tolist()))
+        else:
+            scores: np.ndarray = np.asarray(embeddings) @ query_vector
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+            ranked = list(zip(top.tolist(), scores[top].tolist()))
+
+        return [
+            {
+                "header": documents[chunks[position]["document"]]["header"],
+                "info": chunks[position]["text"],
+                "score": float(score)
+            }
+            for position, score in ranked
+        ]
+
+    def close(self) -> None:
+        with self.lock:
+            self.state, self.loaded_signature = None, None
@@ -0,0 +1,65 @@
+# <--- Imports --->
+import asyncio
+import time
+from abc import ABC, abstractmethod
+import uuid
+from typing import (
+    Any,
+    List
+)
+
+# <--- Configurations --->
+COLLECTION_NAME: str = "guidelines_collection"
+GUIDELINE_FETCH_LIMIT: int = 400
+
+def document_uuid(properties: Any) -> str:
+    # Same value as weaviate.util.generate_uuid5, so both backends agree on a guideline's id.
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, str(properties)))
+
+class VectorStoreBackend(ABC):
+    # Storage behind VectorCollection. Guidelines are {"header", "info"} objects; search results add a "score".
+    name: str = "base"
+
+    @abstractmethod
+    def ensure_collection(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def document_exists(self, document_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_document(self, properties: dict, document_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fetch_all(self, limit: int = GUIDELINE_FETCH_LIMIT) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fetch_by_header(self, header: str, limit: int = GUIDELINE_FETCH_LIMIT) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 4) -> List[dict]:
+        raise NotImplementedError
+
+    async def afetch_by_header(self, header: str, limit: int = GUIDELINE_FETCH_LIMIT) -> List[dict]:
+        # Backends without an async client run the sync lookup off the event loop.
+        return await asyncio.to_thread(self.fetch_by_header, header, limit)
+
+    def probe(self) -> dict:
+        # Readiness: the cheapest call that proves the store answers, with its latency.
+        start_time: float = time.perf_counter()
+        try:
+            self.fetch_all(limit=1)
+            status, error = "ready", None
+        except Exception as e:
+            status, error = "unavailable", str(e)
+        return {"status": status, "latency_ms": round((time.perf_counter() - start_time) * 1000, 2), "error": error}
+
+    def close(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        self.close()
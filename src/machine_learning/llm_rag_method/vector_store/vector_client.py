@@ -1,43 +1,393 @@
+# <--- Imports --->
+import asyncio
+import os
+import queue
+import random
+import threading
+import time
 import weaviate
-from typing import Optional
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional
+)
+from grpc import StatusCode
+from weaviate.classes.init import AdditionalConfig, Timeout
+from weaviate.exceptions import (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+    WeaviateQueryError,
+    WeaviateRetryError,
+    WeaviateStartUpError,
+    WeaviateTimeoutError
+)
+
+from src.core.metrics import RETRIES, metrics_registry
 
 # <--- Configurations --->
+WEAVIATE_HOST: str = os.getenv("WEAVIATE_HOST", "localhost")
+WEAVIATE_PORT: int = int(os.getenv("WEAVIATE_PORT", "8080"))
+WEAVIATE_GRPC_PORT: int = int(os.getenv("WEAVIATE_GRPC_PORT", "50051"))
+# Upper bound on open connections per pool (one sync pool, one async pool per event loop).
+WEAVIATE_POOL_SIZE: int = int(os.getenv("WEAVIATE_POOL_SIZE", "4"))
+WEAVIATE_ACQUIRE_TIMEOUT_SECONDS: float = float(os.getenv("WEAVIATE_ACQUIRE_TIMEOUT_SECONDS", "5"))
+# Applied by the client to every call: queries, inserts and the connection handshake.
+WEAVIATE_QUERY_TIMEOUT_SECONDS: float = float(os.getenv("WEAVIATE_QUERY_TIMEOUT_SECONDS", "10"))
+WEAVIATE_INSERT_TIMEOUT_SECONDS: float = float(os.getenv("WEAVIATE_INSERT_TIMEOUT_SECONDS", "60"))
+WEAVIATE_INIT_TIMEOUT_SECONDS: float = float(os.getenv("WEAVIATE_INIT_TIMEOUT_SECONDS", "2"))
+WEAVIATE_BACKOFF_BASE_SECONDS: float = float(os.getenv("WEAVIATE_BACKOFF_BASE_SECONDS", "0.5"))
+WEAVIATE_BACKOFF_MAX_SECONDS: float = float(os.getenv("WEAVIATE_BACKOFF_MAX_SECONDS", "30"))
+
+# Errors that mean the connection itself is broken; the client is dropped instead of going back to the pool.
+CONNECTION_ERRORS: tuple = (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+    WeaviateStartUpError,
+    WeaviateTimeoutError,
+    ConnectionError,
+    TimeoutError
+)
+# gRPC statuses that mean Weaviate went away (or stopped answering) while the connection was pooled.
+CONNECTION_STATUS_CODES: tuple = (StatusCode.UNAVAILABLE, StatusCode.DEADLINE_EXCEEDED)
+
+class VectorStoreUnavailableError(RuntimeError):
+    pass
+
+def is_connection_error(error: BaseException) -> bool:
+    if isinstance(error, CONNECTION_ERRORS + (VectorStoreUnavailableError,)):
+        return True
+    if not isinstance(error, WeaviateQueryError):
+        return False
+
+    # Queries wrap the gRPC error without its status code, but it is still on the exception chain: either the
+    # RpcError itself, or the WeaviateRetryError raised once the client gave up retrying UNAVAILABLE.
+    cause: Optional[BaseException] = error.__cause__ or error.__context__
+    while cause is not None:
+        if isinstance(cause, WeaviateRetryError):
+            return True
+        code = getattr(cause, "code", None)
+        if callable(code):
+            try:
+                return code() in CONNECTION_STATUS_CODES
+            except Exception:
+                return False
+        cause = cause.__cause__ or cause.__context__
+    return False
+
+class ReconnectBackoff:
+    # Shared by both pools: after a failed connect, new connects are refused until the backoff window has passed,
+    # and the window doubles with every consecutive failure (with jitter, capped at max_seconds).
+    def __init__(self, base_seconds: float = WEAVIATE_BACKOFF_BASE_SECONDS, max_seconds: float = WEAVIATE_BACKOFF_MAX_SECONDS):
+        self.base_seconds: float = base_seconds
+        self.max_seconds: float = max_seconds
+        self.failures: int = 0
+        self.retry_at: float = 0.0
+        self.last_error: Optional[str] = None
+        self.lock = threading.Lock()
+
+    def check(self) -> None:
+        remaining: float = self.retry_at - time.monotonic()
+        if remaining > 0:
+            raise VectorStoreUnavailableError(f"Weaviate is unavailable, next reconnect in {remaining:.1f}s: {self.last_error}")
+
+    def record_failure(self, error: BaseException) -> None:
+        with self.lock:
+            self.failures += 1
+            delay: float = min(self.base_seconds * (2 ** (self.failures - 1)), self.max_seconds)
+            self.retry_at = time.monotonic() + delay * random.uniform(0.5, 1.0)
+            self.last_error = str(error)
+        print(f"Something went wrong: {error} (reconnect attempt {self.failures} failed, backing off {delay:.1f}s)")
+
+    def record_success(self) -> None:
+        if self.failures:
+            print(f"Weaviate is reachable again after {self.failures} failed attempts.")
+        with self.lock:
+            self.failures = 0
+            self.retry_at = 0.0
+            self.last_error = None
+
+    def stats(self) -> dict:
+        return {
+            "consecutive_failures": self.failures,
+            "retry_in_seconds": max(self.retry_at - time.monotonic(), 0.0),
+            "last_error": self.last_error,
+        }
+
+class AsyncConnectionPool:
+    # Async clients belong to the event loop that opened them, so each loop gets its own pool.
+    def __init__(self, loop: asyncio.AbstractEventLoop, pool_size: int):
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.slots = asyncio.Semaphore(pool_size)
+        self.idle: List[weaviate.client.WeaviateAsyncClient] = []
+        self.in_use: int = 0
+
 class VectorClient:
-    def __init__(self):
-        self.vector_client: Optional[weaviate.client.WeaviateClient] = None
-        
-        if not (self.vector_client):
-            self.__set_vector_connection__()
-        else:
-            print("Already connected to Weaviate.")
-
-    def __set_vector_connection__(self) -> None:
-        try:
-            if self.vector_client and self.vector_client.is_connected():
-                print("Vector client is already connected.")
-                return None
+    def __init__(
+            self,
+            host: str = WEAVIATE_HOST,
+            port: int = WEAVIATE_PORT,
+            grpc_port: int = WEAVIATE_GRPC_PORT,
+            pool_size: int = WEAVIATE_POOL_SIZE,
+            acquire_timeout_seconds: float = WEAVIATE_ACQUIRE_TIMEOUT_SECONDS
+    ):
+        # Connections are opened on first use, so importing the vector store does not require a running Weaviate.
+        self.host: str = host
+        self.port: int = port
+        self.grpc_port: int = grpc_port
+        self.pool_size: int = pool_size
+        self.acquire_timeout_seconds: float = acquire_timeout_seconds
+        self.additional_config = AdditionalConfig(
+            timeout=Timeout(
+                query=WEAVIATE_QUERY_TIMEOUT_SECONDS,
+                insert=WEAVIATE_INSERT_TIMEOUT_SECONDS,
+                init=WEAVIATE_INIT_TIMEOUT_SECONDS
+            )
+        )
+        self.backoff = ReconnectBackoff()
+
+        # Examiner threads each check out their own connection instead of sharing one.
+        self.slots = threading.BoundedSemaphore(pool_size)
+        self.idle: "queue.LifoQueue[weaviate.client.WeaviateClient]" = queue.LifoQueue()
+        self.in_use: int = 0
+        self.counter_lock = threading.Lock()
+
+        # One pool per event loop; a pool whose loop has closed is pruned the next time any pool is looked up.
+        self.async_pools: Dict[asyncio.AbstractEventLoop, AsyncConnectionPool] = {}
+        self.async_pools_lock = threading.Lock()
+        # close() starts a new generation: connections checked out before it are closed on return, not pooled.
+        self.generation: int = 0
+
+    def __open_connection__(self) -> weaviate.client.WeaviateClient:
+        self.backoff.check()
+        if self.backoff.failures:
+            RETRIES.inc(source="weaviate_reconnect")
+        try:
+            connection = weaviate.connect_to_local(
+                host=self.host,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                additional_config=self.additional_config
+            )
+        except Exception as e:
+            self.backoff.record_failure(e)
+            raise VectorStoreUnavailableError(f"Could not connect to Weaviate: {e}") from e
+
+        self.backoff.record_success()
+        return connection
+
+    async def __aopen_connection__(self) -> weaviate.client.WeaviateAsyncClient:
+        self.backoff.check()
+        if self.backoff.failures:
+            RETRIES.inc(source="weaviate_reconnect")
+        connection = weaviate.use_async_with_local(
+            host=self.host,
+            port=self.port,
+            grpc_port=self.grpc_port,
+            additional_config=self.additional_config
+        )
+        try:
+            await connection.connect()
+        except Exception as e:
+            self.backoff.record_failure(e)
+            raise VectorStoreUnavailableError(f"Could not connect to Weaviate: {e}") from e
+
+        self.backoff.record_success()
+        return connection
+
+    def __discard__(self, connection) -> None:
+        try:
+            connection.close()
+        except Exception as e:
+            print(f"Something went wrong: {e}")
+
+    @contextmanager
+    def connection(self) -> Iterator[weaviate.client.WeaviateClient]:
+        generation: int = self.generation
+        if not self.slots.acquire(timeout=self.acquire_timeout_seconds):
+            raise VectorStoreUnavailableError(f"No Weaviate connection free within {self.acquire_timeout_seconds}s (pool size {self.pool_size}).")
+
+        connection: Optional[weaviate.client.WeaviateClient] = None
+        healthy: bool = True
+        try:
+            try:
+                connection = self.idle.get_nowait()
+                if not connection.is_connected():
+                    self.__discard__(connection)
+                    connection = self.__open_connection__()
+            except queue.Empty:
+                connection = self.__open_connection__()
+
+            with self.counter_lock:
+                self.in_use += 1
+            try:
+                yield connection
+            except Exception as e:
+                if is_connection_error(e):
+                    # The next checkout opens a fresh connection; the backoff decides how soon.
+                    healthy = False
+                    self.backoff.record_failure(e)
+                raise
             else:
-                self.vector_client = weaviate.connect_to_local() #type: ignore
-                print("Successfully connected to Weaviate.")
+                # A call that went through on a pooled connection also ends a failure streak.
+                if self.backoff.failures:
+                    self.backoff.record_success()
+            finally:
+                with self.counter_lock:
+                    self.in_use -= 1
+        finally:
+            if connection is not None:
+                if healthy and generation == self.generation:
+                    self.idle.put(connection)
+                else:
+                    self.__discard__(connection)
+            self.slots.release()
+
+    def __get_async_pool__(self) -> AsyncConnectionPool:
+        loop = asyncio.get_running_loop()
+        with self.async_pools_lock:
+            pool: Optional[AsyncConnectionPool] = self.async_pools.get(loop)
+            if pool is None:
+                self.__prune_async_pools__()
+                pool = self.async_pools[loop] = AsyncConnectionPool(loop, self.pool_size)
+        return pool
+
+    def __prune_async_pools__(self) -> None:
+        # Clients of a closed loop cannot be closed any more; drop them and say so.
+        for loop in [loop for loop in self.async_pools if loop.is_closed()]:
+            pool: AsyncConnectionPool = self.async_pools.pop(loop)
+            if pool.idle:
+                print(f"Dropped {len(pool.idle)} idle async Weaviate connection(s) whose event loop has closed.")
+
+    @asynccontextmanager
+    async def aconnection(self) -> AsyncIterator[weaviate.client.WeaviateAsyncClient]:
+        generation: int = self.generation
+        pool: AsyncConnectionPool = self.__get_async_pool__()
+        try:
+            await asyncio.wait_for(pool.slots.acquire(), timeout=self.acquire_timeout_seconds)
+        except asyncio.TimeoutError:
+            raise VectorStoreUnavailableError(f"No Weaviate connection free within {self.acquire_timeout_seconds}s (pool size {self.pool_size}).")
+
+        connection: Optional[weaviate.client.WeaviateAsyncClient] = None
+        healthy: bool = True
+        try:
+            connection = pool.idle.pop() if pool.idle else None
+            if connection is None or not connection.is_connected():
+                if connection is not None:
+                    await self.__aclose_connection__(connection)
+                connection = await self.__aopen_connection__()
+
+            pool.in_use += 1
+            try:
+                yield connection
+            except Exception as e:
+                if is_connection_error(e):
+                    healthy = False
+                    self.backoff.record_failure(e)
+                raise
+            else:
+                if self.backoff.failures:
+                    self.backoff.record_success()
+            finally:
+                pool.in_use -= 1
+        finally:
+            if connection is not None:
+                if healthy and generation == self.generation:
+                    pool.idle.append(connection)
+                else:
+                    await self.__aclose_connection__(connection)
+            pool.slots.release()
+
+    async def __aclose_connection__(self, connection: weaviate.client.WeaviateAsyncClient) -> None:
+        try:
+            await connection.close()
         except Exception as e:
             print(f"Something went wrong: {e}")
-            exit()
+
+    def probe(self) -> dict:
+        # Readiness: a pooled connection answers /v1/.well-known/ready; the latency includes checkout and any reconnect.
+        start_time: float = time.perf_counter()
+        ready: bool = False
+        error: Optional[str] = None
+        try:
+            with self.connection() as connection:
+                if not connection.is_ready():
+                    # Raised inside the checkout so the connection is dropped and the backoff starts.
+                    raise VectorStoreUnavailableError("Weaviate answered but is not ready.")
+            ready = True
+        except Exception as e:
+            error = str(e)
+
+        return {
+            "status": "ready" if ready else "unavailable",
+            "latency_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            "error": error,
+            "pool": self.stats(),
+        }
+
+    def stats(self) -> dict:
+        with self.async_pools_lock:
+            async_pools: List[AsyncConnectionPool] = list(self.async_pools.values())
+        return {
+            "pool_size": self.pool_size,
+            "sync_idle": self.idle.qsize(),
+            "sync_in_use": self.in_use,
+            "async_pools": len(async_pools),
+            "async_idle": sum(len(pool.idle) for pool in async_pools),
+            "async_in_use": sum(pool.in_use for pool in async_pools),
+            **self.backoff.stats(),
+        }
+
+    def close(self) -> None:
+        # Idle connections close now; connections still checked out are closed when they are returned.
+        self.generation += 1
+        while True:
+            try:
+                self.__discard__(self.idle.get_nowait())
+            except queue.Empty:
+                break
+
+    async def __aclose_idle__(self, pool: AsyncConnectionPool) -> None:
+        while pool.idle:
+            await self.__aclose_connection__(pool.idle.pop())
+
+    async def aclose(self) -> None:
+        self.close()
+        current_loop = asyncio.get_running_loop()
+        with self.async_pools_lock:
+            self.__prune_async_pools__()
+            async_pools: List[AsyncConnectionPool] = list(self.async_pools.values())
+
+        for pool in async_pools:
+            if pool.loop is current_loop:
+                await self.__aclose_idle__(pool)
+            elif pool.loop.is_running():
+                # Async clients must be closed on the loop that opened them.
+                asyncio.run_coroutine_threadsafe(self.__aclose_idle__(pool), pool.loop)
+            elif pool.idle:
+                print(f"Dropped {len(pool.idle)} idle async Weaviate connection(s) whose event loop is not running.")
+                pool.idle.clear()
 
     def get_vector_connection(self) -> weaviate.client.WeaviateClient:
-        if not self.vector_client:
-            self.__set_vector_connection__()
-        return self.vector_client #type: ignore 
-    
+        # Kept for scripts that want a standalone connection; the caller owns it and must close it.
+        return self.__open_connection__()
+
     def close_vector_connection(self) -> None:
-        if (self.vector_client and self.vector_client.is_connected()):
-            self.vector_client.close()
-            return None
-        print("Vector Client is already closed!")
-        return None
+        self.close()
 
 vector_client = VectorClient()
 
+def read_pool_connections() -> dict:
+    stats: dict = vector_client.stats()
+    return {(pool, state): stats[f"{pool}_{state}"] for pool in ("sync", "async") for state in ("idle", "in_use")}
+
+metrics_registry.callback("weaviate_pool_connections", "Pooled Weaviate connections, by pool and state.", ("pool", "state"), read_pool_connections)
+
 # Exclusive to Testing
 if __name__ == "__main__":
-    print(vector_client.get_vector_connection().is_connected())
-    vector_client.close_vector_connection()
\ No newline at end of file
+    print(vector_client.probe())
+    vector_client.close()
@@ -1,83 +1,149 @@
 # <--- Imports --->
-import weaviate
-from langchain_openai import OpenAIEmbeddings
-from langchain_weaviate import WeaviateVectorStore
-from weaviate.classes.config import (
-    Configure,
-    Property,
-    DataType
+import os
+from typing import (
+    Callable,
+    List,
+    Optional
+)
+from src.core.metrics import timed
+from src.core.ttl_cache import TTLCache
+from src.machine_learning.llm_rag_method.vector_store.vector_backend import (
+    COLLECTION_NAME,
+    GUIDELINE_FETCH_LIMIT,
+    VectorStoreBackend
 )
-from src.machine_learning.llm_rag_method.vector_store.vector_client import vector_client
 
 # <--- Configurations --->
-COLLECTION_NAME: str = "guidelines_collection"
+# "weaviate" queries a local Weaviate instance; "embedded" searches a persisted NumPy store in process.
+VECTOR_STORE_BACKEND: str = os.getenv("VECTOR_STORE_BACKEND", "weaviate").lower()
+GUIDELINE_CACHE_TTL_SECONDS: float = float(os.getenv("GUIDELINE_CACHE_TTL_SECONDS", "600"))
+GUIDELINE_CACHE_MAX_ENTRIES: int = int(os.getenv("GUIDELINE_CACHE_MAX_ENTRIES", "32"))
+
+def build_vector_backend(backend_name: str = VECTOR_STORE_BACKEND) -> VectorStoreBackend:
+    # Backends are imported on demand, so the embedded backend never imports the Weaviate client.
+    if backend_name == "embedded":
+        from src.machine_learning.llm_rag_method.vector_store.embedded_backend import EmbeddedVectorBackend
+        return EmbeddedVectorBackend()
+    if backend_name == "weaviate":
+        from src.machine_learning.llm_rag_method.vector_store.weaviate_backend import WeaviateVectorBackend
+        return WeaviateVectorBackend()
+    raise ValueError(f"Unknown VECTOR_STORE_BACKEND '{backend_name}'. Use 'weaviate' or 'embedded'.")
 
 class VectorCollection:
-    def __init__(self):
-        self.collection = None
-        self.vector_client = vector_client.get_vector_connection()
+    def __init__(self, backend: Optional[VectorStoreBackend] = None):
+        self.backend: VectorStoreBackend = backend if backend is not None else build_vector_backend()
+        self.guideline_cache = TTLCache(
+            max_entries=GUIDELINE_CACHE_MAX_ENTRIES,
+            ttl_seconds=GUIDELINE_CACHE_TTL_SECONDS
+        )
+        self.invalidation_listeners: List[Callable[[], None]] = []
 
     def __create_vector_collection__(self):
-        if self.vector_client.collections.exists(name=COLLECTION_NAME):
-            return f"Collection '{COLLECTION_NAME}' already exists!"
-        try:
-            self.vector_client.collections.create(
-                name=COLLECTION_NAME,
-                properties=[
-                    Property(name="header", data_type=DataType.TEXT),
-                    Property(name="info", data_type=DataType.TEXT)
-                ],
-                vectorizer_config=[
-                    Configure.NamedVectors.text2vec_openai(
-                        name='chatgpt',
-                        source_properties=['info'],
-                        model='ada',
-                        model_version='002'
-                    )
-                ]
-            )
-        except Exception as e:
-            print(f"Something went wrong: {e}")
+        self.backend.ensure_collection()
+
+    def document_exists(self, document_id: str) -> bool:
+        return self.backend.document_exists(document_id)
 
-    def get_vector_collection(self) -> weaviate.collections.Collection:
-        self.collection = self.vector_client.collections.get(name=COLLECTION_NAME)
-        return self.collection
+    def insert_document(self, properties: dict, document_id: str) -> None:
+        self.backend.insert_document(properties, document_id)
 
     def __fetch_all_objects__(self) -> list:
         try:
-            objects = self.get_vector_collection().query.fetch_objects(limit=400).objects
-            documents = []
-
-            for obj in objects:
-                documents.append(
-                    {
-                        "UUID" : str(obj.uuid),
-                        "Properties" : obj.properties,
-                        "Vector" : obj.vector
-                    }
-                )
-
+            documents = self.backend.fetch_all(limit=GUIDELINE_FETCH_LIMIT)
             print(f"📖 Retrieved {len(documents)} documents from collection: {COLLECTION_NAME}")
             return documents
         except Exception as e:
             print(f"Error retrieving documents from collection: {e}")
             return []
         
-    def fetch_object_from_header(self, header: str) -> list:
+    @timed("vector_store_fetch")
+    def __fetch_objects_by_header__(self, header: str) -> List[dict]:
+        return self.backend.fetch_by_header(header, limit=GUIDELINE_FETCH_LIMIT)
+
+    @timed("vector_store_fetch")
+    async def __afetch_objects_by_header__(self, header: str) -> List[dict]:
+        return await self.backend.afetch_by_header(header, limit=GUIDELINE_FETCH_LIMIT)
+
+    def __render_prompt_context__(self, guidelines: List[dict]) -> str:
+        rendered_guidelines: List[str] = []
+
+        for guideline in guidelines:
+            info_lines = [line.strip() for line in str(guideline["info"]).splitlines()]
+            compact_info: str = "\n".join(line for line in info_lines if line)
+            rendered_guidelines.append(f"## {guideline['header']}\n{compact_info}")
+
+        return "\n\n".join(rendered_guidelines)
+
+    @timed("fetch_guidelines")
+    def fetch_object_from_header(self, header: str) -> str:
+        cached_context = self.guideline_cache.get(header)
+        if cached_context is not None:
+            return cached_context
+
         try:
-            context = []
-            documents = self.__fetch_all_objects__()
+            guidelines = self.__fetch_objects_by_header__(header)
+            print(f"📖 Retrieved {len(guidelines)} documents from collection: {COLLECTION_NAME}")
 
-            for document in documents:
-                if header in document["Properties"]["header"]:
-                    context.append(document)
+            context: str = self.__render_prompt_context__(guidelines)
 
-            print(f"📖 Retrieved {len(context)} documents from collection: {COLLECTION_NAME}")
+            # Empty results are not cached so a transient Weaviate failure is retried on the next row.
+            if context:
+                self.guideline_cache.set(header, context)
             return context
+        except Exception as e:
+            print(f"Something went wrong: {e}")
+            return ""
+
+    @timed("fetch_guidelines")
+    async def afetch_object_from_header(self, header: str) -> str:
+        cached_context = self.guideline_cache.get(header)
+        if cached_context is not None:
+            return cached_context
+
+        try:
+            guidelines = await self.__afetch_objects_by_header__(header)
+            print(f"📖 Retrieved {len(guidelines)} documents from collection: {COLLECTION_NAME}")
+
+            context: str = self.__render_prompt_context__(guidelines)
+            if context:
+                self.guideline_cache.set(header, context)
+            return context
+        except Exception as e:
+            print(f"Something went wrong: {e}")
+            return ""
+
+    def add_invalidation_listener(self, listener: Callable[[], None]) -> None:
+        # Listeners hold state derived from the guidelines (e.g. cached verdicts) and are cleared with this cache.
+        self.invalidation_listeners.append(listener)
+
+    def invalidate_guideline_cache(self, header: Optional[str] = None) -> None:
+        self.guideline_cache.invalidate(header)
+        print(f"Guideline cache invalidated for: {header if header else 'all headers'}")
+
+        for listener in self.invalidation_listeners:
+            listener()
+
+    @timed("vector_store_search")
+    def search_guidelines(self, query: str, limit: int = 4) -> List[dict]:
+        # Ad hoc similarity search over guideline chunks; the classifier's prompt context stays header-based.
+        try:
+            return self.backend.search(query, limit=limit)
         except Exception as e:
             print(f"Something went wrong: {e}")
             return []
 
+    def guideline_cache_stats(self) -> dict:
+        return {"backend": self.backend.name, **self.guideline_cache.stats()}
+
+    def readiness_probe(self) -> dict:
+        return {"backend": self.backend.name, **self.backend.probe()}
+
+    def close(self) -> None:
+        self.backend.close()
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
 vector_collection = VectorCollection()
 
 # Testing Purposes
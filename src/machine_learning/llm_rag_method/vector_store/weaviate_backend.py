@@ -0,0 +1,135 @@
+# <--- Imports --->
+from typing import List
+from weaviate.classes.config import (
+    Configure,
+    Property,
+    DataType,
+    Tokenization
+)
+from weaviate.classes.query import Filter, MetadataQuery
+
+from src.machine_learning.llm_rag_method.vector_store.vector_backend import (
+    COLLECTION_NAME,
+    GUIDELINE_FETCH_LIMIT,
+    VectorStoreBackend
+)
+from src.machine_learning.llm_rag_method.vector_store.vector_client import vector_client
+
+# <--- Configurations --->
+GUIDELINE_RETURN_PROPERTIES: List[str] = ["header", "info"]
+TARGET_VECTOR: str = "chatgpt"
+
+class WeaviateVectorBackend(VectorStoreBackend):
+    # Every call checks a connection out of the pooled vector_client and returns it when the call is done.
+    name: str = "weaviate"
+
+    def __init__(self, collection_name: str = COLLECTION_NAME):
+        self.collection_name: str = collection_name
+
+    def ensure_collection(self) -> None:
+        with vector_client.connection() as connection:
+            if connection.collections.exists(name=self.collection_name):
+                print(f"Collection '{self.collection_name}' already exists!")
+                return
+            try:
+                connection.collections.create(
+                    name=self.collection_name,
+                    properties=[
+                        # Field tokenisation keeps the header as a single token so the exact-match filter in fetch_by_header hits the inverted index.
+                        Property(
+                            name="header",
+                            data_type=DataType.TEXT,
+                            tokenization=Tokenization.FIELD,
+                            index_filterable=True
+                        ),
+                        Property(name="info", data_type=DataType.TEXT)
+                    ],
+                    vectorizer_config=[
+                        Configure.NamedVectors.text2vec_openai(
+                            name=TARGET_VECTOR,
+                            source_properties=['info'],
+                            model='ada',
+                            model_version='002'
+                        )
+                    ]
+                )
+            except Exception as e:
+                print(f"Something went wrong: {e}")
+
+    def document_exists(self, document_id: str) -> bool:
+        with vector_client.connection() as connection:
+            return connection.collections.get(name=self.collection_name).data.exists(document_id)
+
+    def insert_document(self, properties: dict, document_id: str) -> None:
+        with vector_client.connection() as connection:
+            connection.collections.get(name=self.collection_name).data.insert(properties=properties, uuid=document_id)
+
+    def fetch_all(self, limit: int = GUIDELINE_FETCH_LIMIT) -> List[dict]:
+        with vector_client.connection() as connection:
+            objects = connection.collections.get(name=self.collection_name).query.fetch_objects(limit=limit).objects
+        return [
+            {
+                "UUID" : str(obj.uuid),
+                "Properties" : obj.properties,
+                "Vector" : obj.vector
+            }
+            for obj in objects
+        ]
+
+    def __guidelines_from__(self, objects) -> List[dict]:
+        return [
+            {
+                "header": obj.properties.get("header", ""),
+                "info": obj.properties.get("info", "")
+            }
+            for obj in objects
+        ]
+
+    def fetch_by_header(self, header: str, limit: int = GUIDELINE_FETCH_LIMIT) -> List[dict]:
+        with vector_client.connection() as connection:
+            objects = connection.collections.get(name=self.collection_name).query.fetch_objects(
+                filters=Filter.by_property("header").equal(header),
+                return_properties=GUIDELINE_RETURN_PROPERTIES,
+                include_vector=False,
+                limit=limit
+            ).objects
+        return self.__guidelines_from__(objects)
+
+    async def afetch_by_header(self, header: str, limit: int = GUIDELINE_FETCH_LIMIT) -> List[dict]:
+        # Async rows use the async client pool instead of holding a worker thread for the lookup.
+        async with vector_client.aconnection() as connection:
+            response = await connection.collections.get(name=self.collection_name).query.fetch_objects(
+                filters=Filter.by_property("header").equal(header),
+                return_properties=GUIDELINE_RETURN_PROPERTIES,
+                include_vector=False,
+                limit=limit
+            )
+        return self.__guidelines_from__(response.objects)
+
+    def search(self, query: str, limit: int = 4) -> List[dict]:
+        with vector_client.connection() as connection:
+            objects = connection.collections.get(name=self.collection_name).query.near_text(
+                query=query,
+                limit=limit,
+                target_vector=TARGET_VECTOR,
+                return_properties=GUIDELINE_RETURN_PROPERTIES,
+                return_metadata=MetadataQuery(distance=True)
+            ).objects
+
+        return [
+            {
+                "header": obj.properties.get("header", ""),
+                "info": obj.properties.get("info", ""),
+                "score": 1.0 - float(obj.metadata.distance or 0.0)
+            }
+            for obj in objects
+        ]
+
+    def probe(self) -> dict:
+        return vector_client.probe()
+
+    def close(self) -> None:
+        vector_client.close()
+
+    async def aclose(self) -> None:
+        await vector_client.aclose()
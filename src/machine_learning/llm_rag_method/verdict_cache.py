@@ -0,0 +1,93 @@
+# <--- Imports --->
+import hashlib
+import json
+import os
+from typing import (
+    Hashable,
+    Optional
+)
+
+from src.core.ttl_cache import TTLCache
+from src.machine_learning.llm_rag_method.models.object_model import DataObject
+
+# <--- Configurations --->
+VERDICT_CACHE_ENABLED: bool = os.getenv("VERDICT_CACHE_ENABLED", "true").lower() == "true"
+VERDICT_CACHE_TTL_SECONDS: float = float(os.getenv("VERDICT_CACHE_TTL_SECONDS", "3600"))
+SIGNAL_CACHE_MAX_ENTRIES: int = int(os.getenv("SIGNAL_CACHE_MAX_ENTRIES", "100000"))
+SIGNAL_CACHE_MAX_BYTES: int = int(os.getenv("SIGNAL_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+ROW_CACHE_MAX_ENTRIES: int = int(os.getenv("ROW_CACHE_MAX_ENTRIES", "50000"))
+ROW_CACHE_MAX_BYTES: int = int(os.getenv("ROW_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Message bodies are hashed so long texts do not inflate the key space; short values are kept verbatim.
+HASHED_SIGNALS = {"message_content"}
+
+def content_digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+class VerdictCache:
+    def __init__(
+            self,
+            enabled: bool = VERDICT_CACHE_ENABLED,
+            ttl_seconds: float = VERDICT_CACHE_TTL_SECONDS
+    ):
+        self.enabled: bool = enabled
+        self.signal_cache = TTLCache(
+            max_entries=SIGNAL_CACHE_MAX_ENTRIES,
+            ttl_seconds=ttl_seconds,
+            max_bytes=SIGNAL_CACHE_MAX_BYTES
+        )
+        self.row_cache = TTLCache(
+            max_entries=ROW_CACHE_MAX_ENTRIES,
+            ttl_seconds=ttl_seconds,
+            max_bytes=ROW_CACHE_MAX_BYTES
+        )
+
+    def __signal_key__(self, signal_name: str, value: str) -> Hashable:
+        normalised_value: str = str(value).strip()
+        if signal_name in HASHED_SIGNALS:
+            normalised_value = content_digest(normalised_value)
+        return (signal_name, normalised_value)
+
+    def __row_key__(self, data_row: DataObject) -> str:
+        return content_digest(
+            json.dumps(
+                [
+                    str(data_row.message_content).strip(),
+                    str(data_row.sent_time).strip(),
+                    str(data_row.source_ip).strip(),
+                    str(data_row.source_location).strip(),
+                ]
+            )
+        )
+
+    def get_signal(self, signal_name: str, value: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return self.signal_cache.get(self.__signal_key__(signal_name, value))
+
+    def set_signal(self, signal_name: str, value: str, verdict: str) -> None:
+        if self.enabled:
+            self.signal_cache.set(self.__signal_key__(signal_name, value), verdict)
+
+    def get_row(self, data_row: DataObject) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        record = self.row_cache.get(self.__row_key__(data_row))
+        # Callers attach row-specific fields, so hand out a copy of the cached record.
+        return dict(record) if record is not None else None
+
+    def set_row(self, data_row: DataObject, record: dict) -> None:
+        if self.enabled:
+            self.row_cache.set(self.__row_key__(data_row), dict(record))
+
+    def invalidate(self) -> None:
+        self.signal_cache.invalidate()
+        self.row_cache.invalidate()
+        print("Verdict cache invalidated.")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "signal": self.signal_cache.stats(),
+            "row": self.row_cache.stats(),
+        }
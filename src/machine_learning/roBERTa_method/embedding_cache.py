@@ -0,0 +1,174 @@
+# <--- Imports --->
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import torch
+import transformers
+from torch.utils.data import DataLoader, Dataset
+from typing import (
+    Dict,
+    List,
+    Optional
+)
+
+from src.machine_learning.roBERTa_method.length_bucketing import (
+    LengthBucketBatchSampler,
+    dynamic_padding_collate
+)
+
+# <--- Configurations --->
+EMBEDDING_CACHE_DIRECTORY: str = os.path.abspath(os.getenv("EMBEDDING_CACHE_DIRECTORY", "./data/processed/embedding_cache"))
+ENCODING_BATCH_SIZE: int = int(os.getenv("ENCODING_BATCH_SIZE", "64"))
+ENCODER_NAME: str = "roberta-base"
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as checkpoint_file:
+        for block in iter(lambda: checkpoint_file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def embedding_cache_key(
+        dataset_fingerprint: str,
+        unfrozen_layers: int,
+        checkpoint_path: Optional[str] = None
+) -> str:
+    # The dataset fingerprint already covers the tokeniser vocabulary and max_length.
+    key_parts = [
+        dataset_fingerprint,
+        ENCODER_NAME,
+        transformers.__version__,
+        file_digest(checkpoint_path) if checkpoint_path else "pretrained",
+        unfrozen_layers,
+    ]
+    return hashlib.sha256(json.dumps(key_parts).encode("utf-8")).hexdigest()[:24]
+
+def build_embedding_cache(model, dataset, unfrozen_layers: int, cache_path: str, device) -> None:
+    # Frozen layers never change, so their output is computed once in eval mode and stored.
+    #   unfrozen_layers == 0: one pooler_output vector per row.
+    #   unfrozen_layers  > 0: the hidden states entering layer L - N, stored ragged (real tokens only) as float16.
+    number_of_layers: int = len(model.roberta.encoder.layer)
+    start_layer: int = number_of_layers - unfrozen_layers
+    lengths: np.ndarray = np.asarray(dataset.lengths, dtype=np.int64)
+    offsets: np.ndarray = np.concatenate([[0], np.cumsum(lengths)])
+
+    scratch_path: str = f"{cache_path}.tmp-{os.getpid()}"
+    os.makedirs(scratch_path, exist_ok=True)
+    hidden_size: int = model.roberta.config.hidden_size
+
+    if unfrozen_layers == 0:
+        embeddings = np.lib.format.open_memmap(
+            os.path.join(scratch_path, "embeddings.npy"), mode="w+", dtype=np.float32, shape=(len(dataset), hidden_size)
+        )
+    else:
+        embeddings = np.lib.format.open_memmap(
+            os.path.join(scratch_path, "embeddings.npy"), mode="w+", dtype=np.float16, shape=(int(offsets[-1]), hidden_size)
+        )
+        np.save(os.path.join(scratch_path, "offsets.npy"), offsets)
+
+    batch_sampler = LengthBucketBatchSampler(lengths, batch_size=ENCODING_BATCH_SIZE, shuffle=False)
+    model.eval()
+
+    with torch.inference_mode():
+        for batch_indices in batch_sampler:
+            batch = dynamic_padding_collate([dataset[index] for index in batch_indices])
+            input_ids = batch["input_ids"].to(device)
+            attention_mask = batch["attention_mask"].to(device)
+
+            if unfrozen_layers == 0:
+                embeddings[batch_indices] = model.encode_text(input_ids, attention_mask).float().cpu().numpy()
+                continue
+
+            hidden_states = model.roberta(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                output_hidden_states=True
+            ).hidden_states[start_layer].to(torch.float16).cpu().numpy()
+
+            for row_number, index in enumerate(batch_indices):
+                embeddings[offsets[index]:offsets[index + 1]] = hidden_states[row_number, :lengths[index]]
+
+    embeddings.flush()
+    with open(os.path.join(scratch_path, "metadata.json"), "w", encoding="utf-8") as metadata_file:
+        json.dump({"rows": len(dataset), "unfrozen_layers": unfrozen_layers, "start_layer": start_layer}, metadata_file, indent=2)
+
+    if os.path.exists(cache_path):
+        shutil.rmtree(scratch_path)
+        return
+    os.replace(scratch_path, cache_path)
+
+class CachedEmbeddingDataset(Dataset):
+    def __init__(
+            self,
+            model,
+            dataset,
+            unfrozen_layers: int = 0,
+            checkpoint_path: Optional[str] = None,
+            cache_directory: str = EMBEDDING_CACHE_DIRECTORY,
+            device=torch.device("cpu")
+    ):
+        self.unfrozen_layers: int = unfrozen_layers
+        self.start_layer: int = len(model.roberta.encoder.layer) - unfrozen_layers
+
+        cache_path: str = os.path.join(cache_directory, embedding_cache_key(dataset.fingerprint, unfrozen_layers, checkpoint_path))
+        if not os.path.exists(os.path.join(cache_path, "metadata.json")):
+            print(f"Encoding {len(dataset)} rows with the frozen encoder into {cache_path}")
+            os.makedirs(cache_directory, exist_ok=True)
+            build_embedding_cache(model, dataset, unfrozen_layers, cache_path, device)
+        else:
+            print(f"Using embedding cache at {cache_path}")
+
+        self.embeddings = np.load(os.path.join(cache_path, "embeddings.npy"), mmap_mode="c")
+        self.offsets = np.load(os.path.join(cache_path, "offsets.npy")) if unfrozen_layers > 0 else None
+
+        # Tabular features and labels come straight from the tokenised cache, so changing them needs no re-encoding.
+        self.lengths = dataset.lengths
+        self.tabular_data = dataset.tabular_data
+        self.labels = dataset.labels
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, index) -> dict:
+        if self.offsets is None:
+            text_input = torch.from_numpy(self.embeddings[index])
+        else:
+            text_input = torch.from_numpy(self.embeddings[self.offsets[index]:self.offsets[index + 1]])
+
+        return {
+            "text_input": text_input,
+            "tabular_features": torch.from_numpy(self.tabular_data[index]),
+            "label": torch.tensor(self.labels[index], dtype=torch.long)
+        }
+
+def cached_embedding_collate(samples: List[dict]) -> Dict[str, torch.Tensor]:
+    tabular_features = torch.stack([sample["tabular_features"] for sample in samples])
+    labels = torch.stack([sample["label"] for sample in samples])
+
+    if samples[0]["text_input"].dim() == 1:
+        return {"text_input": torch.stack([sample["text_input"] for sample in samples]), "tabular_features": tabular_features, "label": labels}
+
+    # Ragged hidden states are padded to the longest row in the batch and masked.
+    longest: int = max(sample["text_input"].shape[0] for sample in samples)
+    hidden_size: int = samples[0]["text_input"].shape[1]
+    hidden_states = torch.zeros((len(samples), longest, hidden_size), dtype=torch.float32)
+    attention_mask = torch.zeros((len(samples), longest), dtype=torch.long)
+
+    for row_number, sample in enumerate(samples):
+        row_length: int = sample["text_input"].shape[0]
+        hidden_states[row_number, :row_length] = sample["text_input"].float()
+        attention_mask[row_number, :row_length] = 1
+
+    return {"text_input": hidden_states, "attention_mask": attention_mask, "tabular_features": tabular_features, "label": labels}
+
+def build_cached_loader(dataset: CachedEmbeddingDataset, batch_size: int, shuffle: bool) -> DataLoader:
+    if dataset.unfrozen_layers == 0:
+        return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, collate_fn=cached_embedding_collate)
+
+    return DataLoader(
+        dataset,
+        batch_sampler=LengthBucketBatchSampler(dataset.lengths, batch_size=batch_size, shuffle=shuffle),
+        collate_fn=cached_embedding_collate
+    )
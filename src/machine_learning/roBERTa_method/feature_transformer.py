@@ -0,0 +1,175 @@
+# <--- Imports --->
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Optional
+)
+
+# scikit-learn and joblib are only needed to fit, save and load, so serving code can import this module cheaply.
+if TYPE_CHECKING:
+    from sklearn.preprocessing import OneHotEncoder, LabelEncoder
+
+# <--- Configurations --->
+FEATURE_TRANSFORMER_FILENAME: str = "feature_transformer.joblib"
+FEATURE_TRANSFORMER_PATH: str = os.path.abspath(os.getenv(
+    "FEATURE_TRANSFORMER_PATH",
+    f"./src/machine_learning/roBERTa_method/trained_model/{FEATURE_TRANSFORMER_FILENAME}"
+))
+
+LABEL_COLUMN: str = "Category"
+MESSAGE_COLUMN: str = "Message"
+TEMPORAL_COLUMN: str = "Sent_Time"
+NETWORK_DATA: str = "Source_IP"
+GEOGRAPHICAL_DATA: str = "Source_Location"
+DROPPED_COLUMNS: List[str] = ["Sent_Date"]
+HOUR_PATTERN: str = r"(\d{1,2}):\d{2}"
+
+def transformer_path_for(model_path: str) -> str:
+    # The transformer lives next to the checkpoint it was trained with.
+    return os.path.join(os.path.dirname(os.path.abspath(model_path)), FEATURE_TRANSFORMER_FILENAME)
+
+class FeatureTransformer:
+    def __init__(self):
+        self.ip_counts: Dict[str, int] = {}
+        self.one_hot_encoder: Optional["OneHotEncoder"] = None
+        self.label_encoder: Optional["LabelEncoder"] = None
+
+        # output_columns is the processed dataset layout; feature_columns is the tabular part TorchDataset feeds the model.
+        self.output_columns: List[str] = []
+        self.feature_columns: List[str] = []
+        self.numeric_columns: List[str] = []
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.one_hot_encoder is not None
+
+    @property
+    def labels(self) -> List[str]:
+        return [str(label) for label in self.label_encoder.classes_] if self.label_encoder is not None else []
+
+    def __sent_hours__(self, sent_times: pd.Series) -> pd.Series:
+        # Accepts both "16:50:55" and "2025-10-27 16:50:55"; unparseable times become hour 0.
+        hours = sent_times.astype(str).str.extract(HOUR_PATTERN, expand=False)
+        return pd.to_numeric(hours, errors="coerce").fillna(0).astype(np.int64)
+
+    def __ip_frequencies__(self, source_ips: pd.Series) -> pd.Series:
+        # An IP missing from the training data has still been seen once, in this row.
+        return source_ips.astype(str).str.strip().map(self.ip_counts).fillna(1).astype(np.int64)
+
+    def __country_state__(self, source_locations: pd.Series) -> pd.DataFrame:
+        country_state = source_locations.astype(str).str.strip().str.strip("()").str.partition(", ")
+        return pd.DataFrame(
+            {
+                "Country": country_state[0].replace("", "Unknown"),
+                "State": country_state[2].replace("", "Unknown"),
+            },
+            index=source_locations.index
+        )
+
+    def fit(self, dataframe: pd.DataFrame) -> "FeatureTransformer":
+        from sklearn.preprocessing import OneHotEncoder, LabelEncoder
+
+        self.ip_counts = {
+            str(ip).strip(): int(count)
+            for ip, count in dataframe[NETWORK_DATA].astype(str).str.strip().value_counts().items()
+        }
+
+        self.one_hot_encoder = OneHotEncoder(
+            handle_unknown="ignore",
+            sparse_output=False
+        )
+        self.one_hot_encoder.fit(self.__country_state__(dataframe[GEOGRAPHICAL_DATA]))
+
+        self.label_encoder = LabelEncoder()
+        self.label_encoder.fit(dataframe[LABEL_COLUMN])
+
+        one_hot_columns: List[str] = list(self.one_hot_encoder.get_feature_names_out(["Country", "State"]))
+        base_columns: List[str] = [column for column in dataframe.columns if column not in DROPPED_COLUMNS]
+        self.output_columns = base_columns + ["Sent_Hour", "IP_Frequency"] + one_hot_columns
+        self.feature_columns = [column for column in self.output_columns if column not in [MESSAGE_COLUMN, LABEL_COLUMN]]
+        # Raw Sent_Time, Source_IP and Source_Location are not numbers, so TorchDataset reads them as 0.
+        self.numeric_columns = ["Sent_Hour", "IP_Frequency"] + one_hot_columns
+        return self
+
+    def transform(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        # The full processed dataset, in the fitted column order.
+        if not self.is_fitted:
+            raise ValueError("FeatureTransformer has not been fitted.")
+
+        dataframe = dataframe.drop(columns=[column for column in DROPPED_COLUMNS if column in dataframe.columns])
+        dataframe[TEMPORAL_COLUMN] = pd.to_datetime(dataframe[TEMPORAL_COLUMN], errors="coerce")
+        dataframe["Sent_Hour"] = dataframe[TEMPORAL_COLUMN].dt.hour.fillna(0).astype(np.int64)
+        dataframe["IP_Frequency"] = self.__ip_frequencies__(dataframe[NETWORK_DATA])
+
+        one_hot_columns: List[str] = self.numeric_columns[2:]
+        encoded_dataframe = pd.DataFrame(
+            self.one_hot_encoder.transform(self.__country_state__(dataframe[GEOGRAPHICAL_DATA])), #type: ignore
+            columns=one_hot_columns,
+            index=dataframe.index
+        )
+        dataframe = pd.concat([dataframe, encoded_dataframe], axis=1)
+
+        if LABEL_COLUMN in dataframe.columns:
+            dataframe[LABEL_COLUMN] = self.label_encoder.transform(dataframe[LABEL_COLUMN]) #type: ignore
+
+        return dataframe.reindex(columns=[column for column in self.output_columns if column in dataframe.columns])
+
+    def fit_transform(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(dataframe).transform(dataframe)
+
+    def transform_features(self, dataframe: pd.DataFrame) -> np.ndarray:
+        # Tabular model input for a chunk of raw rows: only Sent_Time, Source_IP and Source_Location are needed.
+        if not self.is_fitted:
+            raise ValueError("FeatureTransformer has not been fitted.")
+
+        features = np.zeros((len(dataframe), len(self.feature_columns)), dtype=np.float32)
+        if len(dataframe) == 0:
+            return features
+
+        positions: Dict[str, int] = {column: position for position, column in enumerate(self.feature_columns)}
+        features[:, positions["Sent_Hour"]] = self.__sent_hours__(dataframe[TEMPORAL_COLUMN]).to_numpy()
+        features[:, positions["IP_Frequency"]] = self.__ip_frequencies__(dataframe[NETWORK_DATA]).to_numpy()
+
+        one_hot_positions: List[int] = [positions[column] for column in self.numeric_columns[2:]]
+        features[:, one_hot_positions] = self.one_hot_encoder.transform( #type: ignore
+            self.__country_state__(dataframe[GEOGRAPHICAL_DATA].reset_index(drop=True))
+        )
+        return features
+
+    def save(self, path: str = FEATURE_TRANSFORMER_PATH) -> None:
+        import joblib
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path)
+        print(f"Feature transformer saved to {path}")
+
+    @staticmethod
+    def load(path: str = FEATURE_TRANSFORMER_PATH) -> "FeatureTransformer":
+        import joblib
+
+        transformer = joblib.load(path)
+        if not isinstance(transformer, FeatureTransformer):
+            raise TypeError(f"{path} does not contain a FeatureTransformer.")
+        return transformer
+
+def save_feature_transformer_next_to(model_path: str, feature_columns: List[str], source_path: str = FEATURE_TRANSFORMER_PATH) -> None:
+    # Copies the transformer fitted during feature engineering beside a freshly saved checkpoint.
+    target_path: str = transformer_path_for(model_path)
+    try:
+        transformer = FeatureTransformer.load(source_path)
+    except FileNotFoundError:
+        print(f"No feature transformer at {source_path}; run feature engineering before serving {model_path}.")
+        return
+
+    if transformer.feature_columns != list(feature_columns):
+        print(f"Feature transformer at {source_path} does not match the training columns; refit it before serving {model_path}.")
+        return
+
+    if os.path.abspath(source_path) != target_path:
+        shutil.copyfile(source_path, target_path)
+    print(f"Feature transformer for {model_path} at {target_path}")
@@ -0,0 +1,79 @@
+# <--- Imports --->
+import numpy as np
+import torch
+from torch.utils.data import Sampler
+from typing import (
+    Iterator,
+    List
+)
+
+# <--- Configurations --->
+BUCKET_SIZE_MULTIPLIER: int = 50
+
+class LengthBucketBatchSampler(Sampler[List[int]]):
+    # Groups samples of similar token length into the same batch so dynamic padding has little to pad.
+    def __init__(
+            self,
+            lengths: np.ndarray,
+            batch_size: int,
+            shuffle: bool = True,
+            drop_last: bool = False,
+            bucket_size_multiplier: int = BUCKET_SIZE_MULTIPLIER,
+            seed: int = 42
+    ):
+        self.lengths: np.ndarray = np.asarray(lengths)
+        self.batch_size: int = batch_size
+        self.shuffle: bool = shuffle
+        self.drop_last: bool = drop_last
+        self.bucket_size: int = batch_size * bucket_size_multiplier
+        self.seed: int = seed
+        self.epoch: int = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def __batches__(self) -> List[np.ndarray]:
+        if not self.shuffle:
+            # Evaluation order does not matter, so one global sort gives the tightest batches.
+            ordered_indices = np.argsort(self.lengths, kind="stable")
+            return [ordered_indices[start:start + self.batch_size] for start in range(0, len(ordered_indices), self.batch_size)]
+
+        # Shuffle, sort within large buckets, then shuffle the batches: similar lengths per batch, random order per epoch.
+        generator = np.random.default_rng(self.seed + self.epoch)
+        shuffled_indices = generator.permutation(len(self.lengths))
+
+        batches: List[np.ndarray] = []
+        for bucket_start in range(0, len(shuffled_indices), self.bucket_size):
+            bucket = shuffled_indices[bucket_start:bucket_start + self.bucket_size]
+            bucket = bucket[np.argsort(self.lengths[bucket], kind="stable")]
+            batches.extend(bucket[start:start + self.batch_size] for start in range(0, len(bucket), self.batch_size))
+
+        generator.shuffle(batches) #type: ignore
+        return batches
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for batch in self.__batches__():
+            if self.drop_last and len(batch) < self.batch_size:
+                continue
+            yield batch.tolist()
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return len(self.lengths) // self.batch_size
+        if not self.shuffle:
+            return -(-len(self.lengths) // self.batch_size)
+
+        full_buckets, remainder = divmod(len(self.lengths), self.bucket_size)
+        return full_buckets * (self.bucket_size // self.batch_size) + -(-remainder // self.batch_size)
+
+def dynamic_padding_collate(samples: List[dict]) -> dict:
+    # Samples are right-padded to max_length; trimming to the longest real sequence drops the padding-only columns.
+    attention_mask = torch.stack([sample["attention_mask"] for sample in samples])
+    longest: int = max(int(attention_mask.sum(dim=1).max()), 1)
+
+    return {
+        "input_ids": torch.stack([sample["input_ids"] for sample in samples])[:, :longest],
+        "attention_mask": attention_mask[:, :longest],
+        "tabular_features": torch.stack([sample["tabular_features"] for sample in samples]),
+        "label": torch.stack([sample["label"] for sample in samples])
+    }
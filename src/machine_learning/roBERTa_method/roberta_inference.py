@@ -0,0 +1,255 @@
+# <--- Imports --->
+import asyncio
+import os
+import threading
+import pandas as pd
+from typing import (
+    Any,
+    List,
+    Optional,
+    Tuple
+)
+
+from src.machine_learning.roBERTa_method.feature_transformer import FeatureTransformer, transformer_path_for
+
+# <--- Configurations --->
+ROBERTA_MODEL_PATH: str = os.path.abspath(os.getenv("ROBERTA_MODEL_PATH", "./src/machine_learning/roBERTa_method/trained_model/spam_classifier_model.pth"))
+ROBERTA_FEATURE_TRANSFORMER_PATH: str = os.path.abspath(os.getenv("ROBERTA_FEATURE_TRANSFORMER_PATH", transformer_path_for(ROBERTA_MODEL_PATH)))
+ROBERTA_TOKENISER: str = os.getenv("ROBERTA_TOKENISER", "roberta-base")
+ROBERTA_MAX_LENGTH: int = int(os.getenv("ROBERTA_MAX_LENGTH", "128"))
+ROBERTA_MAX_BATCH_SIZE: int = int(os.getenv("ROBERTA_MAX_BATCH_SIZE", "64"))
+ROBERTA_MAX_WAIT_MS: float = float(os.getenv("ROBERTA_MAX_WAIT_MS", "5"))
+# Rows waiting for a batch; submit() waits for room once the queue is full.
+ROBERTA_MAX_QUEUED_ROWS: int = int(os.getenv("ROBERTA_MAX_QUEUED_ROWS", "1024"))
+ROBERTA_TORCH_THREADS: int = int(os.getenv("ROBERTA_TORCH_THREADS", str(os.cpu_count() or 1)))
+# LabelEncoder sorts the Category values, so "ham" is class 0 and "spam" is class 1.
+ROBERTA_LABELS: List[str] = os.getenv("ROBERTA_LABELS", "ham,spam").split(",")
+
+class ModelUnavailableError(RuntimeError):
+    pass
+
+def rows_to_dataframe(rows: List[Any]) -> pd.DataFrame:
+    # The raw columns the fitted FeatureTransformer reads, one row per streamed DataRow.
+    return pd.DataFrame(
+        {
+            "Sent_Time": [str(row.sent_time) for row in rows],
+            "Source_IP": [str(row.source_ip) for row in rows],
+            "Source_Location": [str(row.source_location) for row in rows],
+        }
+    )
+
+class RobertaInferenceService:
+    def __init__(
+            self,
+            model_path: str = ROBERTA_MODEL_PATH,
+            feature_transformer_path: str = ROBERTA_FEATURE_TRANSFORMER_PATH,
+            torch_threads: int = ROBERTA_TORCH_THREADS,
+            max_length: int = ROBERTA_MAX_LENGTH
+    ):
+        self.model_path: str = model_path
+        self.feature_transformer_path: str = feature_transformer_path
+        self.torch_threads: int = torch_threads
+        self.max_length: int = max_length
+
+        self.model = None
+        self.tokeniser = None
+        self.feature_transformer: Optional[FeatureTransformer] = None
+        self.labels: List[str] = ROBERTA_LABELS
+        self.load_lock = threading.Lock()
+
+    def load(self) -> None:
+        # The checkpoint and tokeniser are loaded once, on first use.
+        if self.model is not None:
+            return
+
+        with self.load_lock:
+            if self.model is not None:
+                return
+
+            try:
+                import torch
+                from transformers import RobertaTokenizerFast
+
+                from src.machine_learning.roBERTa_method.roberta_spam_classifier import RobertaSpamClassifier
+            except ImportError as e:
+                raise ModelUnavailableError(f"RoBERTa serving needs torch and transformers: {e}")
+
+            if not os.path.exists(self.model_path):
+                raise ModelUnavailableError(f"No trained model at {self.model_path}. Run train_and_evaluation.py first.")
+
+            if not os.path.exists(self.feature_transformer_path):
+                raise ModelUnavailableError(f"No fitted feature transformer at {self.feature_transformer_path}. Run feature engineering and training first.")
+
+            torch.set_num_threads(self.torch_threads)
+
+            feature_transformer = FeatureTransformer.load(self.feature_transformer_path)
+            model = RobertaSpamClassifier(number_of_tabular_features=len(feature_transformer.feature_columns))
+            model.load_state_dict(torch.load(self.model_path, map_location="cpu"))
+            model.eval()
+
+            self.tokeniser = RobertaTokenizerFast.from_pretrained(ROBERTA_TOKENISER)
+            self.feature_transformer = feature_transformer
+            self.labels = feature_transformer.labels or ROBERTA_LABELS
+            self.model = model
+
+    def predict_batch(self, rows: List[Any]) -> List[dict]:
+        self.load()
+        import torch
+
+        # Padding to the longest message in the batch, not to max_length, keeps short batches cheap.
+        inputs = self.tokeniser( #type: ignore
+            [str(row.message_content) for row in rows],
+            padding="longest",
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="pt"
+        )
+        # One vectorised transform per batch, with the categories and IP counts fitted at training time.
+        tabular_features = torch.from_numpy(self.feature_transformer.transform_features(rows_to_dataframe(rows))) #type: ignore
+
+        with torch.inference_mode():
+            logits = self.model( #type: ignore
+                input_ids=inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                tabular_features=tabular_features
+            )
+            probabilities = torch.softmax(logits, dim=1).numpy()
+
+        spam_class: int = self.labels.index("spam") if "spam" in self.labels else 1
+        return [
+            {
+                "prediction": self.labels[int(row_probabilities.argmax())],
+                "spam_probability": round(float(row_probabilities[spam_class]), 6),
+            }
+            for row_probabilities in probabilities
+        ]
+
+class DynamicBatcher:
+    def __init__(
+            self,
+            service: RobertaInferenceService,
+            max_batch_size: int = ROBERTA_MAX_BATCH_SIZE,
+            max_wait_ms: float = ROBERTA_MAX_WAIT_MS,
+            max_queued_rows: int = ROBERTA_MAX_QUEUED_ROWS
+    ):
+        self.service: RobertaInferenceService = service
+        self.max_batch_size: int = max_batch_size
+        self.max_wait_seconds: float = max_wait_ms / 1000
+        self.max_queued_rows: int = max_queued_rows
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+
+        self.batches: int = 0
+        self.rows: int = 0
+
+    def __ensure_worker__(self) -> asyncio.Queue:
+        # The worker belongs to the running event loop, so it is started by the first request.
+        if self.worker is None or self.worker.done():
+            if self.queue is not None:
+                self.__fail_queued__(self.queue)
+            self.queue = asyncio.Queue(maxsize=self.max_queued_rows)
+            self.worker = asyncio.get_running_loop().create_task(self.__run__())
+        return self.queue #type: ignore
+
+    @staticmethod
+    def __fail_futures__(futures: List[asyncio.Future]) -> None:
+        for future in futures:
+            if future.done() or future.get_loop().is_closed():
+                continue
+            future.set_exception(ModelUnavailableError("RoBERTa batch worker stopped before the row was classified."))
+
+    def __fail_queued__(self, queue: asyncio.Queue) -> None:
+        # Rows left behind by a stopped worker would otherwise wait forever.
+        futures: List[asyncio.Future] = []
+        while not queue.empty():
+            futures.append(queue.get_nowait()[1])
+        self.__fail_futures__(futures)
+
+    async def __collect_batch__(self, queue: asyncio.Queue) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await queue.get()]
+        deadline: float = asyncio.get_running_loop().time() + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            # Whatever is already queued joins the batch without waiting.
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+
+            remaining: float = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+            except asyncio.CancelledError:
+                self.__fail_futures__([future for _, future in batch])
+                raise
+
+        return batch
+
+    async def __run__(self) -> None:
+        queue: asyncio.Queue = self.queue #type: ignore
+
+        while True:
+            batch = await self.__collect_batch__(queue)
+            pending = [(row, future) for row, future in batch if not future.cancelled()]
+            if not pending:
+                continue
+
+            try:
+                # One forward pass per batch, off the event loop; torch spreads it over ROBERTA_TORCH_THREADS.
+                predictions = await asyncio.to_thread(self.service.predict_batch, [row for row, _ in pending])
+                self.batches += 1
+                self.rows += len(pending)
+
+                for (_, future), prediction in zip(pending, predictions):
+                    if not future.done():
+                        future.set_result(prediction)
+            except asyncio.CancelledError:
+                self.__fail_futures__([future for _, future in pending])
+                raise
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def submit(self, row: Any) -> dict:
+        queue = self.__ensure_worker__()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await queue.put((row, future))
+        if queue is not self.queue:
+            # The worker stopped while this row waited for room; nothing will read this queue again.
+            self.__fail_queued__(queue)
+        return await future
+
+    async def submit_many(self, rows: List[Any]) -> List[dict]:
+        return list(await asyncio.gather(*(self.submit(row) for row in rows)))
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "average_batch_size": (self.rows / self.batches) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "queued_rows": self.queue.qsize() if self.queue is not None else 0,
+            "max_queued_rows": self.max_queued_rows,
+            "torch_threads": self.service.torch_threads,
+        }
+
+    async def stop(self) -> None:
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+        if self.queue is not None:
+            self.__fail_queued__(self.queue)
+            self.queue = None
+
+roberta_inference_service = RobertaInferenceService()
+roberta_batcher = DynamicBatcher(roberta_inference_service)
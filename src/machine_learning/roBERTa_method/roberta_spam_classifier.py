@@ -2,7 +2,6 @@ import pandas as pd
 import torch
 import torch.nn as nn
 from torch.utils.data import DataLoader
-from src.machine_learning.roBERTa_method.torch_dataset import torch_dataset
 from transformers import RobertaModel
 
 class RobertaSpamClassifier(nn.Module):
@@ -36,19 +35,14 @@ class RobertaSpamClassifier(nn.Module):
             nn.Linear(128, number_of_classes)
         )
 
-    def forward(
-            self,
-            input_ids,
-            attention_mask,
-            tabular_features
-    ):
+    def encode_text(self, input_ids, attention_mask):
         roberta_output = self.roberta(
             input_ids=input_ids,
             attention_mask=attention_mask
         )
+        return roberta_output.pooler_output
 
-        text_embedding = roberta_output.pooler_output
-
+    def classify_embedding(self, text_embedding, tabular_features):
         tabular_embedding = self.tabular_net(tabular_features)
 
         combined_embedding = torch.cat(
@@ -56,15 +50,57 @@ class RobertaSpamClassifier(nn.Module):
             dim=1
         )
 
-        logits = self.classifier_head(combined_embedding)
+        return self.classifier_head(combined_embedding)
+
+    def forward(
+            self,
+            input_ids,
+            attention_mask,
+            tabular_features
+    ):
+        text_embedding = self.encode_text(input_ids, attention_mask)
+
+        logits = self.classify_embedding(text_embedding, tabular_features)
 
         return logits
+
+    def freeze_encoder(self, unfrozen_layers: int = 0):
+        # Freezes RoBERTa except its last `unfrozen_layers` layers (and the pooler that follows them).
+        number_of_layers = len(self.roberta.encoder.layer)
+        for parameter in self.roberta.parameters():
+            parameter.requires_grad = False
+
+        if unfrozen_layers > 0:
+            for layer in self.roberta.encoder.layer[number_of_layers - unfrozen_layers:]:
+                for parameter in layer.parameters():
+                    parameter.requires_grad = True
+            for parameter in self.roberta.pooler.parameters():
+                parameter.requires_grad = True
+
+    def forward_from_hidden_states(
+            self,
+            hidden_states,
+            attention_mask,
+            tabular_features,
+            start_layer: int
+    ):
+        # Runs only encoder layers from `start_layer` onwards, starting from cached hidden states.
+        extended_attention_mask = self.roberta.get_extended_attention_mask(attention_mask, attention_mask.shape)
+
+        for layer in self.roberta.encoder.layer[start_layer:]:
+            layer_output = layer(hidden_states, attention_mask=extended_attention_mask)
+            hidden_states = layer_output[0] if isinstance(layer_output, tuple) else layer_output
+
+        return self.classify_embedding(self.roberta.pooler(hidden_states), tabular_features)
     
 def run_model_testing():
+    # Imported here so that serving the model does not load the training dataset.
+    from src.machine_learning.roBERTa_method.torch_dataset import load_torch_dataset
+
     print("\n--- Testing Model Architecture ---\n")
 
     print("\n--- Loading Dataset to get Model Parameters ---\n")
-    temp_dataset = torch_dataset
+    temp_dataset = load_torch_dataset()
 
     number_of_features = temp_dataset.number_of_tabular_features
     print(f"Found {number_of_features} tabular features.")
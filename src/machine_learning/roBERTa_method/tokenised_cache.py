@@ -0,0 +1,113 @@
+# <--- Imports --->
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from typing import (
+    Dict,
+    List,
+    Optional
+)
+
+# <--- Configurations --->
+TOKENISED_CACHE_DIRECTORY: str = os.path.abspath(os.getenv("TOKENISED_CACHE_DIRECTORY", "./data/processed/tokenised_cache"))
+TOKENISE_BATCH_SIZE: int = int(os.getenv("TOKENISE_BATCH_SIZE", "1024"))
+CACHE_FORMAT_VERSION: int = 1
+
+MESSAGE_COLUMN: str = "Message"
+LABEL_COLUMN: str = "Category"
+ARRAY_NAMES: List[str] = ["input_ids", "attention_mask", "lengths", "tabular_features", "labels"]
+
+def dataset_fingerprint(dataframe: pd.DataFrame, tokeniser, max_length: int) -> str:
+    # Any change to the rows, the columns, the vocabulary or the padding width produces a new cache entry.
+    digest = hashlib.sha256()
+    digest.update(json.dumps([CACHE_FORMAT_VERSION, list(map(str, dataframe.columns)), max_length]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(dataframe, index=True).to_numpy().tobytes())
+    digest.update(type(tokeniser).__name__.encode("utf-8"))
+    digest.update(json.dumps(tokeniser.get_vocab(), sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+def tabular_columns_of(dataframe: pd.DataFrame) -> List[str]:
+    return [column for column in dataframe.columns if column not in [MESSAGE_COLUMN, LABEL_COLUMN]]
+
+def build_tokenised_cache(dataframe: pd.DataFrame, tokeniser, max_length: int, cache_path: str) -> None:
+    number_of_rows: int = len(dataframe)
+    tabular_columns: List[str] = tabular_columns_of(dataframe)
+
+    # Arrays are written into a scratch directory and renamed into place, so readers never see half a cache.
+    scratch_path: str = f"{cache_path}.tmp-{os.getpid()}"
+    os.makedirs(scratch_path, exist_ok=True)
+
+    def open_array(name: str, dtype, shape: tuple) -> np.ndarray:
+        return np.lib.format.open_memmap(os.path.join(scratch_path, f"{name}.npy"), mode="w+", dtype=dtype, shape=shape)
+
+    input_ids = open_array("input_ids", np.int64, (number_of_rows, max_length))
+    attention_mask = open_array("attention_mask", np.int64, (number_of_rows, max_length))
+    lengths = open_array("lengths", np.int32, (number_of_rows,))
+
+    messages: List[str] = dataframe[MESSAGE_COLUMN].astype(str).tolist()
+    for start in range(0, number_of_rows, TOKENISE_BATCH_SIZE):
+        encoded = tokeniser(
+            messages[start:start + TOKENISE_BATCH_SIZE],
+            padding="max_length",
+            truncation=True,
+            max_length=max_length,
+            return_tensors="np"
+        )
+        end: int = start + len(encoded["input_ids"])
+        input_ids[start:end] = encoded["input_ids"]
+        attention_mask[start:end] = encoded["attention_mask"]
+        lengths[start:end] = encoded["attention_mask"].sum(axis=1)
+
+    tabular_features = open_array("tabular_features", np.float32, (number_of_rows, len(tabular_columns)))
+    tabular_features[:] = dataframe[tabular_columns].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+
+    labels = open_array("labels", np.int64, (number_of_rows,))
+    labels[:] = dataframe[LABEL_COLUMN].to_numpy(dtype=np.int64)
+
+    for array in (input_ids, attention_mask, lengths, tabular_features, labels):
+        array.flush()
+
+    with open(os.path.join(scratch_path, "metadata.json"), "w", encoding="utf-8") as metadata_file:
+        json.dump(
+            {
+                "rows": number_of_rows,
+                "max_length": max_length,
+                "tabular_columns": tabular_columns,
+            },
+            metadata_file,
+            indent=2
+        )
+
+    if os.path.exists(cache_path):
+        shutil.rmtree(scratch_path)
+        return
+    os.replace(scratch_path, cache_path)
+
+def load_tokenised_cache(cache_path: str) -> Dict[str, np.ndarray]:
+    # mmap_mode="c" maps the files copy-on-write: pages are shared between DataLoader workers and never written back.
+    return {
+        name: np.load(os.path.join(cache_path, f"{name}.npy"), mmap_mode="c")
+        for name in ARRAY_NAMES
+    }
+
+def load_or_build_tokenised_cache(
+        dataframe: pd.DataFrame,
+        tokeniser,
+        max_length: int,
+        cache_directory: str = TOKENISED_CACHE_DIRECTORY,
+        fingerprint: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    fingerprint = fingerprint if fingerprint else dataset_fingerprint(dataframe, tokeniser, max_length)
+    cache_path: str = os.path.join(cache_directory, fingerprint)
+
+    if not os.path.exists(os.path.join(cache_path, "metadata.json")):
+        print(f"Pre-tokenising {len(dataframe)} rows into {cache_path}")
+        os.makedirs(cache_directory, exist_ok=True)
+        build_tokenised_cache(dataframe, tokeniser, max_length, cache_path)
+    else:
+        print(f"Using pre-tokenised cache at {cache_path}")
+
+    return load_tokenised_cache(cache_path)
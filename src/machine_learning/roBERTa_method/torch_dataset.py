@@ -3,9 +3,16 @@
 # <--- Imports --->
 import os
 import pandas as pd
+from functools import lru_cache
 import torch
 from torch.utils.data import Dataset, DataLoader
-from transformers import RobertaTokenizer
+from transformers import RobertaTokenizerFast
+
+from src.machine_learning.roBERTa_method.tokenised_cache import (
+    TOKENISED_CACHE_DIRECTORY,
+    dataset_fingerprint,
+    load_or_build_tokenised_cache
+)
 
 # <--- Configuration --->
 PROCESSED_DATASET_PATH: str = os.path.abspath(path="./data/processed/processed_dataset.csv")
@@ -18,60 +25,42 @@ class TorchDataset(Dataset):
             self,
             dataframe: pd.DataFrame,
             tokeniser_name="roberta-base",
-            max_length=128
+            max_length=128,
+            cache_directory: str = TOKENISED_CACHE_DIRECTORY
     ):
         print("Loading Data...")
-        self.dataframe = dataframe
-        self.tokeniser = RobertaTokenizer.from_pretrained(tokeniser_name)
+        self.tokeniser = RobertaTokenizerFast.from_pretrained(tokeniser_name)
         self.max_length = max_length
 
-        self.text_data = self.dataframe[MESSAGE_COLUMN].tolist()
-        self.labels = self.dataframe[LABEL_COLUMN].values
-
-        tabular_columns: list = [
-            column for column in self.dataframe.columns
-            if column not in [MESSAGE_COLUMN, LABEL_COLUMN]
-        ]
-
-        self.tabular_data = self.dataframe[tabular_columns]
-        self.tabular_data = self.tabular_data.apply(pd.to_numeric, errors="coerce")
-        self.tabular_data = self.tabular_data.fillna(0)
-        self.tabular_data = self.tabular_data.values
+        # Tokenised once with the fast tokeniser and memory-mapped; every epoch and worker reads the same pages.
+        self.fingerprint: str = dataset_fingerprint(dataframe, self.tokeniser, max_length)
+        arrays = load_or_build_tokenised_cache(dataframe, self.tokeniser, max_length, cache_directory, self.fingerprint)
+        self.input_ids = arrays["input_ids"]
+        self.attention_mask = arrays["attention_mask"]
+        self.lengths = arrays["lengths"]
+        self.tabular_data = arrays["tabular_features"]
+        self.labels = arrays["labels"]
 
         self.number_of_tabular_features = self.tabular_data.shape[1]
 
-        print(f"\n--- Data Loaded. Found {len(self.dataframe)} rows. ---\n")
+        print(f"\n--- Data Loaded. Found {len(self.labels)} rows. ---\n")
         print(f"\n Found {self.number_of_tabular_features} tabular features.\n")
 
     def __len__(self):
-        return len(self.dataframe)
+        return len(self.labels)
     
     def __getitem__(self, index) -> dict:
-        message_content: str = self.text_data[index]
-        tabular_features = self.tabular_data[index]
-        label = self.labels[index]
-
-        inputs = self.tokeniser(
-            message_content,
-            padding="max_length",
-            truncation=True,
-            max_length=self.max_length,
-            return_tensors="pt"
-        )
-
-        input_ids = inputs["input_ids"].squeeze(0)
-        attention_mask = inputs["attention_mask"].squeeze(0)
-
+        # torch.from_numpy wraps the mapped rows without copying them.
         return {
-            "input_ids": input_ids,
-            "attention_mask": attention_mask,
-            "tabular_features": torch.tensor(tabular_features, dtype=torch.float),
-            "label": torch.tensor(label, dtype=torch.long)
+            "input_ids": torch.from_numpy(self.input_ids[index]),
+            "attention_mask": torch.from_numpy(self.attention_mask[index]),
+            "tabular_features": torch.from_numpy(self.tabular_data[index]),
+            "label": torch.tensor(self.labels[index], dtype=torch.long)
         }
 
     def data_loading(self):
         print("\n--- Testing New Torch Dataset ---\n")
-        dataset = TorchDataset(csv_file_path=PROCESSED_DATASET_PATH)
+        dataset = TorchDataset(pd.read_csv(PROCESSED_DATASET_PATH))
 
         print("\n--- Testing __getitem__ for one item---\n")
         sample_item = dataset[5]
@@ -98,4 +87,7 @@ class TorchDataset(Dataset):
         
         print("\nSuccess! Our data pipeline is ready.")
 
-torch_dataset = TorchDataset(csv_file_path=PROCESSED_DATASET_PATH)
\ No newline at end of file
+@lru_cache(maxsize=1)
+def load_torch_dataset(dataset_path: str = PROCESSED_DATASET_PATH) -> TorchDataset:
+    # Built on first call instead of on import, so importing this module no longer reads the CSV or loads the tokeniser.
+    return TorchDataset(pd.read_csv(dataset_path))
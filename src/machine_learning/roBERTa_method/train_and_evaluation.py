@@ -1,6 +1,7 @@
 # <--- Imports --->
 
 import os
+import time
 import pandas as pd
 import torch
 import torch.nn as nn
@@ -12,6 +13,9 @@ from sklearn.model_selection import train_test_split
 
 from src.machine_learning.roBERTa_method.torch_dataset import TorchDataset, PROCESSED_DATASET_PATH
 from src.machine_learning.roBERTa_method.roberta_spam_classifier import RobertaSpamClassifier
+from src.machine_learning.roBERTa_method.feature_transformer import save_feature_transformer_next_to
+from src.machine_learning.roBERTa_method.tokenised_cache import tabular_columns_of
+from src.machine_learning.roBERTa_method.length_bucketing import LengthBucketBatchSampler, dynamic_padding_collate
 
 # <--- Configurations --->
 
@@ -20,8 +24,27 @@ EPOCHS = 3
 BATCH_SIZE = 16
 LEARNING_RATE = 1e-5
 MODEL_SAVE_PATH: str = os.path.abspath("./src/machine_learning/roBERTa_method/trained_model/spam_classifier_model.pth")
+# Set LENGTH_BUCKETING=false to train on fixed max_length batches and compare the timings.
+USE_LENGTH_BUCKETING: bool = os.getenv("LENGTH_BUCKETING", "true").lower() == "true"
 
-if __name__ is "__main__":
+def build_loader(dataset: TorchDataset, shuffle: bool) -> DataLoader:
+    if not USE_LENGTH_BUCKETING:
+        return DataLoader(dataset, batch_size=BATCH_SIZE, shuffle=shuffle)
+
+    return DataLoader(
+        dataset,
+        batch_sampler=LengthBucketBatchSampler(dataset.lengths, batch_size=BATCH_SIZE, shuffle=shuffle),
+        collate_fn=dynamic_padding_collate
+    )
+
+def report_throughput(stage: str, seconds: float, real_tokens: int, padded_tokens: int) -> None:
+    padding_share: float = 1 - (real_tokens / padded_tokens) if padded_tokens else 0.0
+    print(
+        f"{stage}: {seconds:.1f}s, {real_tokens / seconds:,.0f} tokens/sec "
+        f"({padded_tokens / seconds:,.0f} incl. padding, {padding_share:.1%} padding)"
+    )
+
+if __name__ == "__main__":
     # Data loading and splitting
     print("\n--- Loading and Splitting Data ---\n")
     dataframe = pd.read_csv(PROCESSED_DATASET_PATH)
@@ -37,39 +60,50 @@ if __name__ is "__main__":
     train_dataset = TorchDataset(train_dataframe)
     test_dataset = TorchDataset(test_dataframe)
 
-    train_loader = DataLoader(train_dataset, batch_size=BATCH_SIZE, shuffle=True)
-    test_loader = DataLoader(test_dataset, batch_size=BATCH_SIZE, shuffle=False) 
+    train_loader = build_loader(train_dataset, shuffle=True)
+    test_loader = build_loader(test_dataset, shuffle=False)
 
-    # Initialize Model, Optimizer, Loss 
+    # Initialize Model, Optimizer, Loss
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     print(f"Using device: {device}")
+    print(f"Length bucketing: {'on' if USE_LENGTH_BUCKETING else 'off'}")
 
     number_of_features = train_dataset.number_of_tabular_features
-    model = RobertaSpamClassifier(n_tabular_features=number_of_features)
+    model = RobertaSpamClassifier(number_of_tabular_features=number_of_features)
     model.to(device)
 
     criterion = nn.CrossEntropyLoss()
     optimizer = AdamW(model.parameters(), lr=LEARNING_RATE)
 
     print("--- Starting Training ---")
-for epoch in range(EPOCHS):
-    model.train() # Set model to training mode
-    total_loss = 0.0
-    
-    for batch in tqdm(train_loader, desc=f"Epoch {epoch + 1} Training"):
-        input_ids = batch['input_ids'].to(device)
-        attention_mask = batch['attention_mask'].to(device)
-        tabular_features = batch['tabular_features'].to(device)
-        labels = batch['label'].to(device)
-        
-        optimizer.zero_grad()
-        logits = model(input_ids, attention_mask, tabular_features)
-        loss = criterion(logits, labels)
-        loss.backward()
-        optimizer.step()
-        total_loss += loss.item()
-        
-    print(f"Epoch {epoch + 1} Avg. Training Loss: {total_loss / len(train_loader):.4f}")
+    for epoch in range(EPOCHS):
+        model.train() # Set model to training mode
+        total_loss = 0.0
+        real_tokens = 0
+        padded_tokens = 0
+
+        if isinstance(train_loader.batch_sampler, LengthBucketBatchSampler):
+            train_loader.batch_sampler.set_epoch(epoch)
+
+        epoch_start_time = time.perf_counter()
+        for batch in tqdm(train_loader, desc=f"Epoch {epoch + 1} Training"):
+            input_ids = batch['input_ids'].to(device)
+            attention_mask = batch['attention_mask'].to(device)
+            tabular_features = batch['tabular_features'].to(device)
+            labels = batch['label'].to(device)
+
+            optimizer.zero_grad()
+            logits = model(input_ids, attention_mask, tabular_features)
+            loss = criterion(logits, labels)
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item()
+
+            real_tokens += int(batch['attention_mask'].sum())
+            padded_tokens += batch['input_ids'].numel()
+
+        print(f"Epoch {epoch + 1} Avg. Training Loss: {total_loss / len(train_loader):.4f}")
+        report_throughput(f"Epoch {epoch + 1}", time.perf_counter() - epoch_start_time, real_tokens, padded_tokens)
 
     print("\n--- Training Complete ---\n")
 
@@ -79,21 +113,29 @@ for epoch in range(EPOCHS):
 
     total_correct = 0
     total_samples = 0
+    real_tokens = 0
+    padded_tokens = 0
 
+    evaluation_start_time = time.perf_counter()
     with torch.no_grad():
         for batch in tqdm(test_loader, desc="Evaluating"):
             input_ids = batch['input_ids'].to(device)
             attention_mask = batch['attention_mask'].to(device)
             tabular_features = batch['tabular_features'].to(device)
             labels = batch['label'].to(device)
-            
+
             logits = model(input_ids, attention_mask, tabular_features)
-            
+
             _, predictions = torch.max(logits, dim=1)
-            
+
             total_correct += (predictions == labels).sum().item()
             total_samples += labels.size(0)
 
+            real_tokens += int(batch['attention_mask'].sum())
+            padded_tokens += batch['input_ids'].numel()
+
+    report_throughput("Evaluation", time.perf_counter() - evaluation_start_time, real_tokens, padded_tokens)
+
     # Calculate and print the final accuracy
     accuracy = (total_correct / total_samples) * 100
     print(f"\n--- Evaluation Complete ---")
@@ -101,4 +143,5 @@ for epoch in range(EPOCHS):
 
     # --- 6. Save the Final Model ---
     torch.save(model.state_dict(), MODEL_SAVE_PATH)
-    print(f"Model saved to {MODEL_SAVE_PATH}")
\ No newline at end of file
+    print(f"Model saved to {MODEL_SAVE_PATH}")
+    save_feature_transformer_next_to(MODEL_SAVE_PATH, tabular_columns_of(dataframe))
@@ -0,0 +1,128 @@
+# <--- Imports --->
+
+import argparse
+import os
+import time
+import pandas as pd
+import torch
+import torch.nn as nn
+
+from torch.optim import AdamW
+from sklearn.model_selection import train_test_split
+
+from src.machine_learning.roBERTa_method.torch_dataset import TorchDataset, PROCESSED_DATASET_PATH
+from src.machine_learning.roBERTa_method.roberta_spam_classifier import RobertaSpamClassifier
+from src.machine_learning.roBERTa_method.feature_transformer import save_feature_transformer_next_to
+from src.machine_learning.roBERTa_method.tokenised_cache import tabular_columns_of
+from src.machine_learning.roBERTa_method.embedding_cache import CachedEmbeddingDataset, build_cached_loader
+from src.machine_learning.roBERTa_method.train_and_evaluation import MODEL_SAVE_PATH
+
+# <--- Configurations --->
+EPOCHS = 20
+BATCH_SIZE = 64
+HEAD_LEARNING_RATE = 1e-3
+ENCODER_LEARNING_RATE = 1e-5
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train tabular_net and classifier_head on cached RoBERTa embeddings.")
+    parser.add_argument("--unfreeze-last", type=int, default=0, help="Also fine-tune the last N encoder layers.")
+    parser.add_argument("--from-checkpoint", default=None, help="Start from a trained model instead of pretrained roberta-base.")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--output", default=MODEL_SAVE_PATH)
+    return parser.parse_args()
+
+def run_model(model: RobertaSpamClassifier, batch: dict, start_layer: int, device) -> torch.Tensor:
+    text_input = batch["text_input"].to(device)
+    tabular_features = batch["tabular_features"].to(device)
+
+    if "attention_mask" in batch:
+        return model.forward_from_hidden_states(text_input, batch["attention_mask"].to(device), tabular_features, start_layer)
+    return model.classify_embedding(text_input, tabular_features)
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    # Same split as train_and_evaluation.py so results are comparable.
+    dataframe = pd.read_csv(PROCESSED_DATASET_PATH)
+    train_dataframe, test_dataframe = train_test_split(
+        dataframe,
+        test_size=0.2,
+        random_state=42
+    )
+
+    train_dataset = TorchDataset(train_dataframe)
+    test_dataset = TorchDataset(test_dataframe)
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    print(f"Using device: {device}")
+
+    model = RobertaSpamClassifier(number_of_tabular_features=train_dataset.number_of_tabular_features)
+    if arguments.from_checkpoint:
+        model.load_state_dict(torch.load(arguments.from_checkpoint, map_location="cpu"))
+    model.to(device)
+    model.freeze_encoder(unfrozen_layers=arguments.unfreeze_last)
+
+    print(f"\n--- Caching encoder outputs (last {arguments.unfreeze_last} layers trainable) ---\n")
+    cache_start_time = time.perf_counter()
+    train_cache = CachedEmbeddingDataset(model, train_dataset, arguments.unfreeze_last, arguments.from_checkpoint, device=device)
+    test_cache = CachedEmbeddingDataset(model, test_dataset, arguments.unfreeze_last, arguments.from_checkpoint, device=device)
+    print(f"Encoder outputs ready in {time.perf_counter() - cache_start_time:.1f}s")
+
+    train_loader = build_cached_loader(train_cache, arguments.batch_size, shuffle=True)
+    test_loader = build_cached_loader(test_cache, arguments.batch_size, shuffle=False)
+    start_layer = train_cache.start_layer
+
+    encoder_parameters = [parameter for parameter in model.roberta.parameters() if parameter.requires_grad]
+    head_parameters = list(model.tabular_net.parameters()) + list(model.classifier_head.parameters())
+    parameter_groups = [{"params": head_parameters, "lr": HEAD_LEARNING_RATE}]
+    if encoder_parameters:
+        parameter_groups.append({"params": encoder_parameters, "lr": ENCODER_LEARNING_RATE})
+
+    criterion = nn.CrossEntropyLoss()
+    optimizer = AdamW(parameter_groups)
+
+    print("--- Starting Training ---")
+    for epoch in range(arguments.epochs):
+        model.train()
+        # The frozen part of the encoder is not run at all; keep its dropout off for the unfrozen layers' inputs.
+        model.roberta.eval()
+        for layer in model.roberta.encoder.layer[start_layer:]:
+            layer.train()
+
+        total_loss = 0.0
+        epoch_start_time = time.perf_counter()
+
+        for batch in train_loader:
+            labels = batch["label"].to(device)
+
+            optimizer.zero_grad()
+            logits = run_model(model, batch, start_layer, device)
+            loss = criterion(logits, labels)
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item()
+
+        print(f"Epoch {epoch + 1} Avg. Training Loss: {total_loss / len(train_loader):.4f} ({time.perf_counter() - epoch_start_time:.2f}s)")
+
+    print("\n--- Starting Evaluation ---\n")
+    model.eval()
+
+    total_correct = 0
+    total_samples = 0
+
+    with torch.no_grad():
+        for batch in test_loader:
+            labels = batch["label"].to(device)
+            _, predictions = torch.max(run_model(model, batch, start_layer, device), dim=1)
+
+            total_correct += (predictions == labels).sum().item()
+            total_samples += labels.size(0)
+
+    print(f"Test Accuracy: {(total_correct / total_samples) * 100:.2f}%")
+
+    # The full state dict is saved, so the result loads exactly like an end-to-end trained model.
+    os.makedirs(os.path.dirname(arguments.output), exist_ok=True)
+    torch.save(model.state_dict(), arguments.output)
+    print(f"Model saved to {arguments.output}")
+    save_feature_transformer_next_to(arguments.output, tabular_columns_of(dataframe))
@@ -1,15 +1,41 @@
 # <--- Imports --->
+import argparse
+import csv
 import os
+import re
 import shutil
 import time
+import urllib.request
 import pandas as pd
 from docx import Document
 from typing import (
     List
 )
-from weaviate.util import generate_uuid5
 
+from src.machine_learning.llm_rag_method.vector_store.vector_backend import document_uuid
 from src.machine_learning.llm_rag_method.vector_store.vector_database import vector_collection
+from src.machine_learning.llm_rag_method.rule_engine.geography_lookup_table import (
+    GEOGRAPHY_TABLE_PATH,
+    geography_lookup_table,
+    parse_geography_line
+)
+from src.machine_learning.llm_rag_method.rule_engine.network_prefix_index import (
+    NETWORK_INDEX_PATH,
+    SAFE,
+    SUSPICIOUS,
+    network_prefix_index,
+    parse_address_range
+)
+
+# <--- Configurations --->
+# The running server keeps its own caches; after an ingest it is told to reload, e.g. http://localhost:8000/admin/guidelines/reload
+GUIDELINE_RELOAD_URL: str = os.getenv("GUIDELINE_RELOAD_URL", "")
+ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+# Section headings are checked in order, so the "irregular" keywords must win over "regular".
+SECTION_VERDICT_KEYWORDS = [
+    (SUSPICIOUS, ("irregular", "suspicious", "high-risk", "spam")),
+    (SAFE, ("regular", "trusted", "safe", "ham")),
+]
 
 class DocumentLoader:
     def __init__(self):
@@ -55,6 +81,127 @@ class DocumentLoader:
                 )
         return extracted_tables
 
+    def __extract_paragraph_lines__(self, document) -> List[str]:
+        lines: List[str] = []
+        for paragraph in document.paragraphs:
+            lines.extend(line.strip() for line in (paragraph.text.splitlines() or [""]))
+        return lines
+
+    def __extract_csv_blocks_from_paragraphs__(self, document) -> List[dict]:
+        # The guidelines keep most of their tables as comma separated paragraph lines rather than docx tables.
+        lines: List[str] = self.__extract_paragraph_lines__(document)
+
+        csv_blocks: List[dict] = []
+        section: str = ""
+        block_rows: List[List[str]] = []
+
+        def close_block():
+            if len(block_rows) > 1:
+                headings = block_rows[0]
+                csv_blocks.append(
+                    {
+                        "section": section,
+                        "table": {
+                            heading: [row[col_number] if col_number < len(row) else "" for row in block_rows[1:]]
+                            for col_number, heading in enumerate(headings)
+                        }
+                    }
+                )
+
+        for line in lines:
+            if "," in line:
+                block_rows.append([cell.strip() for cell in next(csv.reader([line]))])
+                continue
+
+            close_block()
+            block_rows = []
+            if line and not line.startswith("---"):
+                section = line
+
+        close_block()
+        return csv_blocks
+
+    def __section_verdict__(self, section: str):
+        normalised_section: str = section.lower()
+        for verdict, keywords in SECTION_VERDICT_KEYWORDS:
+            if any(re.search(rf"\b{re.escape(keyword)}\b", normalised_section) for keyword in keywords):
+                return verdict
+        return None
+
+    def __compile_network_entries__(self, csv_blocks: List[dict]) -> List[dict]:
+        network_entries: List[dict] = []
+
+        for csv_block in csv_blocks:
+            table = csv_block["table"]
+            verdict = self.__section_verdict__(csv_block["section"])
+            if "Range" not in table or verdict is None:
+                continue
+
+            for row_number, address_range in enumerate(table["Range"]):
+                try:
+                    networks = parse_address_range(address_range)
+                except ValueError as e:
+                    print(f"Skipping unparsable range '{address_range}': {e}")
+                    continue
+
+                for network in networks:
+                    network_entries.append(
+                        {
+                            "network": network,
+                            "verdict": verdict,
+                            "region": table.get("Region", [""] * len(table["Range"]))[row_number],
+                            "notes": table.get("Notes", [""] * len(table["Range"]))[row_number],
+                        }
+                    )
+        return network_entries
+
+    def __compile_geography_entries__(self, document) -> List[dict]:
+        # Location lists sit under headings such as "Safe Geographies" and "Suspicious Geographies (Spam Likely)".
+        geography_entries: List[dict] = []
+        verdict = None
+
+        for line in self.__extract_paragraph_lines__(document):
+            line_verdict = self.__section_verdict__(line)
+            if line_verdict is not None and not line.endswith("."):
+                verdict = line_verdict
+                continue
+
+            parsed_line = parse_geography_line(line)
+            if parsed_line is None or verdict is None:
+                continue
+
+            country, states = parsed_line
+            for state in states:
+                geography_entries.append({"country": country, "state": state, "verdict": verdict})
+        return geography_entries
+
+    def compile_lookup_indexes(self) -> None:
+        # Trained documents have been moved out of the guidelines folder, so both folders are compiled.
+        document_paths: List[str] = [
+            os.path.join(directory, file)
+            for directory in (self.GUIDELINES_DIRECTORY, self.TRAINED_DIRECTORY)
+            if os.path.isdir(directory)
+            for file in os.listdir(directory)
+            if file.endswith(".docx")
+        ]
+
+        network_entries: List[dict] = []
+        geography_entries: List[dict] = []
+        for document_path in document_paths:
+            try:
+                document = Document(document_path)
+                network_entries.extend(self.__compile_network_entries__(self.__extract_csv_blocks_from_paragraphs__(document)))
+                if os.path.basename(document_path).startswith("geography"):
+                    geography_entries.extend(self.__compile_geography_entries__(document))
+            except Exception as e:
+                print(f"Something went wrong: {e}")
+
+        network_prefix_index.load_entries(network_entries)
+        network_prefix_index.save(NETWORK_INDEX_PATH)
+
+        geography_lookup_table.load_entries(geography_entries)
+        geography_lookup_table.save(GEOGRAPHY_TABLE_PATH)
+
     def __extract_text_from_document__(self, document_path: str) -> dict:
         document = Document(document_path)
         if (len(document.paragraphs) == 0):
@@ -66,30 +213,33 @@ class DocumentLoader:
         }
         return result
         
-    def add_documents(self):
-        def document_exists(collection, doc_uuid: str) -> bool:
-            return collection.data.exists(doc_uuid)
-
-        collection = vector_collection.get_vector_collection()
-        documents = self.__retrieve_files__()
+    def add_documents(self, include_trained: bool = False):
+        # include_trained re-ingests guidelines already in trained_data, e.g. to fill a new embedded store.
+        vector_collection.__create_vector_collection__()
+        documents = [(self.GUIDELINES_DIRECTORY, document) for document in self.__retrieve_files__()]
+        if include_trained:
+            documents += [(self.TRAINED_DIRECTORY, document) for document in sorted(os.listdir(self.TRAINED_DIRECTORY)) if document.endswith(".docx")]
 
         print(f"\n--- Found {len(documents)} to process ---\n")
-        for number, file_name in enumerate(documents):
+        for number, (_, file_name) in enumerate(documents):
             print(f"{number + 1}: {file_name}")
 
+        inserted_headers: List[str] = []
+
         total_start_time: float = time.time()
-        for document in documents: 
+        for directory, document in documents: 
             header = document.rstrip(f".docx")
+            document_path: str = f"{directory}/{document}"
 
             tables_from_docx = {}
-            for table_number, table in self.__extract_text_from_document__(f"{self.GUIDELINES_DIRECTORY}/{document}")["Tables"].items():
+            for table_number, table in self.__extract_text_from_document__(document_path)["Tables"].items():
                 df = pd.DataFrame.from_dict(table)
                 tables_from_docx[table_number] = df
 
             extracted_document = f"""
                 # Extracted Paragraphs
                 {"-" * 30}
-                {self.__extract_text_from_document__(f"{self.GUIDELINES_DIRECTORY}/{document}")["Paragraphs"]}
+                {self.__extract_text_from_document__(document_path)["Paragraphs"]}
                 {"-" * 30}
                 
                 # Extracted Tables
@@ -103,23 +253,46 @@ class DocumentLoader:
                 "header": header,
                 "info": extracted_document,
             }
-            knowledge_uuid = generate_uuid5(guideline_object) 
+            knowledge_uuid = document_uuid(guideline_object) 
 
-            if not document_exists(collection, knowledge_uuid):
-                collection.data.insert(
-                    properties=guideline_object,
-                    uuid=knowledge_uuid
-                )
+            if not vector_collection.document_exists(knowledge_uuid):
+                vector_collection.insert_document(guideline_object, knowledge_uuid)
                 print(f"Document has been added under {knowledge_uuid}")
-                destination_path = os.path.join(self.TRAINED_DIRECTORY, os.path.basename(f"{self.GUIDELINES_DIRECTORY}/{document}"))
-                shutil.move(f"{self.GUIDELINES_DIRECTORY}/{document}", destination_path)
-                print(f"File '{document}' moved successfully to '{self.TRAINED_DIRECTORY}")
+                inserted_headers.append(header)
+                if directory == self.GUIDELINES_DIRECTORY:
+                    destination_path = os.path.join(self.TRAINED_DIRECTORY, os.path.basename(document_path))
+                    shutil.move(document_path, destination_path)
+                    print(f"File '{document}' moved successfully to '{self.TRAINED_DIRECTORY}")
             else:
                 print(f"Document already exists under {knowledge_uuid}!")
         total_end_time = time.time()
+
+        if inserted_headers:
+            vector_collection.invalidate_guideline_cache()
+
+        self.compile_lookup_indexes()
+        # The invalidation above only reaches this process; the server's caches and lookup tables are reloaded here.
+        self.notify_server()
+
         print(f"Time taken for processing {len(documents)} number of Documents: {self.__get_processing_time__(start_time=total_start_time, end_time=total_end_time)}")
 
+    def notify_server(self, reload_url: str = GUIDELINE_RELOAD_URL) -> None:
+        if not reload_url:
+            print("GUIDELINE_RELOAD_URL is not set; a running server picks up the new guidelines when its caches expire.")
+            return
+
+        request = urllib.request.Request(reload_url, method="POST", headers={"X-Admin-Token": ADMIN_TOKEN})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                print(f"Server reloaded its guidelines: {response.read().decode('utf-8')}")
+        except Exception as e:
+            print(f"Something went wrong: {e}")
+
 document_loader = DocumentLoader()
 
 if __name__ == "__main__":
-    document_loader.add_documents()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Ingest guideline documents into the configured vector store.")
+    parser.add_argument("--include-trained", action="store_true", help="Also ingest documents already in trained_data, e.g. to build a new embedded store.")
+    arguments = parser.parse_args()
+
+    document_loader.add_documents(include_trained=arguments.include_trained)
\ No newline at end of file
@@ -0,0 +1,265 @@
+# <--- Imports --->
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+from statistics import median
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional
+)
+from transformers import RobertaTokenizerFast
+
+from src.machine_learning.roBERTa_method.feature_transformer import FeatureTransformer, transformer_path_for
+from src.machine_learning.roBERTa_method.roberta_inference import (
+    ROBERTA_MAX_LENGTH,
+    ROBERTA_MODEL_PATH,
+    ROBERTA_TOKENISER,
+    rows_to_dataframe
+)
+from src.machine_learning.roBERTa_method.roberta_spam_classifier import RobertaSpamClassifier
+
+# <--- Configurations --->
+SAMPLE_DATASET_PATH: str = os.path.abspath(os.getenv("ROBERTA_SAMPLE_DATASET_PATH", "./data/processed/processed_dataset.csv"))
+EXPORT_DIRECTORY: str = os.path.abspath(os.getenv("ROBERTA_EXPORT_DIRECTORY", "./src/machine_learning/roBERTa_method/trained_model/exported"))
+ONNX_OPSET_VERSION: int = 17
+BENCHMARK_BATCH_SIZES: List[int] = [1, 2, 4, 8, 16, 32, 64]
+BENCHMARK_RUNS: int = 20
+PARITY_TOLERANCE: float = 1e-3
+SAMPLE_MESSAGE: str = "Free entry in 2 a wkly comp to win FA Cup final tkts 21st May 2005. Text FA to 87121 to receive entry question."
+
+class ExampleInputs:
+    def __init__(self, input_ids: torch.Tensor, attention_mask: torch.Tensor, tabular_features: torch.Tensor):
+        self.input_ids = input_ids
+        self.attention_mask = attention_mask
+        self.tabular_features = tabular_features
+
+    def as_tuple(self) -> tuple:
+        return self.input_ids, self.attention_mask, self.tabular_features
+
+    def as_onnx_feed(self) -> Dict[str, np.ndarray]:
+        return {
+            "input_ids": self.input_ids.numpy(),
+            "attention_mask": self.attention_mask.numpy(),
+            "tabular_features": self.tabular_features.numpy(),
+        }
+
+class RobertaModelExporter:
+    def __init__(
+            self,
+            checkpoint_path: str = ROBERTA_MODEL_PATH,
+            sample_dataset_path: str = SAMPLE_DATASET_PATH,
+            export_directory: str = EXPORT_DIRECTORY,
+            max_length: int = ROBERTA_MAX_LENGTH
+    ):
+        self.checkpoint_path: str = checkpoint_path
+        self.export_directory: str = export_directory
+        self.max_length: int = max_length
+
+        self.feature_transformer: FeatureTransformer = FeatureTransformer.load(transformer_path_for(checkpoint_path))
+        self.feature_columns: List[str] = self.feature_transformer.feature_columns
+        self.sample_dataset_path: str = sample_dataset_path
+        self.tokeniser = RobertaTokenizerFast.from_pretrained(ROBERTA_TOKENISER)
+
+        self.eager_model: nn.Module = self.__load_eager_model__()
+
+    def __load_eager_model__(self) -> nn.Module:
+        model = RobertaSpamClassifier(number_of_tabular_features=len(self.feature_columns))
+        model.load_state_dict(torch.load(self.checkpoint_path, map_location="cpu"))
+        model.eval()
+        return model
+
+    def build_example_inputs(self, batch_size: int) -> ExampleInputs:
+        # Real rows from the processed dataset, padded to max_length so every runtime sees the same shapes.
+        sample_rows = pd.read_csv(self.sample_dataset_path, nrows=batch_size, dtype=str)
+        while len(sample_rows) < batch_size:
+            sample_rows = pd.concat([sample_rows, sample_rows]).iloc[:batch_size]
+
+        messages: List[str] = sample_rows["Message"].fillna(SAMPLE_MESSAGE).tolist()
+        rows = list(sample_rows[["Message", "Sent_Time", "Source_IP", "Source_Location"]].rename(
+            columns={
+                "Message": "message_content",
+                "Sent_Time": "sent_time",
+                "Source_IP": "source_ip",
+                "Source_Location": "source_location",
+            }
+        ).itertuples(index=False))
+
+        inputs = self.tokeniser(
+            messages,
+            padding="max_length",
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="pt"
+        )
+        tabular_features = torch.from_numpy(self.feature_transformer.transform_features(rows_to_dataframe(rows)))
+        return ExampleInputs(inputs["input_ids"], inputs["attention_mask"], tabular_features)
+
+    def quantise(self, model: nn.Module) -> nn.Module:
+        # Dynamic int8 quantisation of every nn.Linear: the RoBERTa encoder, tabular_net and classifier_head.
+        return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+    def export_torchscript(self, quantise: bool = False) -> str:
+        model = self.quantise(self.eager_model) if quantise else self.eager_model
+        example_inputs = self.build_example_inputs(batch_size=2)
+
+        with torch.inference_mode():
+            traced_model = torch.jit.trace(model, example_inputs.as_tuple(), strict=False)
+            traced_model = torch.jit.freeze(traced_model.eval()) if not quantise else traced_model
+
+        path: str = os.path.join(self.export_directory, f"spam_classifier{'_int8' if quantise else ''}.torchscript.pt")
+        os.makedirs(self.export_directory, exist_ok=True)
+        torch.jit.save(traced_model, path)
+        print(f"TorchScript model saved to {path}")
+        return path
+
+    def export_onnx(self, quantise: bool = False) -> Optional[str]:
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+        except ImportError:
+            print("onnxruntime is not installed, skipping the ONNX export.")
+            return None
+
+        os.makedirs(self.export_directory, exist_ok=True)
+        path: str = os.path.join(self.export_directory, "spam_classifier.onnx")
+        example_inputs = self.build_example_inputs(batch_size=2)
+
+        torch.onnx.export(
+            self.eager_model,
+            example_inputs.as_tuple(),
+            path,
+            input_names=["input_ids", "attention_mask", "tabular_features"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "tabular_features": {0: "batch"},
+                "logits": {0: "batch"},
+            },
+            opset_version=ONNX_OPSET_VERSION
+        )
+        print(f"ONNX model saved to {path}")
+
+        if not quantise:
+            return path
+
+        # ONNX Runtime quantises the exported graph itself; torch's quantised modules do not export to ONNX.
+        quantised_path: str = os.path.join(self.export_directory, "spam_classifier_int8.onnx")
+        quantize_dynamic(path, quantised_path, weight_type=QuantType.QInt8)
+        print(f"Quantised ONNX model saved to {quantised_path}")
+        return quantised_path
+
+    def load_runner(self, path: str) -> Callable[[ExampleInputs], np.ndarray]:
+        if path.endswith(".onnx"):
+            import onnxruntime
+
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = torch.get_num_threads()
+            session = onnxruntime.InferenceSession(path, session_options, providers=["CPUExecutionProvider"])
+            return lambda inputs: session.run(["logits"], inputs.as_onnx_feed())[0]
+
+        scripted_model = torch.jit.load(path, map_location="cpu")
+
+        def run_torchscript(inputs: ExampleInputs) -> np.ndarray:
+            with torch.inference_mode():
+                return scripted_model(*inputs.as_tuple()).numpy()
+        return run_torchscript
+
+    def run_eager(self, inputs: ExampleInputs) -> np.ndarray:
+        with torch.inference_mode():
+            return self.eager_model(*inputs.as_tuple()).numpy()
+
+    def check_parity(self, runners: Dict[str, Callable[[ExampleInputs], np.ndarray]], batch_size: int = 16) -> List[str]:
+        inputs = self.build_example_inputs(batch_size)
+        eager_logits: np.ndarray = self.run_eager(inputs)
+
+        print(f"\n--- Logit parity against the eager model ({batch_size} rows) ---\n")
+        print(f"{'artifact':<32}{'max abs diff':>14}{'argmax agree':>14}{'status':>10}")
+        failed: List[str] = []
+        for name, runner in runners.items():
+            logits: np.ndarray = runner(inputs)
+            max_difference: float = float(np.abs(logits - eager_logits).max())
+            agreement: float = float((logits.argmax(axis=1) == eager_logits.argmax(axis=1)).mean())
+            # Quantised artifacts are judged on predictions; fp32 artifacts must match the logits.
+            passed: bool = agreement == 1.0 if "int8" in name else max_difference <= PARITY_TOLERANCE
+            print(f"{name:<32}{max_difference:>14.6f}{agreement:>14.2%}{'ok' if passed else 'MISMATCH':>10}")
+            if not passed:
+                failed.append(name)
+        return failed
+
+    def benchmark(
+            self,
+            runners: Dict[str, Callable[[ExampleInputs], np.ndarray]],
+            batch_sizes: List[int] = BENCHMARK_BATCH_SIZES,
+            runs: int = BENCHMARK_RUNS
+    ) -> None:
+        print(f"\n--- CPU latency and throughput ({torch.get_num_threads()} threads, sequence length {self.max_length}) ---\n")
+        print(f"{'artifact':<32}{'batch':>8}{'p50 ms':>12}{'rows/sec':>12}")
+
+        for batch_size in batch_sizes:
+            inputs = self.build_example_inputs(batch_size)
+            for name, runner in runners.items():
+                runner(inputs)
+                timings: List[float] = []
+                for _ in range(runs):
+                    start_time: float = time.perf_counter()
+                    runner(inputs)
+                    timings.append(time.perf_counter() - start_time)
+
+                median_seconds: float = median(timings)
+                print(f"{name:<32}{batch_size:>8}{median_seconds * 1000:>12.2f}{batch_size / median_seconds:>12.1f}")
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export a trained RobertaSpamClassifier to TorchScript and ONNX.")
+    parser.add_argument("--checkpoint", default=ROBERTA_MODEL_PATH)
+    parser.add_argument("--output-directory", default=EXPORT_DIRECTORY)
+    parser.add_argument("--formats", nargs="+", choices=["torchscript", "onnx"], default=["torchscript", "onnx"])
+    parser.add_argument("--quantise", action="store_true", help="Also export dynamic int8 versions.")
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BENCHMARK_BATCH_SIZES)
+    parser.add_argument("--runs", type=int, default=BENCHMARK_RUNS)
+    parser.add_argument("--skip-benchmark", action="store_true")
+    return parser.parse_args()
+
+def main() -> int:
+    arguments = parse_arguments()
+    torch.set_num_threads(arguments.threads)
+
+    exporter = RobertaModelExporter(
+        checkpoint_path=arguments.checkpoint,
+        export_directory=arguments.output_directory
+    )
+
+    artifacts: Dict[str, str] = {}
+    for quantise in ([False, True] if arguments.quantise else [False]):
+        suffix: str = " int8" if quantise else ""
+        if "torchscript" in arguments.formats:
+            artifacts[f"torchscript{suffix}"] = exporter.export_torchscript(quantise=quantise)
+        if "onnx" in arguments.formats:
+            onnx_path = exporter.export_onnx(quantise=quantise)
+            if onnx_path is not None:
+                artifacts[f"onnx{suffix}"] = onnx_path
+
+    runners: Dict[str, Callable[[ExampleInputs], np.ndarray]] = {
+        name: exporter.load_runner(path) for name, path in artifacts.items()
+    }
+    failed: List[str] = exporter.check_parity(runners)
+    for name in failed:
+        # A broken artifact must not stay in the export directory looking like a good one.
+        os.remove(artifacts[name])
+        runners.pop(name)
+        print(f"FAIL: {name} does not match the eager model; removed {artifacts[name]}")
+
+    if not arguments.skip_benchmark:
+        exporter.benchmark({"eager fp32": exporter.run_eager, **runners}, arguments.batch_sizes, arguments.runs)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
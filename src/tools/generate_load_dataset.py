@@ -0,0 +1,183 @@
+# <--- Imports --->
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional
+)
+
+from src.core.mock_feature_generation import FeatureInsertion
+
+# <--- Configurations --->
+SOURCE_DATASET_PATH: str = os.path.abspath("./data/mock/mock_dataset.csv")
+LOAD_DATASET_PATH: str = os.path.abspath(os.getenv("LOAD_DATASET_PATH", "./data/load/load_dataset.csv"))
+GENERATION_CHUNK_SIZE: int = 100_000
+
+OUTPUT_COLUMNS: List[str] = ["Category", "Message", "Sent_Date", "Sent_Time", "Source_IP", "Source_Location"]
+# Rows the endpoint has to survive without the stream breaking: a missing field or an unparseable value.
+MALFORMED_VALUES: Dict[str, List[str]] = {
+    "Message": [""],
+    "Sent_Time": ["", "25:61:61", "not a time"],
+    "Source_IP": ["", "999.1.1", "not-an-ip"],
+    "Source_Location": ["", "Nowhere", "('Unclosed'"],
+}
+
+def synthetic_ip_address(number: int) -> str:
+    # 100.64.0.0/10 (carrier-grade NAT) is in neither the regular nor the irregular guideline ranges.
+    return f"100.{64 + number // 65536 % 64}.{number // 256 % 256}.{number % 256}"
+
+def synthetic_location(number: int) -> str:
+    return str((f"Mockland {number}", f"Region {number}"))
+
+class LoadDatasetGenerator:
+    def __init__(
+            self,
+            source_path: str = SOURCE_DATASET_PATH,
+            spam_ratio: float = 0.13,
+            duplicate_ratio: float = 0.0,
+            malformed_ratio: float = 0.0,
+            ip_cardinality: Optional[int] = None,
+            location_cardinality: Optional[int] = None,
+            seed: Optional[int] = None
+    ):
+        self.spam_ratio: float = spam_ratio
+        self.duplicate_ratio: float = duplicate_ratio
+        self.malformed_ratio: float = malformed_ratio
+
+        # One seeded Generator drives FeatureInsertion and everything drawn here, so a seed fixes the whole file.
+        self.feature_insertion = FeatureInsertion(seed=seed)
+        self.generator: np.random.Generator = self.feature_insertion.generator
+
+        source = pd.read_csv(source_path, usecols=["Category", "Message"]).dropna()
+        self.messages: Dict[str, np.ndarray] = {
+            category: source.loc[source["Category"] == category, "Message"].to_numpy(dtype=object)
+            for category in ["ham", "spam"]
+        }
+
+        self.ip_pools: Optional[Dict[str, np.ndarray]] = (
+            self.__build_pools__(self.feature_insertion.insert_network_data, "Source_IP", ip_cardinality, synthetic_ip_address)
+            if ip_cardinality else None
+        )
+        self.location_pools: Optional[Dict[str, np.ndarray]] = (
+            self.__build_pools__(self.feature_insertion.insert_geographical_data, "Source_Location", location_cardinality, synthetic_location)
+            if location_cardinality else None
+        )
+
+    def __build_pools__(
+            self,
+            insert: Callable[[pd.DataFrame], pd.DataFrame],
+            column: str,
+            cardinality: int,
+            synthetic_value: Callable[[int], str]
+    ) -> Dict[str, np.ndarray]:
+        # Exactly `cardinality` distinct values, split between spam and ham in proportion to spam_ratio.
+        # FeatureInsertion only knows a few locations, so repeats are swapped for synthetic values.
+        spam_size: int = min(max(round(cardinality * self.spam_ratio), 1), max(cardinality - 1, 1))
+        categories = np.array(["spam"] * spam_size + ["ham"] * (cardinality - spam_size), dtype=object)
+        values = insert(pd.DataFrame({"Category": categories}))[column].to_numpy(dtype=object, copy=True)
+
+        repeated = pd.Series(values).duplicated().to_numpy()
+        values[repeated] = [synthetic_value(number) for number in np.flatnonzero(repeated)]
+
+        if cardinality == 1:
+            return {"ham": values, "spam": values}
+        return {category: values[categories == category] for category in ["ham", "spam"]}
+
+    def __draw_from_pools__(self, pools: Dict[str, np.ndarray], is_spam: np.ndarray) -> np.ndarray:
+        values = np.empty(len(is_spam), dtype=object)
+        for category, mask in [("spam", is_spam), ("ham", ~is_spam)]:
+            values[mask] = pools[category][self.generator.integers(0, len(pools[category]), size=int(mask.sum()))]
+        return values
+
+    def generate_chunk(self, rows: int) -> pd.DataFrame:
+        is_spam = self.generator.random(rows) < self.spam_ratio
+        chunk = pd.DataFrame({"Category": np.where(is_spam, "spam", "ham").astype(object)})
+
+        messages = np.empty(rows, dtype=object)
+        for category, mask in [("spam", is_spam), ("ham", ~is_spam)]:
+            messages[mask] = self.messages[category][self.generator.integers(0, len(self.messages[category]), size=int(mask.sum()))]
+        chunk["Message"] = messages
+
+        chunk = self.feature_insertion.insert_temporal_data(chunk)
+        if self.ip_pools is None:
+            chunk = self.feature_insertion.insert_network_data(chunk)
+        else:
+            chunk["Source_IP"] = self.__draw_from_pools__(self.ip_pools, is_spam)
+        if self.location_pools is None:
+            chunk = self.feature_insertion.insert_geographical_data(chunk)
+        else:
+            chunk["Source_Location"] = self.__draw_from_pools__(self.location_pools, is_spam)
+        chunk = chunk[OUTPUT_COLUMNS]
+
+        # Duplicates copy whole rows from elsewhere in the same chunk, which keeps memory bounded by the chunk size.
+        duplicate_count: int = int(round(rows * self.duplicate_ratio))
+        if duplicate_count and rows > 1:
+            targets = self.generator.choice(rows, size=duplicate_count, replace=False)
+            sources = self.generator.integers(0, rows, size=duplicate_count)
+            chunk.iloc[targets] = chunk.iloc[sources].to_numpy()
+
+        malformed_count: int = int(round(rows * self.malformed_ratio))
+        if malformed_count:
+            targets = self.generator.choice(rows, size=malformed_count, replace=False)
+            columns = list(MALFORMED_VALUES)
+            broken_columns = self.generator.integers(0, len(columns), size=malformed_count)
+            for column_number, column in enumerate(columns):
+                column_targets = targets[broken_columns == column_number]
+                values = np.array(MALFORMED_VALUES[column], dtype=object)
+                chunk.iloc[column_targets, chunk.columns.get_loc(column)] = values[self.generator.integers(0, len(values), size=len(column_targets))] #type: ignore
+
+        return chunk
+
+    def write(self, path: str, rows: int, chunk_size: int = GENERATION_CHUNK_SIZE) -> int:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        written: int = 0
+        start_time: float = time.perf_counter()
+
+        with open(path, "w", encoding="utf-8", newline="") as output_file:
+            while written < rows:
+                chunk = self.generate_chunk(min(chunk_size, rows - written))
+                chunk.to_csv(output_file, header=(written == 0), index=False)
+                written += len(chunk)
+                print(f"{written:,}/{rows:,} rows ({written / (time.perf_counter() - start_time):,.0f} rows/sec)", end="\r")
+
+        print(f"\nWrote {written:,} rows to {path} in {time.perf_counter() - start_time:.1f}s")
+        return written
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a large synthetic CSV for load-testing /upload/stream-csv.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--output", default=LOAD_DATASET_PATH)
+    parser.add_argument("--source", default=SOURCE_DATASET_PATH, help="Labelled dataset the messages are sampled from.")
+    parser.add_argument("--chunk-size", type=int, default=GENERATION_CHUNK_SIZE)
+    parser.add_argument("--spam-ratio", type=float, default=0.13)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="Share of rows that repeat another row.")
+    parser.add_argument("--malformed-ratio", type=float, default=0.0, help="Share of rows with a missing or unparseable field.")
+    parser.add_argument("--ip-cardinality", type=int, default=None, help="Number of distinct Source_IP values.")
+    parser.add_argument("--location-cardinality", type=int, default=None, help="Number of distinct Source_Location values.")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+def main() -> None:
+    arguments = parse_arguments()
+    for name in ["spam_ratio", "duplicate_ratio", "malformed_ratio"]:
+        if not 0 <= getattr(arguments, name) <= 1:
+            raise SystemExit(f"--{name.replace('_', '-')} must be between 0 and 1.")
+
+    generator = LoadDatasetGenerator(
+        source_path=arguments.source,
+        spam_ratio=arguments.spam_ratio,
+        duplicate_ratio=arguments.duplicate_ratio,
+        malformed_ratio=arguments.malformed_ratio,
+        ip_cardinality=arguments.ip_cardinality,
+        location_cardinality=arguments.location_cardinality,
+        seed=arguments.seed
+    )
+    generator.write(arguments.output, arguments.rows, arguments.chunk_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# <--- Imports --->
+import argparse
+import csv
+import json
+import os
+import time
+import uuid
+import httpx
+import numpy as np
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional
+)
+
+from src.tools.generate_load_dataset import LOAD_DATASET_PATH
+
+# <--- Configurations --->
+LOAD_TEST_BASE_URL: str = os.getenv("LOAD_TEST_BASE_URL", "http://127.0.0.1:8000")
+LOAD_TEST_ENDPOINT: str = "/upload/stream-csv"
+UPLOAD_BLOCK_BYTES: int = 64 * 1024
+
+class StreamLoadReport:
+    def __init__(
+            self,
+            rows: int,
+            errors: int,
+            total_seconds: float,
+            time_to_first_row: Optional[float],
+            row_latencies: np.ndarray,
+            arrival_gaps: np.ndarray
+    ):
+        self.rows: int = rows
+        self.errors: int = errors
+        self.total_seconds: float = total_seconds
+        self.time_to_first_row: Optional[float] = time_to_first_row
+        # Per row: result arrival minus the moment the row's bytes went out in the upload.
+        self.row_latencies: np.ndarray = row_latencies
+        # Between consecutive result lines; rows of one batch arrive together, so most gaps are close to 0.
+        self.arrival_gaps: np.ndarray = arrival_gaps
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        def percentile_ms(values: np.ndarray, percentile: float) -> Optional[float]:
+            return round(float(np.percentile(values, percentile)) * 1000, 3) if len(values) else None
+
+        return {
+            "rows": self.rows,
+            "errors": self.errors,
+            "total_seconds": round(self.total_seconds, 3),
+            "time_to_first_row_seconds": round(self.time_to_first_row, 3) if self.time_to_first_row is not None else None,
+            "rows_per_second": round(self.rows / self.total_seconds, 1) if self.total_seconds else None,
+            "row_latency_p50_ms": percentile_ms(self.row_latencies, 50),
+            "row_latency_p99_ms": percentile_ms(self.row_latencies, 99),
+            "inter_arrival_gap_p50_ms": percentile_ms(self.arrival_gaps, 50),
+            "inter_arrival_gap_p99_ms": percentile_ms(self.arrival_gaps, 99),
+        }
+
+class TimedCsvUpload:
+    # Streams the CSV as a multipart body and notes when each data row was handed to the connection,
+    # keyed by the row's position in the upload (the row_index the server reports back).
+    def __init__(self, csv_file: BinaryIO, file_name: str, block_bytes: int = UPLOAD_BLOCK_BYTES):
+        self.csv_file: BinaryIO = csv_file
+        self.file_name: str = file_name
+        self.block_bytes: int = block_bytes
+        self.boundary: str = uuid.uuid4().hex
+        self.sent_times: List[float] = []
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def body(self) -> Iterator[bytes]:
+        yield (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{self.file_name}"\r\n'
+            "Content-Type: text/csv\r\n\r\n"
+        ).encode("utf-8")
+
+        block: List[bytes] = []
+        block_size: int = 0
+
+        def decoded_lines() -> Iterator[str]:
+            nonlocal block_size
+            for raw_line in self.csv_file:
+                block.append(raw_line)
+                block_size += len(raw_line)
+                yield raw_line.decode("utf-8-sig", errors="replace")
+
+        # Records, not lines: a quoted field may span lines. Blank lines are skipped, as pandas skips them.
+        pending_rows: int = 0
+        records = csv.reader(decoded_lines())
+        next(records, None)
+        for record in records:
+            if record:
+                pending_rows += 1
+            if block_size >= self.block_bytes:
+                yield b"".join(block)
+                # The generator resumes once the block has been written, so that is when its rows were sent.
+                self.sent_times.extend([time.perf_counter()] * pending_rows)
+                block.clear()
+                block_size, pending_rows = 0, 0
+
+        yield b"".join(block) + f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self.sent_times.extend([time.perf_counter()] * pending_rows)
+
+def run_stream_load(
+        path: str,
+        base_url: str = LOAD_TEST_BASE_URL,
+        endpoint: str = LOAD_TEST_ENDPOINT,
+        params: Optional[dict] = None,
+        max_rows: Optional[int] = None,
+        client: Optional[httpx.Client] = None
+) -> StreamLoadReport:
+    arrival_times: List[float] = []
+    row_latencies: List[float] = []
+    errors: int = 0
+
+    with open(path, "rb") as csv_file, (client if client is not None else httpx.Client(base_url=base_url, timeout=None)) as http_client:
+        upload = TimedCsvUpload(csv_file, os.path.basename(path))
+        start_time: float = time.perf_counter()
+        # The body is generated while it is sent, so the upload never sits in client memory.
+        with http_client.stream(
+            "POST",
+            endpoint,
+            params=params,
+            content=upload.body(),
+            headers={"Content-Type": upload.content_type}
+        ) as response:
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                arrival_time: float = time.perf_counter()
+                arrival_times.append(arrival_time)
+
+                result: dict = json.loads(line)
+                if "error" in result:
+                    errors += 1
+                row_index = result.get("row_index")
+                if isinstance(row_index, int) and 0 <= row_index < len(upload.sent_times):
+                    row_latencies.append(arrival_time - upload.sent_times[row_index])
+
+                if max_rows is not None and len(arrival_times) >= max_rows:
+                    break
+
+        total_seconds: float = time.perf_counter() - start_time
+
+    arrivals = np.asarray(arrival_times)
+    return StreamLoadReport(
+        rows=len(arrivals),
+        errors=errors,
+        total_seconds=total_seconds,
+        time_to_first_row=float(arrivals[0] - start_time) if len(arrivals) else None,
+        row_latencies=np.asarray(row_latencies),
+        arrival_gaps=np.diff(arrivals)
+    )
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Upload a CSV to a streaming endpoint and measure how the results stream back.")
+    parser.add_argument("--file", default=LOAD_DATASET_PATH)
+    parser.add_argument("--base-url", default=LOAD_TEST_BASE_URL)
+    parser.add_argument("--endpoint", default=LOAD_TEST_ENDPOINT, help="Also works with /roberta/upload/stream-csv.")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--unordered", action="store_true")
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop reading after this many result lines.")
+    return parser.parse_args()
+
+def main() -> None:
+    arguments = parse_arguments()
+    params: dict = {
+        name: value
+        for name, value in {
+            "concurrency": arguments.concurrency,
+            "batch_size": arguments.batch_size,
+            "chunk_size": arguments.chunk_size,
+            "ordered": "false" if arguments.unordered else None,
+        }.items()
+        if value is not None
+    }
+
+    report = run_stream_load(arguments.file, arguments.base_url, arguments.endpoint, params, arguments.max_rows)
+    print(json.dumps(report.as_dict(), indent=2))
+
+if __name__ == "__main__":
+    main()